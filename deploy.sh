@@ -52,7 +52,7 @@ VENV_PKGS[steve]="pandas plotly requests beautifulsoup4 matplotlib seaborn chrom
 VENV_PKGS[tony]="pandas requests beautifulsoup4 matplotlib seaborn chromadb"
 VENV_PKGS[jordan]="pandas numpy matplotlib seaborn requests beautifulsoup4 openpyxl chromadb"
 
-SHARED_LIBS=(llm_client.py agent_executor.py orchestrator.py api_client.py mcp_client.py knowledge_client.py screenshot.py)
+SHARED_LIBS=(llm_client.py agent_executor.py orchestrator.py shell_session.py file_reader.py compaction.py tool_cache.py capability_index.py api_client.py mcp_client.py knowledge_client.py screenshot.py)
 
 # ── Args ─────────────────────────────────────────────────────────────────────
 API_KEY=""
@@ -415,22 +415,11 @@ chown jarvis:executive-agents "$REGISTRY_DB"
 
 # Task queue
 TASK_DB="$EW/engine/task_queue.db"
-if [[ ! -f "$TASK_DB" ]]; then
-  sqlite3 "$TASK_DB" << 'SQL'
-CREATE TABLE IF NOT EXISTS tasks (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  title TEXT NOT NULL,
-  description TEXT,
-  assigned_to TEXT,
-  created_by TEXT,
-  priority INTEGER DEFAULT 5,
-  status TEXT DEFAULT 'pending',
-  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  updated_at DATETIME,
-  completed_at DATETIME
-);
-SQL
+# init_queue creates the schema (WAL, claim indexes) and migrates older queues.
+if python3 -c "import sys; sys.path.insert(0, '$EW/engine'); import agent_executor; agent_executor.init_queue()"; then
   ok "Task queue initialized"
+else
+  fail "Task queue initialization failed"
 fi
 chown jarvis:executive-agents "$TASK_DB"
 
@@ -483,7 +472,7 @@ fi
 systemctl daemon-reload
 
 # Enable timers/services if they exist
-for svc in agent-dashboard agent-daily-reports.timer agent-health-monitor.timer; do
+for svc in agent-dashboard agent-queue-worker agent-daily-reports.timer agent-health-monitor.timer; do
   if [[ -f "/etc/systemd/system/$svc" ]] || [[ -f "/etc/systemd/system/${svc}.service" ]]; then
     systemctl enable "$svc" 2>/dev/null || true
     systemctl start "$svc" 2>/dev/null || true
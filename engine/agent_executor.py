@@ -26,8 +26,14 @@ Usage:
 
 import json
 import os
+import socket
 import subprocess
 import sys
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -36,6 +42,10 @@ sys.path.insert(0, "/home/executive-workspace/apis")
 sys.path.insert(0, "/home/executive-workspace/mcp")
 
 from llm_client import LLMClient, MODELS, TASK_MODEL_MAP
+from shell_session import SHELLS, SHELL_MAX_OUTPUT
+from file_reader import read_bytes, read_lines, read_tail
+from compaction import OUTPUT_STORE, compact_messages
+from tool_cache import TOOL_CACHE
 
 # ── Agent Definitions ────────────────────────────────────────────────────
 
@@ -46,6 +56,7 @@ AGENT_HOMES = {
     "warren": {"home": "/home/warren", "type": "executive", "team": "warren"},
     "steve":  {"home": "/home/steve",  "type": "executive", "team": "steve"},
     "tony":   {"home": "/home/tony",   "type": "executive", "team": "tony"},
+    "jordan": {"home": "/home/jordan", "type": "executive", "team": "jordan"},
     # Sub-agents
     "backend":           {"home": "/home/backend",           "type": "sub", "team": "tesla"},
     "frontend":          {"home": "/home/frontend",          "type": "sub", "team": "tesla"},
@@ -67,6 +78,11 @@ AGENT_HOMES = {
     "intellectual-property": {"home": "/home/intellectual-property", "type": "sub", "team": "tony"},
     "litigation-support":    {"home": "/home/litigation-support",    "type": "sub", "team": "tony"},
     "corporate-governance":  {"home": "/home/corporate-governance",  "type": "sub", "team": "tony"},
+    "sales-director":        {"home": "/home/sales-director",        "type": "sub", "team": "jordan"},
+    "account-executive":     {"home": "/home/account-executive",     "type": "sub", "team": "jordan"},
+    "business-development":  {"home": "/home/business-development",  "type": "sub", "team": "jordan"},
+    "client-success":        {"home": "/home/client-success",        "type": "sub", "team": "jordan"},
+    "sales-operations":      {"home": "/home/sales-operations",      "type": "sub", "team": "jordan"},
 }
 
 # Tools available to agents (as OpenAI-compatible function definitions)
@@ -90,12 +106,17 @@ AGENT_TOOLS = [
         "type": "function",
         "function": {
             "name": "read_file",
-            "description": "Read the contents of a file.",
+            "description": "Read part of a file: a range of lines (offset/limit), the last lines (tail), or a byte range (byte_offset/byte_length). Large files can be paged through.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "path": {"type": "string", "description": "Path to the file to read"},
-                    "max_lines": {"type": "integer", "description": "Max lines to read (default 200)"}
+                    "offset": {"type": "integer", "description": "First line to read, 0-based (default 0)"},
+                    "limit": {"type": "integer", "description": "Max lines to read (default 200)"},
+                    "max_lines": {"type": "integer", "description": "Alias for limit"},
+                    "tail": {"type": "integer", "description": "Read the last N lines instead"},
+                    "byte_offset": {"type": "integer", "description": "Read bytes from this offset instead (negative counts from the end)"},
+                    "byte_length": {"type": "integer", "description": "Bytes to read with byte_offset (default 5000)"}
                 },
                 "required": ["path"]
             }
@@ -163,6 +184,21 @@ AGENT_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "recall_output",
+            "description": "Retrieve the full text of an earlier tool output that was compacted to a digest.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ref": {"type": "string", "description": "The ref given in the digest"},
+                    "offset": {"type": "integer", "description": "Character offset to start from (default 0)"}
+                },
+                "required": ["ref"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -182,19 +218,40 @@ AGENT_TOOLS = [
     }
 ]
 
+# How tool calls from one model turn may overlap. "parallel" tools have no
+# side effects and run concurrently with their parallel neighbours; a
+# "serial" tool runs alone, after every earlier call of the turn and before
+# any later one. Unknown tools are serial.
+TOOL_CONCURRENCY = {
+    "read_file": "parallel",
+    "fetch_url": "parallel",
+    "api_call": "parallel",
+    "recall_output": "parallel",
+    "run_shell": "serial",
+    "write_file": "serial",
+    "send_message": "serial",
+    "report_result": "serial",
+}
+TOOL_WORKERS = 4  # max parallel tool calls per agent turn
+
 
 class AgentExecutor:
     """Executes tasks as a specific agent with LLM-powered reasoning."""
     
-    def __init__(self, agent_name: str, api_key: Optional[str] = None):
+    def __init__(self, agent_name: str, api_key: Optional[str] = None,
+                 hedge: bool = False, stream: bool = False, llm_cache: bool = False,
+                 adaptive: bool = False, compaction: Optional[str] = "truncate"):
         if agent_name not in AGENT_HOMES:
             raise ValueError(f"Unknown agent: {agent_name}. Available: {list(AGENT_HOMES.keys())}")
         
         self.agent_name = agent_name
         self.agent_info = AGENT_HOMES[agent_name]
-        self.llm = LLMClient(api_key=api_key)
+        self.llm = LLMClient(api_key=api_key, hedge=hedge, cache=llm_cache, adaptive=adaptive)
         self.prompt = self._load_prompt()
         self.max_iterations = 10
+        self.stream = stream  # stream completions; tool calls are parsed as they complete
+        # Digest old tool results in long runs: "truncate", "summarize" (cheap model) or None
+        self.compaction = compaction
         self.log = []
     
     def _load_prompt(self) -> str:
@@ -233,27 +290,58 @@ You are executing a task within the AgentOS multi-agent system.
 7. Maximum {self.max_iterations} tool calls allowed — plan accordingly.
 {task_context}"""
     
-    def _execute_tool(self, name: str, args: dict) -> str:
-        """Execute a tool call and return the result."""
+    def _read_file(self, path: str, args: dict) -> str:
+        """A line range, tail or byte range of a file, with a note on what was read."""
+        if args.get("byte_offset") is not None:
+            page = read_bytes(path, int(args["byte_offset"]), int(args.get("byte_length") or 5000))
+            where = f"bytes {page.start}-{page.end} of {page.size}"
+        elif args.get("tail"):
+            page = read_tail(path, int(args["tail"]))
+            where = f"last {-page.start} lines of {page.size} bytes"
+        else:
+            limit = int(args.get("limit") or args.get("max_lines") or 200)
+            page = read_lines(path, int(args.get("offset") or 0), limit)
+            where = f"lines {page.start}-{page.end} " + (
+                f"of {page.total_lines}" if page.total_lines is not None
+                else f"(more follow; continue with offset={page.end})")
+        text = page.text[:5000]
+        if len(text) < len(page.text):
+            where += f", cut to 5000 of {len(page.text)} chars"
+        return f"{text}\n[{path}: {where}]" if page.size else text
+    
+    def _execute_tool(self, name: str, args: dict, entry: Optional[dict] = None) -> str:
+        """Execute a tool call and return the result.
+        
+        Cacheable tools record their cache status ("hit", "revalidated",
+        "miss") on the log `entry` of the call.
+        """
         try:
             if name == "run_shell":
+                # Runs in the agent's persistent shell: cwd and env carry over
                 cmd = args.get("command", "")
-                cwd = args.get("cwd", self.agent_info["home"])
-                result = subprocess.run(
-                    ["sudo", "-u", self.agent_name, "bash", "-c", cmd],
-                    capture_output=True, text=True, timeout=30, cwd=cwd
-                )
-                output = result.stdout[:3000]
+                result = SHELLS.run(self.agent_name, cmd, cwd=args.get("cwd"),
+                                    timeout=30, home=self.agent_info["home"])
+                # Output is captured as head + tail; omitted bytes are noted inline
+                output = result.stdout
                 if result.stderr:
-                    output += f"\nSTDERR: {result.stderr[:500]}"
+                    output += f"\nSTDERR: {result.stderr}"
+                if result.timed_out:
+                    output += (f"\nTIMED OUT: killed after 30s with the shell session "
+                               f"(stdout {result.stdout_bytes}, stderr {result.stderr_bytes} bytes so far)")
+                if result.killed:
+                    output += (f"\nKILLED: output exceeded {SHELL_MAX_OUTPUT} bytes "
+                               f"(stdout {result.stdout_bytes}, stderr {result.stderr_bytes} bytes so far)")
+                if result.exit_code:
+                    output += f"\nEXIT CODE: {result.exit_code}"
                 return output or "(no output)"
             
             elif name == "read_file":
                 path = args.get("path", "")
-                max_lines = args.get("max_lines", 200)
-                with open(path) as f:
-                    lines = f.readlines()[:max_lines]
-                return "".join(lines)[:5000]
+                text, status = TOOL_CACHE.read_file(path, args, lambda: self._read_file(path, args),
+                                                    agent=self.agent_name)
+                if entry is not None:
+                    entry["cache"] = status
+                return text
             
             elif name == "write_file":
                 path = args.get("path", "")
@@ -263,20 +351,19 @@ You are executing a task within the AgentOS multi-agent system.
                     f.write(content)
                 return f"Written {len(content)} bytes to {path}"
             
-            elif name == "fetch_url":
+            elif name in ("fetch_url", "api_call"):
                 url = args.get("url", "")
-                max_length = args.get("max_length", 5000)
-                req = urllib.request.Request(url, headers={"User-Agent": f"AgentOS/{self.agent_name}"})
-                import urllib.request
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    return resp.read().decode()[:max_length]
-            
-            elif name == "api_call":
-                url = args.get("url", "")
-                req = urllib.request.Request(url, headers={"User-Agent": f"AgentOS/{self.agent_name}"})
-                import urllib.request
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    return resp.read().decode()[:5000]
+                headers = {"User-Agent": f"AgentOS/{self.agent_name}"}
+                max_length = args.get("max_length", 5000) if name == "fetch_url" else 5000
+                method = (args.get("method") or "GET").upper()
+                if method != "GET":
+                    req = urllib.request.Request(url, headers=headers, method=method)
+                    with urllib.request.urlopen(req, timeout=15) as resp:
+                        return resp.read(max_length * 4).decode(errors="replace")[:max_length]
+                body, status = TOOL_CACHE.get_url(url, headers=headers, timeout=15, tool=name)
+                if entry is not None:
+                    entry["cache"] = status
+                return body[:max_length]
             
             elif name == "send_message":
                 to = args.get("to", "")
@@ -291,6 +378,16 @@ You are executing a task within the AgentOS multi-agent system.
                 )
                 return f"Message sent to {to}: {subject}"
             
+            elif name == "recall_output":
+                content = OUTPUT_STORE.get(args.get("ref", ""), agent=self.agent_name)
+                if content is None:
+                    return f"No stored output with ref {args.get('ref')}"
+                offset = int(args.get("offset") or 0)
+                chunk = content[offset:offset + 5000]
+                if offset + 5000 < len(content):
+                    chunk += f"\n[{len(content)} chars; continue with offset={offset + 5000}]"
+                return chunk
+            
             elif name == "report_result":
                 # This is handled by the main loop
                 return json.dumps(args)
@@ -301,11 +398,60 @@ You are executing a task within the AgentOS multi-agent system.
         except Exception as e:
             return f"Tool error ({name}): {str(e)}"
     
+    def _run_tools(self, calls: list, iteration: int):
+        """Execute one turn's tool calls, yielding (call, name, result) in order.
+
+        Consecutive parallel-safe calls run together on a bounded pool; serial
+        calls act as barriers (see TOOL_CONCURRENCY). Calls are only started
+        as the caller consumes results, so nothing after a report_result runs.
+        """
+        i = 0
+        while i < len(calls):
+            group = [calls[i]]
+            if TOOL_CONCURRENCY.get(calls[i][1], "serial") == "parallel":
+                while i + len(group) < len(calls) and \
+                        TOOL_CONCURRENCY.get(calls[i + len(group)][1], "serial") == "parallel":
+                    group.append(calls[i + len(group)])
+            i += len(group)
+            entries = []
+            for tc, name, args in group:
+                entries.append({"iteration": iteration + 1, "tool": name, "args": args})
+                self.log.append(entries[-1])
+            if len(group) == 1:
+                tc, name, args = group[0]
+                yield tc, name, self._execute_tool(name, args, entries[0])
+                continue
+            with ThreadPoolExecutor(max_workers=min(TOOL_WORKERS, len(group))) as pool:
+                futures = [pool.submit(self._execute_tool, name, args, entry)
+                           for (_, name, args), entry in zip(group, entries)]
+                for (tc, name, _), fut in zip(group, futures):
+                    yield tc, name, fut.result()
+
+    def _summarize(self, content: str) -> Optional[str]:
+        """Digest a tool output with a cheap model (None on failure)."""
+        summary = self.llm.chat(
+            f"Summarize this tool output in a few lines. Keep names, numbers, paths and errors.\n\n{content[:20000]}",
+            task="summarization", temperature=0, max_tokens=300)
+        return None if summary.startswith("ERROR:") else summary
+    
+    @staticmethod
+    def _parse_args(tool_call: dict) -> dict:
+        """Decode a tool call's JSON arguments ({} if malformed)."""
+        try:
+            return json.loads(tool_call.get("function", {}).get("arguments") or "{}")
+        except:
+            return {}
+    
     def run(self, task: str, task_type: Optional[str] = None, 
-            model: Optional[str] = None, project: Optional[str] = None) -> dict:
+            model: Optional[str] = None, project: Optional[str] = None,
+            checkpoint_id: Optional[str] = None) -> dict:
         """
         Execute a task as this agent.
         
+        With a checkpoint_id (the queue passes the task ID) the run's state is
+        saved to SQLite after every model response and tool result, and a run
+        with a saved checkpoint resumes from it instead of starting over.
+        
         Returns: {
             "agent": str,
             "task": str,
@@ -314,7 +460,9 @@ You are executing a task within the AgentOS multi-agent system.
             "iterations": int,
             "model_used": str,
             "log": list,
-            "project": str
+            "project": str,
+            "usage": dict,  # prompt/completion/total tokens reported by the models
+            "tool_cache": dict  # per-tool cache hits/misses and hit rate
         }
         """
         # Build fallback chain
@@ -332,64 +480,95 @@ You are executing a task within the AgentOS multi-agent system.
         ]
         
         self.log = []
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
         result = {"agent": self.agent_name, "task": task, "model_used": model_info["name"],
-                  "project": project or "default"}
+                  "project": project or "default", "usage": usage}
+        first_iteration = 0
         
-        for iteration in range(self.max_iterations):
-            # Call LLM with fallback
-            response = None
-            for candidate in chain:
-                response = self.llm._raw(
-                    candidate["id"], messages,
-                    temperature=0.3, max_tokens=4096,
-                    tools=AGENT_TOOLS
+        saved = load_checkpoint(checkpoint_id) if checkpoint_id else None
+        if saved:
+            if saved["done"]:
+                return saved["result"]
+            messages, self.log, result = saved["messages"], saved["log"], saved["result"]
+            usage = result["usage"]
+            first_iteration = saved["iteration"]
+        
+        def checkpoint(iteration: int, done: bool = False):
+            if checkpoint_id:
+                save_checkpoint(checkpoint_id, self.agent_name, iteration, messages,
+                                self.log, result, done)
+        
+        def finish(iteration: int) -> dict:
+            result["iterations"] = iteration
+            result["log"] = self.log
+            result["tool_cache"] = self._cache_summary()
+            checkpoint(iteration, done=True)
+            return result
+        
+        for iteration in range(first_iteration, self.max_iterations):
+            # Resuming mid-turn: answer the tool calls the checkpoint left open
+            calls = self._unanswered_calls(messages)
+            
+            if not calls:
+                # Call LLM with fallback (hedged across the chain if enabled)
+                # Streamed tool calls are decoded as soon as each one completes.
+                # Entries hold the call itself so its id() cannot be reused.
+                parsed_args = {}
+                # Digest old tool results once the conversation gets long
+                if self.compaction:
+                    messages = compact_messages(
+                        messages, OUTPUT_STORE, agent=self.agent_name, tools=AGENT_TOOLS,
+                        summarize=self._summarize if self.compaction == "summarize" else None)
+                # Route to models whose context fits; trim the history if none do.
+                fitted, messages = self.llm.fit_context(chain, messages, AGENT_TOOLS, max_tokens=4096)
+                response, candidate = self.llm._complete(
+                    fitted, messages, temperature=0.3, max_tokens=4096, tools=AGENT_TOOLS,
+                    stream=self.stream, force_cache=self.llm.cache is not None,
+                    task=task_type or "agentic",
+                    on_tool_call=lambda tc: parsed_args.__setitem__(id(tc), (tc, self._parse_args(tc)))
                 )
-                if "error" not in response:
+                if candidate is not None:
                     model_info = candidate
                     result["model_used"] = candidate["name"]
-                    break
-            if response is None or "error" in response:
-                response = response or {"error": "No models available"}
-            
-            if "error" in response:
-                result["status"] = "failed"
-                result["result"] = f"LLM error: {response['error']}"
-                result["iterations"] = iteration + 1
-                result["log"] = self.log
-                return result
-            
-            choice = response.get("choices", [{}])[0]
-            msg = choice.get("message", {})
-            
-            # Add assistant message to conversation
-            messages.append(msg)
-            
-            # Check for tool calls
-            tool_calls = msg.get("tool_calls", [])
-            
-            if not tool_calls:
-                # No tool calls — agent is done or just responding
-                content = msg.get("content", "")
-                result["status"] = "completed"
-                result["result"] = content
-                result["iterations"] = iteration + 1
-                result["log"] = self.log
-                return result
-            
-            # Execute each tool call
-            for tc in tool_calls:
-                func = tc.get("function", {})
-                name = func.get("name", "")
-                try:
-                    args = json.loads(func.get("arguments", "{}"))
-                except:
-                    args = {}
+                if response.get("usage") and not response.get("cached"):
+                    for k in usage:
+                        usage[k] += response["usage"].get(k) or 0
+                
+                if "error" in response:
+                    result["status"] = "failed"
+                    result["result"] = f"LLM error: {response['error']}"
+                    return finish(iteration + 1)
                 
-                self.log.append({"iteration": iteration + 1, "tool": name, "args": args})
+                choice = response.get("choices", [{}])[0]
+                msg = choice.get("message", {})
+                # Results and resumes match calls by id; give id-less calls a stable one
+                # before the message is recorded.
+                for n, tc in enumerate(msg.get("tool_calls") or []):
+                    if not tc.get("id"):
+                        tc["id"] = f"call_{iteration}_{n}"
                 
-                # Execute
-                tool_result = self._execute_tool(name, args)
+                # Add assistant message to conversation
+                messages.append(msg)
+                checkpoint(iteration)
                 
+                # Check for tool calls
+                tool_calls = msg.get("tool_calls", [])
+                
+                if not tool_calls:
+                    # No tool calls — agent is done or just responding
+                    content = msg.get("content", "")
+                    result["status"] = "completed"
+                    result["result"] = content
+                    return finish(iteration + 1)
+                
+                calls = []
+                for tc in tool_calls:
+                    name = tc.get("function", {}).get("name", "")
+                    args = parsed_args[id(tc)][1] if id(tc) in parsed_args else self._parse_args(tc)
+                    calls.append((tc, name, args))
+            
+            # Execute the tool calls; independent ones run concurrently
+            for tc, name, tool_result in self._run_tools(calls, iteration):
                 # Check if this is report_result
                 if name == "report_result":
                     try:
@@ -401,23 +580,61 @@ You are executing a task within the AgentOS multi-agent system.
                     except:
                         result["status"] = "completed"
                         result["result"] = tool_result
-                    result["iterations"] = iteration + 1
-                    result["log"] = self.log
-                    return result
+                    return finish(iteration + 1)
                 
                 # Add tool result to conversation
                 messages.append({
                     "role": "tool",
-                    "tool_call_id": tc.get("id", f"call_{iteration}_{name}"),
+                    "tool_call_id": tc.get("id"),
                     "content": tool_result
                 })
+                checkpoint(iteration)
         
         # Max iterations reached
         result["status"] = "max_iterations"
         result["result"] = "Task incomplete — reached maximum iteration limit"
-        result["iterations"] = self.max_iterations
-        result["log"] = self.log
-        return result
+        return finish(self.max_iterations)
+    
+    def _cache_summary(self) -> dict:
+        """Tool cache hits/misses and hit rate per tool over this run's log."""
+        summary = {}
+        for entry in self.log:
+            if "cache" in entry:
+                counts = summary.setdefault(entry["tool"], {"hit": 0, "revalidated": 0, "miss": 0})
+                counts[entry["cache"]] += 1
+        for counts in summary.values():
+            counts["hit_rate"] = round((counts["hit"] + counts["revalidated"]) / sum(counts.values()), 3)
+        return summary
+    
+    def _unanswered_calls(self, messages: list) -> list:
+        """Tool calls of the last model turn that have no result yet.
+        
+        Only a resumed run has any. Calls run in order and each result is
+        checkpointed, so only the first unanswered call can have been in
+        flight at the crash: if it has side effects it is not repeated and
+        the model is told so instead.
+        """
+        turn = len(messages) - 1
+        while turn >= 0 and messages[turn].get("role") == "tool":
+            turn -= 1
+        if turn < 0 or not messages[turn].get("tool_calls"):
+            return []
+        answered = {m.get("tool_call_id") for m in messages[turn + 1:]}
+        calls = []
+        for tc in messages[turn]["tool_calls"]:
+            name = tc.get("function", {}).get("name", "")
+            if tc.get("id") not in answered:
+                calls.append((tc, name, self._parse_args(tc)))
+        if calls and TOOL_CONCURRENCY.get(calls[0][1], "serial") != "parallel" \
+                and calls[0][1] != "report_result":
+            tc, name, _ = calls.pop(0)
+            messages.append({
+                "role": "tool",
+                "tool_call_id": tc.get("id"),
+                "content": f"Interrupted: the run stopped while {name} was executing and it was "
+                           f"not repeated. Check whether it took effect before retrying."
+            })
+        return calls
 
 
 # ── Task Queue (SQLite) ──────────────────────────────────────────────────
@@ -425,11 +642,17 @@ You are executing a task within the AgentOS multi-agent system.
 import sqlite3
 
 QUEUE_DB = "/home/executive-workspace/engine/task_queue.db"
+LEASE_TTL = 300        # seconds a claimed task stays ours without a renewal
+LEASE_RENEW = 60       # seconds between lease renewals while a task runs
+MAX_ATTEMPTS = 3       # claims before a task whose workers keep dying is failed
 
-def init_queue():
-    """Initialize the task queue database."""
-    db = sqlite3.connect(QUEUE_DB)
-    db.execute("""CREATE TABLE IF NOT EXISTS tasks (
+QUEUE_SCHEMA_VERSION = 2   # PRAGMA user_version once init_queue's migrations have run
+
+def _priority_num(column: str) -> str:
+    """SQL mapping a priority label to its sort key (0 = CRITICAL … 3 = LOW)."""
+    return f"CASE {column} WHEN 'CRITICAL' THEN 0 WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3 END"
+
+_TASKS_TABLE = """CREATE TABLE IF NOT EXISTS tasks (
         id TEXT PRIMARY KEY,
         created TEXT DEFAULT CURRENT_TIMESTAMP,
         assigned_to TEXT,
@@ -444,12 +667,117 @@ def init_queue():
         started TEXT,
         completed TEXT,
         project TEXT DEFAULT 'default'
-    )""")
-    # Migration: add project column if missing (for existing DBs)
+    )"""
+
+def _migrate_deploy_schema(db: sqlite3.Connection):
+    """Rebuild a tasks table created by older deploy.sh in the current layout.
+    
+    That schema had INTEGER ids, numeric priorities (1 = most urgent,
+    default 5) and created_at/completed_at instead of created/completed.
+    Ids are kept as text; priorities map onto the CRITICAL…LOW labels.
+    """
+    db.execute("BEGIN IMMEDIATE")
     try:
-        db.execute("ALTER TABLE tasks ADD COLUMN project TEXT DEFAULT 'default'")
-    except:
-        pass  # Column already exists
+        db.execute("ALTER TABLE tasks RENAME TO tasks_deploy")
+        db.execute(_TASKS_TABLE)
+        db.execute("""INSERT INTO tasks (id, created, assigned_to, assigned_by, priority,
+                status, title, description, completed)
+            SELECT CAST(id AS TEXT), COALESCE(created_at, CURRENT_TIMESTAMP), assigned_to,
+                COALESCE(created_by, 'jarvis'),
+                CASE WHEN typeof(priority) = 'text' THEN priority
+                     WHEN priority <= 1 THEN 'CRITICAL' WHEN priority <= 3 THEN 'HIGH'
+                     WHEN priority <= 6 THEN 'MEDIUM' ELSE 'LOW' END,
+                COALESCE(status, 'pending'), title, description, completed_at
+            FROM tasks_deploy""")
+        db.execute("DROP TABLE tasks_deploy")
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+def init_queue():
+    """Initialize the task queue database, migrating older ones in place.
+    
+    The queue runs in WAL mode so the dashboard can read while workers
+    write. priority_num (0 = CRITICAL … 3 = LOW) is kept in step with the
+    priority label by triggers, so claims walk an index in priority order
+    instead of sorting a CASE expression over the whole table. A queue
+    created by older deploy.sh (created_at, INTEGER ids) is rebuilt first.
+    """
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute(_TASKS_TABLE)
+    if db.execute("PRAGMA user_version").fetchone()[0] >= QUEUE_SCHEMA_VERSION:
+        db.close()
+        return
+    columns = {row[1] for row in db.execute("PRAGMA table_info(tasks)")}
+    if "created" not in columns and "created_at" in columns:
+        _migrate_deploy_schema(db)
+    # Migrations: add columns missing from existing DBs
+    for column in ("project TEXT DEFAULT 'default'",
+                   "lease_owner TEXT", "lease_expires REAL",
+                   "attempts INTEGER DEFAULT 0",
+                   "priority_num INTEGER DEFAULT 2"):
+        try:
+            db.execute(f"ALTER TABLE tasks ADD COLUMN {column}")
+        except:
+            pass  # Column already exists
+    db.execute(f"UPDATE tasks SET priority_num = {_priority_num('priority')}")
+    db.execute(f"""CREATE TRIGGER IF NOT EXISTS tasks_priority_insert AFTER INSERT ON tasks
+        BEGIN UPDATE tasks SET priority_num = {_priority_num('NEW.priority')}
+        WHERE rowid = NEW.rowid; END""")
+    db.execute(f"""CREATE TRIGGER IF NOT EXISTS tasks_priority_update AFTER UPDATE OF priority ON tasks
+        BEGIN UPDATE tasks SET priority_num = {_priority_num('NEW.priority')}
+        WHERE rowid = NEW.rowid; END""")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (assigned_to, status, priority_num, created)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks (project, status)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires)")
+    db.execute(f"PRAGMA user_version = {QUEUE_SCHEMA_VERSION}")
+    db.commit()
+    db.close()
+
+def _checkpoint_db() -> sqlite3.Connection:
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    db.execute("""CREATE TABLE IF NOT EXISTS checkpoints (
+        task_id TEXT PRIMARY KEY,
+        agent TEXT,
+        iteration INTEGER,
+        messages TEXT,
+        log TEXT,
+        result TEXT,
+        done INTEGER DEFAULT 0,
+        updated TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+    return db
+
+def save_checkpoint(task_id: str, agent: str, iteration: int, messages: list,
+                    log: list, result: dict, done: bool = False):
+    """Record an agent run's progress so a crashed run can resume."""
+    db = _checkpoint_db()
+    db.execute(
+        "INSERT OR REPLACE INTO checkpoints (task_id, agent, iteration, messages, log, result, done, updated) "
+        "VALUES (?,?,?,?,?,?,?,CURRENT_TIMESTAMP)",
+        (task_id, agent, iteration, json.dumps(messages), json.dumps(log),
+         json.dumps(result), int(done))
+    )
+    db.commit()
+    db.close()
+
+def load_checkpoint(task_id: str) -> Optional[dict]:
+    """The saved state of a run, or None if it has no checkpoint."""
+    db = _checkpoint_db()
+    row = db.execute(
+        "SELECT iteration, messages, log, result, done FROM checkpoints WHERE task_id=?", (task_id,)
+    ).fetchone()
+    db.close()
+    if not row:
+        return None
+    return {"iteration": row[0], "messages": json.loads(row[1]), "log": json.loads(row[2]),
+            "result": json.loads(row[3]), "done": bool(row[4])}
+
+def clear_checkpoint(task_id: str):
+    db = _checkpoint_db()
+    db.execute("DELETE FROM checkpoints WHERE task_id=?", (task_id,))
     db.commit()
     db.close()
 
@@ -460,7 +788,7 @@ def enqueue_task(title: str, description: str, assigned_to: str,
     """Add a task to the queue. Returns task ID."""
     import uuid
     task_id = str(uuid.uuid4())[:8]
-    db = sqlite3.connect(QUEUE_DB)
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
     db.execute(
         "INSERT INTO tasks (id, assigned_to, assigned_by, task_type, priority, title, description, model, project) VALUES (?,?,?,?,?,?,?,?,?)",
         (task_id, assigned_to, assigned_by, task_type, priority, title, description, model, project or "default")
@@ -469,56 +797,156 @@ def enqueue_task(title: str, description: str, assigned_to: str,
     db.close()
     return task_id
 
-def process_next_task(agent_name: str, project: str = None) -> Optional[dict]:
-    """Pick up and execute the next pending task for an agent."""
-    db = sqlite3.connect(QUEUE_DB)
-    db.row_factory = sqlite3.Row
+def _lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+def reclaim_expired_leases(db: Optional[sqlite3.Connection] = None) -> int:
+    """Requeue active tasks whose lease ran out (their worker died or hung).
+    
+    Tasks already claimed MAX_ATTEMPTS times are failed instead. Returns the
+    number of tasks reclaimed. Tasks from before leases (no lease_expires)
+    are left alone; use resume_task for those.
+    """
+    own = db is None
+    db = db or sqlite3.connect(QUEUE_DB, timeout=10)
+    now = time.time()
+    db.execute(
+        "UPDATE tasks SET status='failed', completed=CURRENT_TIMESTAMP, lease_owner=NULL, "
+        "lease_expires=NULL, result=? WHERE status='active' AND lease_expires < ? AND attempts >= ?",
+        (json.dumps({"status": "failed", "result": f"Abandoned by its worker {MAX_ATTEMPTS} times"}),
+         now, MAX_ATTEMPTS))
+    reclaimed = db.execute(
+        "UPDATE tasks SET status='pending', lease_owner=NULL, lease_expires=NULL "
+        "WHERE status='active' AND lease_expires < ?", (now,)).rowcount
+    db.commit()
+    if own:
+        db.close()
+    return reclaimed
+
+def claim_task(agent_name: str, owner: str, project: str = None,
+               task_id: str = None) -> Optional[dict]:
+    """Atomically claim the next pending task for an agent; None if there is none.
     
-    # Get next pending task, optionally filtered by project
-    query = "SELECT * FROM tasks WHERE assigned_to=? AND status='pending'"
+    A single UPDATE ... RETURNING picks and marks the task, so two workers can
+    never claim the same one. The claim is a lease that expires after
+    LEASE_TTL seconds unless renew_lease extends it.
+    """
+    where = "assigned_to=? AND status='pending'"
     params = [agent_name]
     if project:
-        query += " AND project=?"
+        where += " AND project=?"
         params.append(project)
-    query += " ORDER BY CASE priority WHEN 'CRITICAL' THEN 0 WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3 END, created ASC LIMIT 1"
-    
-    row = db.execute(query, params).fetchone()
+    if task_id:
+        where += " AND id=?"
+        params.append(task_id)
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    db.row_factory = sqlite3.Row
+    try:
+        reclaim_expired_leases(db)
+        row = db.execute(
+            "UPDATE tasks SET status='active', started=COALESCE(started, CURRENT_TIMESTAMP), "
+            "lease_owner=?, lease_expires=?, attempts=COALESCE(attempts, 0) + 1 "
+            f"WHERE id = (SELECT id FROM tasks WHERE {where} "
+            "ORDER BY priority_num, created LIMIT 1) AND status='pending' RETURNING *",
+            [owner, time.time() + LEASE_TTL] + params).fetchone()
+        db.commit()
+        return dict(row) if row else None
+    finally:
+        db.close()
+
+def renew_lease(task_id: str, owner: str) -> bool:
+    """Extend our lease on a running task; False if it is no longer ours."""
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    try:
+        renewed = db.execute(
+            "UPDATE tasks SET lease_expires=? WHERE id=? AND lease_owner=? AND status='active'",
+            (time.time() + LEASE_TTL, task_id, owner)).rowcount
+        db.commit()
+        return renewed == 1
+    finally:
+        db.close()
+
+def process_next_task(agent_name: str, project: str = None,
+                      task_id: str = None, on_start=None) -> Optional[dict]:
+    """Claim and execute the next pending task for an agent (or a given one).
     
+    `on_start`, if given, is called with the claimed task row (as a dict)
+    before the agent starts working on it. The task's lease is renewed in
+    the background while it runs.
+    """
+    owner = _lease_owner()
+    row = claim_task(agent_name, owner, project=project, task_id=task_id)
     if not row:
-        db.close()
         return None
     
     task_id = row["id"]
     task_project = row["project"] or "default"
-    
-    # Mark as active
-    db.execute("UPDATE tasks SET status='active', started=CURRENT_TIMESTAMP WHERE id=?", (task_id,))
-    db.commit()
+    if on_start:
+        on_start(row)
     
     # Build task description with project context
     task_desc = f"{row['title']}\n\n{row['description']}"
     if task_project != "default":
         task_desc = f"[Project: {task_project}]\n\n{task_desc}"
     
-    # Execute
-    executor = AgentExecutor(agent_name)
-    result = executor.run(
-        task=task_desc,
-        task_type=row["task_type"],
-        model=row["model"],
-        project=task_project
-    )
+    # Keep the lease alive while the agent works
+    done = threading.Event()
+    def renew():
+        while not done.wait(LEASE_RENEW):
+            try:
+                if not renew_lease(task_id, owner):
+                    return
+            except sqlite3.Error:
+                pass  # retried next round; the lease has slack
+    renewer = threading.Thread(target=renew, daemon=True)
+    renewer.start()
     
-    # Update with result
-    db.execute(
-        "UPDATE tasks SET status=?, result=?, completed=CURRENT_TIMESTAMP WHERE id=?",
-        (result["status"], json.dumps(result), task_id)
-    )
+    # Execute (resuming from a checkpoint if an earlier attempt died)
+    try:
+        executor = AgentExecutor(agent_name)
+        result = executor.run(
+            task=task_desc,
+            task_type=row["task_type"],
+            model=row["model"],
+            project=task_project,
+            checkpoint_id=task_id
+        )
+    finally:
+        done.set()
+    
+    # Update with result, unless the lease expired and the task was reclaimed
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    updated = db.execute(
+        "UPDATE tasks SET status=?, result=?, completed=CURRENT_TIMESTAMP, lease_owner=NULL, "
+        "lease_expires=NULL WHERE id=? AND lease_owner=?",
+        (result["status"], json.dumps(result), task_id, owner)
+    ).rowcount
     db.commit()
     db.close()
+    if updated:
+        clear_checkpoint(task_id)
+    else:
+        result["lease_lost"] = True
     
     return result
 
+def resume_task(task_id: str) -> Optional[dict]:
+    """Re-run a task left 'active' by a dead worker, from its last checkpoint.
+    
+    Only a task whose lease has run out (or that predates leases) is taken
+    over; one a live worker still holds is left alone and None is returned.
+    """
+    db = sqlite3.connect(QUEUE_DB, timeout=10)
+    row = db.execute(
+        "UPDATE tasks SET status='pending', lease_owner=NULL, lease_expires=NULL "
+        "WHERE id=? AND status='active' AND (lease_expires IS NULL OR lease_expires < ?) "
+        "RETURNING assigned_to", (task_id, time.time())).fetchone()
+    db.commit()
+    db.close()
+    if not row:
+        return None
+    return process_next_task(row[0], task_id=task_id)
+
 def list_tasks(status: str = None, agent: str = None, project: str = None) -> list:
     """List tasks, optionally filtered."""
     db = sqlite3.connect(QUEUE_DB)
@@ -579,6 +1007,7 @@ Usage:
   python3 agent_executor.py run <agent> <task> [--type TYPE] [--model MODEL] [--project PROJECT]
   python3 agent_executor.py queue <agent> <title> <description> [--type TYPE] [--priority PRI] [--project PROJECT]
   python3 agent_executor.py process <agent> [--project PROJECT]
+  python3 agent_executor.py resume <task_id>
   python3 agent_executor.py list [--status STATUS] [--agent AGENT] [--project PROJECT]
   python3 agent_executor.py models
   
@@ -618,7 +1047,10 @@ Examples:
         if result.get("log"):
             print(f"\nTool calls: {len(result['log'])}")
             for entry in result["log"]:
-                print(f"  [{entry['iteration']}] {entry['tool']}({json.dumps(entry['args'])[:80]})")
+                cached = f" [cache {entry['cache']}]" if "cache" in entry else ""
+                print(f"  [{entry['iteration']}] {entry['tool']}({json.dumps(entry['args'])[:80]}){cached}")
+        for tool, c in (result.get("tool_cache") or {}).items():
+            print(f"  cache {tool}: {c['hit'] + c['revalidated']}/{c['hit'] + c['revalidated'] + c['miss']} hits ({c['hit_rate']:.0%})")
     
     elif cmd == "queue" and len(sys.argv) >= 5:
         remaining = sys.argv[4:]
@@ -640,6 +1072,16 @@ Examples:
         else:
             print("No pending tasks.")
     
+    elif cmd == "resume" and len(sys.argv) >= 3:
+        task_id = sys.argv[2]
+        print(f"Resuming task {task_id} from its last checkpoint...")
+        result = resume_task(task_id)
+        if result:
+            print(f"Completed: {result['status']}")
+            print(f"Result: {result.get('result', '')}")
+        else:
+            print("No active task with that ID whose lease has expired.")
+    
     elif cmd == "list":
         remaining = sys.argv[2:]
         status, remaining = _extract_flag(remaining, "--status")
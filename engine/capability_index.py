@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Capability Index — local TF-IDF search over what each agent is good at.
+
+Planning used to hand the model every agent in AGENT_CAPABILITIES on every
+call. CapabilityIndex scores agents against a directive locally instead,
+from each agent's capability tags (weighted up) plus the keywords of its
+prompt.md persona, so the planner only sees a shortlist, and a directive
+that clearly needs one skill can be routed without a model call at all.
+
+Vectors are sublinear-TF x smoothed-IDF, L2-normalized, compared by cosine
+similarity. NumPy is used for the scoring when it is installed; otherwise
+the same scores are computed over sparse dicts.
+
+Usage:
+    from capability_index import CapabilityIndex
+    index = CapabilityIndex(AGENT_CAPABILITIES)
+    index.shortlist("Audit our Kubernetes deployment for vulnerabilities", k=6)
+    index.route("Write a blog post")   # -> ("content-creator", 0.25, ["blog"]) or None
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:   # pure-Python scoring below
+    np = None
+
+from agent_executor import AGENT_HOMES
+
+REPO_AGENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "agents")
+CAPABILITY_WEIGHT = 3    # a capability tag counts as this many prompt.md words
+ROUTE_MIN_SCORE = 0.2    # cosine score a directly routed agent needs at least
+ROUTE_MARGIN = 0.05      # ...and its lead over the runner-up
+ROUTE_MAX_TERMS = 12     # longer directives are left to the planner
+
+# Prompt sections after these headings are environment boilerplate shared by every agent.
+_BOILERPLATE = re.compile(r"^##\s+(Your Environment|Installed Tools|Tools|Rules)\b", re.M | re.I)
+_WORD = re.compile(r"[a-z0-9]+")
+_MULTI_STEP = re.compile(r"[,;]|\b(and|then|also|plus|after|before)\b", re.I)
+# Negated or destructive directives always go to the planner, which can refuse or ask.
+_NO_ROUTE = re.compile(r"n't\b|\b(no|not|never|without|avoid|stop|delete|drop|remove|destroy|"
+                       r"wipe|purge|truncate|erase|reset|shut\s*down|kill|revoke|disable|"
+                       r"terminate|uninstall|rm)\b", re.I)
+_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further get had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor
+not now of off on once only or other our ours out over own please same she should so some such
+than that the their theirs them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours
+report reports team work working make need needs new one two use using
+""".split())
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping, enough to match 'contracts' with 'contract'."""
+    for suffix, repl in (("ities", "ity"), ("ies", "y"), ("ing", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)] + repl
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower().replace("_", " "))
+            if w not in _STOPWORDS and len(w) > 1]
+
+
+def _prompt_text(agent: str) -> str:
+    """An agent's prompt.md up to its boilerplate sections ('' if unreadable)."""
+    info = AGENT_HOMES.get(agent, {})
+    kind = "executives" if info.get("type") == "executive" else "sub-agents"
+    for path in (os.path.join(info.get("home", f"/home/{agent}"), "member", "prompt.md"),
+                 os.path.join(REPO_AGENTS_DIR, kind, agent, "prompt.md")):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        cut = _BOILERPLATE.search(text)
+        return text[:cut.start()] if cut else text
+    return ""
+
+
+class CapabilityIndex:
+    """TF-IDF vectors of every agent's capabilities, built lazily and kept per process."""
+
+    def __init__(self, capabilities: Dict[str, List[str]], prompts: bool = True):
+        self.capabilities = capabilities
+        self.prompts = prompts
+        self._lock = threading.Lock()
+        self._built = False
+
+    def _build(self):
+        with self._lock:
+            if self._built:
+                return
+            self.agents = sorted(self.capabilities)
+            # Capability terms per agent, for telling single-skill directives apart.
+            self.skill_terms = {a: {t for cap in self.capabilities[a] for t in tokenize(cap)}
+                                for a in self.agents}
+            docs = []
+            for a in self.agents:
+                tf = Counter()
+                for term in tokenize(" ".join(self.capabilities[a])):
+                    tf[term] += CAPABILITY_WEIGHT
+                if self.prompts:
+                    tf.update(tokenize(_prompt_text(a)))
+                docs.append(tf)
+            df = Counter(term for tf in docs for term in tf)
+            n = len(docs)
+            self.idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+            self.vectors = [self._weigh(tf) for tf in docs]
+            if np is not None:
+                self.vocab = {term: i for i, term in enumerate(sorted(self.idf))}
+                self.matrix = np.zeros((n, len(self.vocab)))
+                for row, vec in enumerate(self.vectors):
+                    for term, w in vec.items():
+                        self.matrix[row, self.vocab[term]] = w
+            self._built = True
+
+    def _weigh(self, tf: Counter) -> Dict[str, float]:
+        vec = {t: (1 + math.log(c)) * self.idf[t] for t, c in tf.items() if t in self.idf}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return {t: w / norm for t, w in vec.items()}
+
+    def scores(self, text: str) -> List[Tuple[str, float]]:
+        """(agent, cosine score) for every agent, best first."""
+        self._build()
+        query = self._weigh(Counter(tokenize(text)))
+        if np is not None:
+            q = np.zeros(len(self.vocab))
+            for term, w in query.items():
+                q[self.vocab[term]] = w
+            sims = (self.matrix @ q).tolist()
+        else:
+            sims = [sum(w * vec.get(t, 0.0) for t, w in query.items()) for vec in self.vectors]
+        return sorted(zip(self.agents, sims), key=lambda kv: -kv[1])
+
+    def shortlist(self, text: str, k: int = 8) -> List[str]:
+        """The k agents best matching `text`; every agent if nothing matches.
+
+        Agents are ranked by how many of their capability terms `text`
+        mentions, then by score, so a word that merely appears in some
+        prompt.md never outranks a capability the directive asks for.
+        """
+        terms = set(tokenize(text))
+        ranked = sorted(((len(terms & self.skill_terms[a]), s, a) for a, s in self.scores(text)
+                         if s > 0), key=lambda r: (-r[0], -r[1]))
+        return [a for _, _, a in ranked[:k]] if ranked else sorted(self.capabilities)
+
+    def route(self, text: str) -> Optional[Tuple[str, float, List[str]]]:
+        """(agent, score, matched skills) if `text` needs one agent's skills only, else None.
+
+        That is: the directive is short and a single step (no "and", "then",
+        commas...), neither negated nor destructive ("don't", "delete"...),
+        mentions at least one capability term, exactly one agent has all the
+        capability terms it mentions, and that agent is also the best match
+        overall, with a score of at least ROUTE_MIN_SCORE and ROUTE_MARGIN
+        ahead of the runner-up.
+        """
+        self._build()
+        terms = tokenize(text)
+        if len(terms) > ROUTE_MAX_TERMS or _MULTI_STEP.search(text) or _NO_ROUTE.search(text):
+            return None
+        skills = set(terms) & set().union(*self.skill_terms.values())
+        owners = [a for a in self.agents if skills and skills <= self.skill_terms[a]]
+        if len(owners) != 1:
+            return None
+        (top, best), (_, second) = self.scores(text)[:2]
+        if top != owners[0] or best < ROUTE_MIN_SCORE or best - second < ROUTE_MARGIN:
+            return None
+        return top, best, sorted(skills)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compaction — keep long agent conversations small without losing tool output.
+
+Every iteration of an agent run resends the whole conversation, so raw tool
+outputs from early iterations are paid for again on every later call. Once a
+conversation's estimated size crosses `high` tokens, compact_messages
+replaces the older tool results with short digests until it is back under
+`low`. The full outputs go to a ToolOutputStore, and each digest says how to
+get them back through the recall_output tool.
+
+A digest is either deterministic (the head of the output plus its size) or
+a summary from a cheap model. A message is compacted at most once, and only
+on the rare compaction passes, so between passes the conversation keeps a
+stable prefix that providers can cache.
+
+Usage:
+    from compaction import OUTPUT_STORE, compact_messages
+    messages = compact_messages(messages, OUTPUT_STORE, agent="tesla")
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Optional
+
+from llm_client import TOKENS, TokenEstimator, _connect_state_db
+
+OUTPUTS_DB = "/home/executive-workspace/engine/tool_outputs.db"
+COMPACT_HIGH = 24000     # estimated prompt tokens that trigger a compaction pass
+COMPACT_LOW = 12000      # ...which compacts until the conversation is under this
+KEEP_RECENT = 2          # newest turns whose tool results are never compacted
+DIGEST_MIN_CHARS = 800   # tool results shorter than this are left alone
+DIGEST_HEAD_CHARS = 400
+DIGEST_MARK = "[compacted "
+
+
+class ToolOutputStore:
+    """Full tool outputs by reference, in SQLite, for recall after compaction.
+
+    Outputs belong to the agent that stored them: refs are derived from the
+    agent as well as the content, and get() only returns the caller's own.
+    """
+
+    def __init__(self, path: str = OUTPUTS_DB, ttl: float = 7 * 86400):
+        self.path = path
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS tool_outputs (
+                ref TEXT PRIMARY KEY,
+                agent TEXT,
+                created REAL,
+                content TEXT
+            )""")
+            self._conn.execute("DELETE FROM tool_outputs WHERE created < ?",
+                               (time.time() - self.ttl,))
+        return self._conn
+
+    def put(self, content: str, agent: str = "") -> str:
+        ref = hashlib.sha256(f"{agent}\0{content}".encode("utf-8", "replace")).hexdigest()[:12]
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO tool_outputs (ref, agent, created, content) VALUES (?,?,?,?)",
+                (ref, agent, time.time(), content))
+        return ref
+
+    def get(self, ref: str, agent: str = "") -> Optional[str]:
+        with self._lock:
+            row = self._db().execute("SELECT content FROM tool_outputs WHERE ref=? AND agent=?",
+                                     (ref, agent)).fetchone()
+        return row[0] if row else None
+
+
+OUTPUT_STORE = ToolOutputStore()
+
+
+def truncate_digest(content: str) -> str:
+    """Deterministic digest: the head of the output."""
+    return content[:DIGEST_HEAD_CHARS].rstrip()
+
+
+def compact_messages(messages: list, store: ToolOutputStore, agent: str = "",
+                     summarize: Optional[Callable[[str], str]] = None,
+                     high: int = COMPACT_HIGH, low: int = COMPACT_LOW,
+                     tools: Optional[list] = None,
+                     estimator: TokenEstimator = TOKENS) -> list:
+    """Return `messages`, with old tool results digested if it exceeds `high`.
+
+    Tool results are digested oldest first, skipping the last KEEP_RECENT
+    turns and recall_output results (their full text was asked for), until
+    the estimate drops under `low`. `summarize` (e.g. a cheap
+    model call) makes the digest; on error, or without one, the output is
+    truncated instead. Untouched messages are the same objects as before.
+    """
+    size = estimator.count(messages, tools)
+    if size <= high:
+        return messages
+    turn_starts = [i for i, m in enumerate(messages) if m.get("role") == "assistant"]
+    protect_from = turn_starts[-KEEP_RECENT] if len(turn_starts) >= KEEP_RECENT else 0
+    recalled = {tc.get("id") for m in messages if m.get("role") == "assistant"
+                for tc in m.get("tool_calls") or []
+                if (tc.get("function") or {}).get("name") == "recall_output"}
+    out = list(messages)
+    for i in range(protect_from):
+        m = out[i]
+        content = m.get("content")
+        if m.get("role") != "tool" or not isinstance(content, str) \
+                or len(content) < DIGEST_MIN_CHARS or content.startswith(DIGEST_MARK) \
+                or m.get("tool_call_id") in recalled:
+            continue
+        ref = store.put(content, agent)
+        digest = None
+        if summarize is not None:
+            try:
+                digest = summarize(content)
+            except Exception:
+                digest = None
+        digest = digest or truncate_digest(content)
+        out[i] = dict(m, content=(f"{DIGEST_MARK}{len(content)} chars; full output: "
+                                  f"recall_output(ref=\"{ref}\")]\n{digest}"))
+        size += estimator.count([out[i]]) - estimator.count([m])
+        if size <= low:
+            break
+    return out
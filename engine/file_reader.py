@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+File Reader — ranged, memory-mapped reads for the read_file tool.
+
+Reading a whole file to return 200 lines of it does not scale to multi-GB
+artifacts. Reads here go through mmap instead, so only the pages a request
+touches are faulted in:
+
+  - read_lines: lines [offset, offset + limit), located through a sparse
+    newline index (every INDEX_STRIDE-th line start) that is built lazily,
+    only as far as requested, and cached per (path, mtime, size). Paging
+    through a file costs one index probe plus at most INDEX_STRIDE scans
+    per page.
+  - read_tail: the last N lines, found by scanning backwards from EOF.
+  - read_bytes: an arbitrary byte range.
+
+Files mmap cannot serve (FIFOs, devices, and procfs/sysfs files that report
+a size of 0) are streamed instead, reading at most STREAM_MAX_BYTES.
+
+Usage:
+    from file_reader import read_lines, read_tail, read_bytes
+    page = read_lines("/var/log/big.log", offset=5000, limit=200)
+    page.text, page.start, page.end, page.total_lines
+"""
+
+import mmap
+import os
+import stat
+import threading
+from array import array
+from collections import OrderedDict, deque
+from typing import NamedTuple, Optional
+
+INDEX_STRIDE = 64        # lines between index checkpoints
+INDEX_CACHE_SIZE = 64    # files whose indexes are kept
+STREAM_MAX_BYTES = 16 * 2**20   # most read from a file that cannot be mapped
+
+
+class Page(NamedTuple):
+    text: str
+    start: int                    # first line (0-based) or byte returned
+    end: int                      # one past the last line or byte returned
+    total_lines: Optional[int]    # None until the whole file has been indexed
+    size: int                     # file size in bytes
+
+
+class LineIndex:
+    """Byte offsets of every INDEX_STRIDE-th line start of one file version."""
+
+    def __init__(self):
+        self.checkpoints = array("q", [0])  # checkpoints[k] = offset of line k*STRIDE
+        self.lines = 0        # lines scanned so far
+        self.pos = 0          # byte offset just past the last scanned line
+        self.complete = False
+        self.lock = threading.Lock()
+
+    def extend(self, mm: mmap.mmap, size: int, upto: int):
+        """Scan forward until line `upto` starts, or EOF."""
+        with self.lock:
+            while not self.complete and self.lines <= upto:
+                nl = mm.find(b"\n", self.pos)
+                if nl < 0:
+                    if self.pos < size:     # last line without a trailing newline
+                        self.lines += 1
+                    self.pos = size
+                    self.complete = True
+                    break
+                self.pos = nl + 1
+                self.lines += 1
+                if self.lines % INDEX_STRIDE == 0:
+                    self.checkpoints.append(self.pos)
+                if self.pos >= size:
+                    self.complete = True
+
+    def offset(self, mm: mmap.mmap, size: int, line: int) -> int:
+        """Byte offset where `line` starts (size if past EOF)."""
+        self.extend(mm, size, line)
+        if line >= self.lines:
+            return size
+        pos = self.checkpoints[line // INDEX_STRIDE]
+        for _ in range(line % INDEX_STRIDE):
+            pos = mm.find(b"\n", pos) + 1
+        return pos
+
+
+_indexes: "OrderedDict[tuple, LineIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _index_for(path: str, st: os.stat_result) -> LineIndex:
+    key = (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LineIndex()
+            while len(_indexes) > INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _mappable(st: os.stat_result) -> bool:
+    """Whether mmap sees the file's real content (not a pipe, device or procfs file)."""
+    return stat.S_ISREG(st.st_mode) and st.st_size > 0
+
+
+def _stream_lines(f):
+    """Lines of an unmappable file, up to STREAM_MAX_BYTES in all."""
+    budget = STREAM_MAX_BYTES
+    while budget > 0:
+        line = f.readline(budget)
+        if not line:
+            return
+        budget -= len(line)
+        yield line
+
+
+def read_lines(path: str, offset: int = 0, limit: int = 200) -> Page:
+    """Lines [offset, offset + limit) of `path`."""
+    offset, limit = max(0, offset), max(0, limit)
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not _mappable(st):
+            kept, n, used, eof = [], 0, 0, True
+            for n, line in enumerate(_stream_lines(f), 1):
+                if n > offset + limit:
+                    eof = False
+                    break
+                used += len(line)
+                if n > offset:
+                    kept.append(line)
+            if used >= STREAM_MAX_BYTES:
+                eof = False     # stopped by the budget, so n is not the file's line count
+            end = offset + len(kept)
+            return Page(_decode(b"".join(kept)), min(offset, end), end,
+                        n if eof else None, st.st_size)
+        index = _index_for(path, st)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = index.offset(mm, st.st_size, offset)
+            stop = index.offset(mm, st.st_size, offset + limit)
+            end = min(offset + limit, index.lines) if index.complete else offset + limit
+            return Page(_decode(mm[start:stop]), min(offset, end), end,
+                        index.lines if index.complete else None, st.st_size)
+
+
+def read_tail(path: str, lines: int = 50) -> Page:
+    """The last `lines` lines of `path`; start/end count from the end (negative)."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        if lines <= 0:
+            return Page("", 0, 0, None, size)
+        if not _mappable(st):
+            tail = deque(_stream_lines(f), maxlen=lines)
+            return Page(_decode(b"".join(tail)), -len(tail), 0, None, size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A trailing newline ends the last line rather than starting a new one.
+            pos = size - 1 if mm[size - 1:size] == b"\n" else size
+            start = found = 0
+            while found < lines:
+                nl = mm.rfind(b"\n", 0, pos)
+                found += 1
+                if nl < 0:
+                    start = 0
+                    break
+                start, pos = nl + 1, nl
+            return Page(_decode(mm[start:size]), -found, 0, None, size)
+
+
+def read_bytes(path: str, start: int = 0, length: int = 65536) -> Page:
+    """Bytes [start, start + length) of `path`; a negative start counts from EOF."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not _mappable(st):
+            data = f.read(STREAM_MAX_BYTES)
+            if start < 0:
+                start = max(0, len(data) + start)
+            chunk = data[start:start + max(0, length)]
+            return Page(_decode(chunk), min(start, len(data)), min(start, len(data)) + len(chunk),
+                        None, st.st_size)
+        size = st.st_size
+        if start < 0:
+            start = max(0, size + start)
+        start = min(start, size)
+        stop = min(size, start + max(0, length))
+        if stop <= start:
+            return Page("", start, start, None, size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return Page(_decode(mm[start:stop]), start, stop, None, size)
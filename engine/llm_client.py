@@ -12,21 +12,52 @@ Fallback order:
 
 Paid models: ONLY at Nikolas's explicit request.
 
+Transport: every LLMClient in a process shares HTTP_POOL, a keep-alive
+connection pool, so consecutive calls reuse the same TLS connection.
+
+Health: a per-model CircuitBreaker (state in llm_state.db, shared by all
+processes) drops failing models from the chain until their backoff expires.
+
 Usage:
     from llm_client import LLMClient
     llm = LLMClient()
     response = llm.chat("What is 2+2?")
     response = llm.chat("Analyze this...", task="analysis")
+
+    # asyncio, for many conversations in flight at once
+    llm = AsyncLLMClient(max_concurrency=64)
+    response = await llm.achat("What is 2+2?")
 """
 
+import asyncio
+import email.utils
+import hashlib
+import http.client
 import json
 import os
-import urllib.request
-import urllib.error
-from typing import Any, Dict, List, Optional
+import queue
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 KEYS_PATH = "/home/executive-workspace/apis/keys.env"
 BASE_URL = "https://openrouter.ai/api/v1"
+STATE_DB = "/home/executive-workspace/engine/llm_state.db"
+CACHE_DB = "/home/executive-workspace/engine/llm_cache.db"
+HEDGE_DEFAULT_DELAY = 8.0   # seconds before hedging when no latency history exists
+STREAM_STALL_TIMEOUT = 30   # max seconds between streamed chunks before giving up
+RATE_LIMIT_MAX_WAIT = 30.0  # longest a request queues for rate-limit capacity
+RATE_LIMIT_RETRIES = 2      # times a 429 with Retry-After is requeued on the same model
+RATE_LIMIT_MAX_PAUSE = 5.0  # longest pause after a 429 that says nothing of its reset
+# Plan workers x hedged attempts, plus chat_batch workers, all share one host.
+POOL_MAX_PER_HOST = 32      # open connections per host in HTTP_POOL
+POOL_WAIT_TIMEOUT = 30.0    # longest a request waits for a free pooled connection
 
 # ── Model Registry ───────────────────────────────────────────────────────
 
@@ -180,12 +211,931 @@ TASK_MODEL_MAP = {
 }
 
 
+# ── Connection Pool ──────────────────────────────────────────────────────
+
+# Errors raised when a kept-alive socket was closed by the server while idle.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+class CancelToken:
+    """Aborts an in-flight pooled request from another thread.
+
+    The pool binds the request's connection to the token; cancel() shuts its
+    socket down, which makes the blocked read in the owning thread fail.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def bind(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._conn = conn
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class PoolExhausted(TimeoutError):
+    """No pooled connection came free in time. A local condition: it says
+    nothing about the health of the model the request was meant for."""
+
+
+class ConnectionPool:
+    """Thread-safe keep-alive HTTP(S) connection pool shared by a process.
+
+    Connections are kept per (scheme, host, port). At most `max_per_host`
+    connections per host are open at once; callers wait up to
+    `wait_timeout` seconds for a free slot, then get PoolExhausted.
+    Idle connections older than `idle_timeout` seconds are reaped.
+    """
+
+    def __init__(self, max_per_host: int = POOL_MAX_PER_HOST, idle_timeout: float = 60.0,
+                 wait_timeout: float = POOL_WAIT_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self._idle: Dict[tuple, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._open: Dict[tuple, int] = {}
+        self._cond = threading.Condition()
+        self.opened = 0
+        self.reused = 0
+        self.reaped = 0
+        self.discarded = 0
+
+    def _reap(self, now: float):
+        """Close idle connections past their timeout. Caller holds the lock."""
+        for key, idle in self._idle.items():
+            fresh = []
+            for conn, last_used in idle:
+                if now - last_used > self.idle_timeout:
+                    conn.close()
+                    self._open[key] -= 1
+                    self.reaped += 1
+                else:
+                    fresh.append((conn, last_used))
+            idle[:] = fresh
+        self._cond.notify_all()
+
+    def reap(self):
+        """Close all connections that have been idle longer than idle_timeout."""
+        with self._cond:
+            self._reap(time.monotonic())
+
+    def _acquire(self, key: tuple, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """A connection for `key`, whose socket timeout is `timeout`. Waiting
+        for a free slot is bounded by wait_timeout, not by `timeout`."""
+        deadline = time.monotonic() + self.wait_timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._reap(now)
+                idle = self._idle.get(key)
+                if idle:
+                    conn, _ = idle.pop()
+                    self.reused += 1
+                    return conn, True
+                if self._open.get(key, 0) < self.max_per_host:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    self.opened += 1
+                    break
+                if now >= deadline:
+                    raise PoolExhausted(f"No free connection to {key[1]} within "
+                                        f"{self.wait_timeout:.0f}s")
+                self._cond.wait(deadline - now)
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, key: tuple, conn: http.client.HTTPConnection, reusable: bool):
+        with self._cond:
+            if reusable:
+                self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            else:
+                conn.close()
+                self._open[key] -= 1
+                self.discarded += 1
+            self._cond.notify()
+
+    @contextmanager
+    def stream(self, method: str, url: str, body: Optional[bytes] = None,
+               headers: Optional[dict] = None, timeout: float = 90,
+               read_timeout: Optional[float] = None,
+               cancel: Optional[CancelToken] = None):
+        """Send a request and yield the open http.client.HTTPResponse.
+
+        `timeout` covers connecting and waiting for the response headers;
+        `read_timeout`, if given, then applies to each read of the body.
+        Raises PoolExhausted if no connection comes free within wait_timeout.
+        The connection goes back to the pool only if the body was read to
+        the end; otherwise it is closed. A reused connection that turns out
+        to be stale is replaced by a fresh one and the request is retried once.
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        conn, reused = self._acquire(key, timeout)
+        resp = None
+        try:
+            if cancel is not None:
+                cancel.bind(conn)
+                if cancel.cancelled:
+                    raise ConnectionAbortedError("Request cancelled")
+            while True:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                try:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    resp = conn.getresponse()
+                    break
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    conn.close()
+                    reused = False
+                    with self._cond:
+                        self.opened += 1
+            if read_timeout is not None and conn.sock is not None:
+                conn.sock.settimeout(read_timeout)
+            yield resp
+        except BaseException:
+            self._release(key, conn, False)
+            raise
+        else:
+            reusable = resp.isclosed() and not resp.will_close
+            self._release(key, conn, reusable and not (cancel and cancel.cancelled))
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[dict] = None, timeout: float = 90,
+                cancel: Optional[CancelToken] = None) -> Tuple[int, dict, bytes]:
+        """Send a request and return (status, headers, body)."""
+        with self.stream(method, url, body=body, headers=headers,
+                         timeout=timeout, cancel=cancel) as resp:
+            data = resp.read()
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+    def stats(self) -> dict:
+        """Connection counters: opened vs reused, plus current pool state."""
+        with self._cond:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "reaped": self.reaped,
+                "discarded": self.discarded,
+                "open": sum(self._open.values()),
+                "idle": sum(len(v) for v in self._idle.values()),
+            }
+
+    def close_all(self):
+        """Close every idle connection (in-flight ones close on release)."""
+        with self._cond:
+            for key, idle in self._idle.items():
+                for conn, _ in idle:
+                    conn.close()
+                    self._open[key] -= 1
+                idle.clear()
+            self._cond.notify_all()
+
+
+# Shared by every LLMClient in the process.
+HTTP_POOL = ConnectionPool()
+
+
+# ── Circuit Breaker ──────────────────────────────────────────────────────
+
+def _connect_state_db(path: str) -> sqlite3.Connection:
+    """Open a shared state DB in autocommit mode, or an in-memory one if unusable."""
+    try:
+        db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.Error:
+        db = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+    return db
+
+
+class CircuitBreaker:
+    """Per-model circuit breaker shared across processes through SQLite.
+
+    closed    — calls go through; consecutive failures are counted
+    open      — calls are skipped until retry_at
+    half_open — one caller probes the model; success closes, failure reopens
+
+    A model opens after `failure_threshold` consecutive failures, or at once
+    on a 5xx. 429s are left to RateLimiter, which paces the model instead;
+    any other 4xx shows the model is answering and counts as a success.
+    The open period doubles on each consecutive trip.
+    """
+
+    def __init__(self, path: str = STATE_DB, failure_threshold: int = 3,
+                 base_backoff: float = 30.0, max_backoff: float = 900.0,
+                 probe_timeout: float = 120.0):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS model_health (
+                model_id TEXT PRIMARY KEY,
+                state TEXT DEFAULT 'closed',
+                failures INTEGER DEFAULT 0,
+                trips INTEGER DEFAULT 0,
+                retry_at REAL DEFAULT 0,
+                successes INTEGER DEFAULT 0,
+                total_failures INTEGER DEFAULT 0,
+                last_status INTEGER,
+                last_error TEXT,
+                updated REAL
+            )""")
+        return self._conn
+
+    def available(self, model_id: str) -> bool:
+        """True unless the model is open and its retry time has not come yet."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT state, retry_at FROM model_health WHERE model_id=?", (model_id,)
+            ).fetchone()
+        return not row or row[0] == "closed" or time.time() >= row[1]
+
+    def allow(self, model_id: str) -> bool:
+        """Decide whether a call may go out; claims the probe of a half-open model."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT state, retry_at FROM model_health WHERE model_id=?", (model_id,)
+            ).fetchone()
+            if not row or row[0] == "closed":
+                return True
+            if now < row[1]:
+                return False
+            # Only one caller (across processes) gets to probe.
+            cur = db.execute(
+                "UPDATE model_health SET state='half_open', retry_at=?, updated=? "
+                "WHERE model_id=? AND retry_at<=?",
+                (now + self.probe_timeout, now, model_id, now))
+            return cur.rowcount == 1
+
+    def record_success(self, model_id: str):
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO model_health (model_id, state, successes, updated) VALUES (?, 'closed', 1, ?) "
+                "ON CONFLICT(model_id) DO UPDATE SET state='closed', failures=0, trips=0, "
+                "retry_at=0, successes=successes+1, updated=excluded.updated",
+                (model_id, now))
+
+    def record_failure(self, model_id: str, error: str, status: Optional[int] = None):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT state, failures, trips FROM model_health WHERE model_id=?", (model_id,)
+                ).fetchone()
+                state, failures, trips = row or ("closed", 0, 0)
+                failures += 1
+                retry_at = 0.0
+                if (state == "half_open" or failures >= self.failure_threshold
+                        or (status or 0) >= 500):
+                    trips += 1
+                    state = "open"
+                    retry_at = now + min(self.base_backoff * 2 ** (trips - 1), self.max_backoff)
+                db.execute(
+                    "INSERT INTO model_health (model_id, state, failures, trips, retry_at, total_failures, "
+                    "last_status, last_error, updated) VALUES (?,?,?,?,?,1,?,?,?) "
+                    "ON CONFLICT(model_id) DO UPDATE SET state=excluded.state, failures=excluded.failures, "
+                    "trips=excluded.trips, retry_at=excluded.retry_at, total_failures=total_failures+1, "
+                    "last_status=excluded.last_status, last_error=excluded.last_error, updated=excluded.updated",
+                    (model_id, state, failures, trips, retry_at, status, error[:300], now))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def reset(self, model_id: Optional[str] = None):
+        """Close the breaker for one model, or for all models."""
+        with self._lock:
+            if model_id:
+                self._db().execute("DELETE FROM model_health WHERE model_id=?", (model_id,))
+            else:
+                self._db().execute("DELETE FROM model_health")
+
+    def scoreboard(self) -> List[dict]:
+        """Health of every model seen so far, most recently updated first."""
+        with self._lock:
+            cur = self._db().execute("SELECT * FROM model_health ORDER BY updated DESC")
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+# Shared by every LLMClient in the process; state is shared across processes.
+BREAKER = CircuitBreaker()
+
+
+# Exceptions that mean the request or its response got lost on the wire.
+_TRANSPORT_ERRORS = (OSError, http.client.HTTPException,
+                     asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+
+def _status(result: dict) -> Optional[int]:
+    """HTTP status of a failed call; OpenRouter may report upstream failures in a 200 body."""
+    err = result.get("error")
+    if isinstance(err, dict) and isinstance(err.get("code"), int):
+        return err["code"]
+    return result.get("status")
+
+
+def _counts_as_failure(result: dict) -> bool:
+    """Transport errors, timeouts, 408 and 5xx reflect model health. Other
+    4xx and local errors (no key, bad JSON, pool exhausted) do not; 429s are
+    paced by RateLimiter instead."""
+    status = _status(result)
+    if status is None:
+        # An error object in the body without a code still came from upstream.
+        return bool(result.get("transport")) or isinstance(result.get("error"), dict)
+    return status == 408 or status >= 500
+
+
+# ── Rate Limiting ────────────────────────────────────────────────────────
+
+def _retry_after(headers: dict, now: float) -> Optional[float]:
+    """Seconds to wait according to Retry-After or X-RateLimit-Reset, if present."""
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get("x-ratelimit-reset")
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        # OpenRouter sends epoch milliseconds; accept seconds too.
+        if reset > 1e11:
+            reset /= 1000.0
+        return max(0.0, reset - now)
+    return None
+
+
+class RateLimiter:
+    """Per-model token buckets that learn their limits from the server.
+
+    A model is unlimited until it answers 429. The bucket rate is then set
+    from the recent request rate and halved on every further 429. It grows
+    back 5% per success and becomes unlimited again past `max_rate`.
+    Retry-After and X-RateLimit-* headers pause a model until its reset;
+    only a 429 without them falls back to the learned rate for its backoff,
+    capped at RATE_LIMIT_MAX_PAUSE.
+    Callers reserve a slot and sleep for the returned delay, so requests
+    queue in arrival order. Time spent queued is recorded per model.
+    """
+
+    def __init__(self, min_rate: float = 0.05, max_rate: float = 20.0, window: float = 10.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.window = window
+        self._buckets: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, model_id: str, now: float) -> dict:
+        b = self._buckets.get(model_id)
+        if b is None:
+            b = self._buckets[model_id] = {
+                "rate": None, "tokens": 1.0, "capacity": 1.0, "updated": now,
+                "blocked_until": 0.0, "last_cut": 0.0, "recent": [], "requests": 0, "limited": 0,
+                "throttled": 0, "refused": 0, "waited": 0.0,
+            }
+        if b["rate"] is not None:
+            b["tokens"] = min(b["capacity"], b["tokens"] + (now - b["updated"]) * b["rate"])
+        b["updated"] = now
+        return b
+
+    def reserve(self, model_id: str, max_wait: float = RATE_LIMIT_MAX_WAIT) -> Optional[float]:
+        """Claim the next slot for a model. Returns the delay to sleep before
+        sending, or None if the wait would exceed max_wait."""
+        now = time.time()
+        with self._lock:
+            b = self._bucket(model_id, now)
+            delay = max(0.0, b["blocked_until"] - now)
+            if b["rate"] is not None and b["tokens"] < 1:
+                delay = max(delay, (1 - b["tokens"]) / b["rate"])
+            if delay > max_wait:
+                b["refused"] += 1
+                return None
+            if b["rate"] is not None:
+                b["tokens"] -= 1  # may go negative: later callers queue behind
+            b["requests"] += 1
+            b["recent"] = [t for t in b["recent"] if now - t < self.window] + [now]
+            if delay > 0:
+                b["throttled"] += 1
+                b["waited"] += delay
+            return delay
+
+    def observe(self, model_id: str, status: Optional[int], headers: dict):
+        """Learn from a response's status and rate-limit headers."""
+        now = time.time()
+        with self._lock:
+            b = self._bucket(model_id, now)
+            wait = _retry_after(headers, now)
+            remaining = headers.get("x-ratelimit-remaining")
+            if status == 429:
+                b["limited"] += 1
+                # A burst of in-flight requests all bounce at once; cut the
+                # rate once per burst rather than once per 429.
+                if b["rate"] is None or now - b["last_cut"] > max(1.0, 1.0 / b["rate"]):
+                    observed = len(b["recent"]) / self.window
+                    rate = b["rate"] if b["rate"] is not None else max(observed, self.min_rate * 2)
+                    b["rate"] = max(self.min_rate, rate / 2)
+                    b["last_cut"] = now
+                limit = headers.get("x-ratelimit-limit")
+                if limit and limit.isdigit():
+                    b["capacity"] = max(1.0, min(float(limit), 10.0))
+                if wait is not None:
+                    # The server said when to come back: that pause is the
+                    # backoff, and the bucket refills at least once per reset
+                    # window so it never queues callers past it.
+                    if wait > 0:
+                        b["rate"] = max(b["rate"], 1.0 / wait)
+                    b["blocked_until"] = max(b["blocked_until"], now + wait)
+                else:
+                    # No reset given: back off on the learned rate, but never
+                    # longer than RATE_LIMIT_MAX_PAUSE (callers fail over instead).
+                    pause = min(1.0 / b["rate"], RATE_LIMIT_MAX_PAUSE)
+                    b["tokens"] = min(b["tokens"], 1.0 - pause * b["rate"])
+                    b["blocked_until"] = max(b["blocked_until"], now + pause)
+                return
+            if remaining is not None and remaining.strip() == "0" and wait:
+                b["blocked_until"] = max(b["blocked_until"], now + wait)
+            if status is not None and status < 400 and b["rate"] is not None:
+                b["rate"] *= 1.05
+                if b["rate"] > self.max_rate:
+                    b["rate"], b["capacity"] = None, 1.0
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-model throttling: learned rate, 429s, requests queued and time waited."""
+        now = time.time()
+        with self._lock:
+            return {
+                model_id: {
+                    "rate": round(b["rate"], 3) if b["rate"] is not None else None,
+                    "requests": b["requests"],
+                    "limited": b["limited"],
+                    "throttled": b["throttled"],
+                    "refused": b["refused"],
+                    "waited_s": round(b["waited"], 2),
+                    "blocked_for_s": round(max(0.0, b["blocked_until"] - now), 2),
+                }
+                for model_id, b in self._buckets.items()
+            }
+
+
+# Shared by every LLMClient in the process.
+RATE_LIMITER = RateLimiter()
+
+
+# ── Adaptive Routing ─────────────────────────────────────────────────────
+
+class RoutingStats:
+    """Rolling per-(model, task) call statistics, persisted in SQLite.
+
+    Tracks EWMAs of success rate, empty-response rate and tool-call validity,
+    plus a running estimate of median latency. rank() reorders an already
+    eligible chain by these scores, so TASK_MODEL_MAP still decides which
+    models are candidates. Models with fewer than `min_samples` calls keep a
+    neutral score, and ties keep their static order.
+    """
+
+    LATENCY_REF = 10.0  # seconds; a model with this p50 scores half of an instant one
+
+    def __init__(self, path: str = STATE_DB, alpha: float = 0.2,
+                 min_samples: int = 5, refresh: float = 30.0):
+        self.path = path
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.refresh = refresh
+        self._conn = None
+        self._lock = threading.Lock()
+        self._snapshot: Dict[tuple, dict] = {}
+        self._loaded: Optional[float] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS model_stats (
+                model_id TEXT,
+                task TEXT,
+                samples INTEGER DEFAULT 0,
+                success REAL DEFAULT 1.0,
+                empty REAL DEFAULT 0.0,
+                tool_valid REAL DEFAULT 1.0,
+                p50_latency REAL,
+                updated REAL,
+                PRIMARY KEY (model_id, task)
+            )""")
+        return self._conn
+
+    def record(self, model_id: str, task: str, ok: bool,
+               latency: Optional[float] = None, empty: bool = False,
+               tool_valid: Optional[bool] = None):
+        a = self.alpha
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT samples, success, empty, tool_valid, p50_latency FROM model_stats "
+                    "WHERE model_id=? AND task=?", (model_id, task)).fetchone()
+                samples, success, empty_rate, valid, p50 = row or (0, 1.0, 0.0, 1.0, None)
+                success = (1 - a) * success + a * (1.0 if ok else 0.0)
+                if ok:
+                    empty_rate = (1 - a) * empty_rate + a * (1.0 if empty else 0.0)
+                if tool_valid is not None:
+                    valid = (1 - a) * valid + a * (1.0 if tool_valid else 0.0)
+                if latency is not None:
+                    # Stochastic median: step toward each sample by a fixed fraction.
+                    if p50 is None:
+                        p50 = latency
+                    else:
+                        step = max(0.05, a * p50 / 2)
+                        p50 += step if latency > p50 else -step if latency < p50 else 0.0
+                db.execute(
+                    "INSERT OR REPLACE INTO model_stats (model_id, task, samples, success, empty, "
+                    "tool_valid, p50_latency, updated) VALUES (?,?,?,?,?,?,?,?)",
+                    (model_id, task, samples + 1, success, empty_rate, valid, p50, time.time()))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _rows(self) -> Dict[tuple, dict]:
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded is None or now - self._loaded > self.refresh:
+                cur = self._db().execute("SELECT * FROM model_stats")
+                cols = [c[0] for c in cur.description]
+                self._snapshot = {(r[0], r[1]): dict(zip(cols, r)) for r in cur.fetchall()}
+                self._loaded = now
+            return self._snapshot
+
+    def score(self, model_id: str, task: str) -> Optional[float]:
+        """Higher is better; None until the model has min_samples calls for the task."""
+        row = self._rows().get((model_id, task))
+        if not row or row["samples"] < self.min_samples:
+            return None
+        p50 = row["p50_latency"] or self.LATENCY_REF
+        return row["success"] * (1 - row["empty"]) * row["tool_valid"] / (1 + p50 / self.LATENCY_REF)
+
+    def rank(self, chain: List[dict], task: str) -> List[dict]:
+        neutral = 1.0 / 2  # a fully reliable model at LATENCY_REF
+        scored = [(self.score(m["id"], task), i, m) for i, m in enumerate(chain)]
+        scored.sort(key=lambda x: (-(x[0] if x[0] is not None else neutral), x[1]))
+        return [m for _, _, m in scored]
+
+    def table(self, task: Optional[str] = None) -> List[dict]:
+        rows = [dict(r) for r in self._rows().values()]
+        if task:
+            rows = [r for r in rows if r["task"] == task]
+        for r in rows:
+            r["score"] = self.score(r["model_id"], r["task"])
+        return sorted(rows, key=lambda r: (r["task"], -(r["score"] or 0)))
+
+
+ROUTING_STATS = RoutingStats()
+
+
+# ── Response Cache ───────────────────────────────────────────────────────
+
+class ResponseCache:
+    """Disk-backed cache of completions, keyed on everything that shapes them.
+
+    The key covers model id, normalized messages, tools, temperature and
+    max_tokens. Entries expire after `ttl` seconds, and the least recently
+    hit ones are evicted once the store grows past `max_bytes`. LLMClient
+    only consults the cache for temperature 0 unless the call forces it.
+    """
+
+    def __init__(self, path: str = CACHE_DB, ttl: float = 7 * 86400,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.tokens_saved = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model_id TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                last_hit REAL,
+                hits INTEGER DEFAULT 0
+            )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_hit ON responses (last_hit)")
+        return self._conn
+
+    @staticmethod
+    def _normalize(messages: list) -> list:
+        """Drop fields that do not affect the completion and trim whitespace."""
+        out = []
+        for m in messages:
+            n = {"role": m.get("role")}
+            content = m.get("content")
+            n["content"] = content.strip() if isinstance(content, str) else content
+            for field in ("name", "tool_call_id"):
+                if m.get(field):
+                    n[field] = m[field]
+            if m.get("tool_calls"):
+                n["tool_calls"] = [
+                    {"id": tc.get("id"),
+                     "name": tc.get("function", {}).get("name"),
+                     "arguments": tc.get("function", {}).get("arguments")}
+                    for tc in m["tool_calls"]
+                ]
+            out.append(n)
+        return out
+
+    def key(self, model_id: str, messages: list, tools: Optional[list],
+            temperature: float, max_tokens: int) -> str:
+        blob = json.dumps({
+            "model": model_id,
+            "messages": self._normalize(messages),
+            "tools": tools or [],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT response, created FROM responses WHERE key=?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl:
+                db.execute("UPDATE responses SET hits=hits+1, last_hit=? WHERE key=?", (now, key))
+                self.hits += 1
+                response = json.loads(row[0])
+                self.tokens_saved += (response.get("usage") or {}).get("total_tokens", 0)
+                return response
+            if row:
+                db.execute("DELETE FROM responses WHERE key=?", (key,))
+            return None
+
+    def put(self, key: str, model_id: str, response: dict):
+        now = time.time()
+        blob = json.dumps(response)
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, model_id, response, size, created, last_hit) "
+                "VALUES (?,?,?,?,?,?)", (key, model_id, blob, len(blob), now, now))
+            self.stores += 1
+            db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # Evict least recently hit entries until back under the cap.
+                for k, size in db.execute(
+                        "SELECT key, size FROM responses ORDER BY last_hit ASC").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    db.execute("DELETE FROM responses WHERE key=?", (k,))
+                    total -= size
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the size of the store."""
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "tokens_saved": self.tokens_saved,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+# ── Latency Tracking ─────────────────────────────────────────────────────
+
+class LatencyTracker:
+    """Recent successful-call latencies per model, used to time hedges."""
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_id: str, seconds: float):
+        with self._lock:
+            samples = self._samples.setdefault(model_id, [])
+            samples.append(seconds)
+            del samples[:-self.window]
+
+    def percentile(self, model_id: str, pct: float, min_samples: int = 5) -> Optional[float]:
+        """The pct-th percentile latency, or None with too little history."""
+        with self._lock:
+            samples = sorted(self._samples.get(model_id, []))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+LATENCY = LatencyTracker()
+TTFT = LatencyTracker()     # time to first token of streamed calls
+
+
+# ── Token Accounting ─────────────────────────────────────────────────────
+
+class TokenEstimator:
+    """Fast local prompt-size estimate, calibrated against reported usage.
+
+    Counts UTF-8 bytes / 4 over message text, tool calls and tool schemas,
+    plus a small per-message overhead. Each response's usage.prompt_tokens
+    nudges a per-model correction factor, so estimates track the real
+    tokenizer without shipping one.
+    """
+
+    BYTES_PER_TOKEN = 4.0
+    MESSAGE_OVERHEAD = 4    # role and separator tokens per message
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self._ratio: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _text(value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list):  # content parts
+            return "".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in value)
+        return json.dumps(value, separators=(",", ":"))
+
+    def raw(self, messages: list, tools: Optional[list] = None) -> int:
+        size = 0
+        for m in messages:
+            size += len(self._text(m.get("content")).encode("utf-8", "replace"))
+            if m.get("tool_calls"):
+                size += len(self._text(m["tool_calls"]))
+        if tools:
+            size += len(self._text(tools))
+        return int(size / self.BYTES_PER_TOKEN) + self.MESSAGE_OVERHEAD * len(messages)
+
+    def count(self, messages: list, tools: Optional[list] = None,
+              model_id: Optional[str] = None) -> int:
+        """Estimated prompt tokens for a request to model_id."""
+        ratio = self._ratio.get(model_id, 1.0) if model_id else max(self._ratio.values(), default=1.0)
+        return int(self.raw(messages, tools) * ratio)
+
+    def calibrate(self, model_id: str, estimated: int, actual: int):
+        if estimated <= 0 or actual <= 0:
+            return
+        sample = min(4.0, max(0.25, actual / estimated))
+        with self._lock:
+            prev = self._ratio.get(model_id, sample)
+            self._ratio[model_id] = (1 - self.alpha) * prev + self.alpha * sample
+
+
+TOKENS = TokenEstimator()
+TRIM_TOOL_CHARS = 2000  # oversized tool results are cut to this before turns are dropped
+
+
+def trim_messages(messages: list, budget: int, tools: Optional[list] = None,
+                  estimator: TokenEstimator = TOKENS, model_id: Optional[str] = None) -> list:
+    """Return a copy of `messages` that fits `budget` prompt tokens.
+
+    Leading system messages and the first user message (the task) are always
+    kept. Tool results are shortened to head + tail, oldest first; if that is
+    not enough, whole turns (an assistant message with its tool results) are
+    dropped oldest first, leaving a note in their place. The newest turn is
+    never dropped, so the result may still exceed the budget.
+    """
+    def fits(msgs):
+        return estimator.count(msgs, tools, model_id) <= budget
+
+    if fits(messages):
+        return messages
+    head = 0
+    while head < len(messages) and messages[head].get("role") == "system":
+        head += 1
+    if head < len(messages) and messages[head].get("role") == "user":
+        head += 1
+    out = [dict(m) for m in messages]
+
+    for m in out[head:]:
+        content = m.get("content")
+        if m.get("role") == "tool" and isinstance(content, str) and len(content) > TRIM_TOOL_CHARS:
+            half = TRIM_TOOL_CHARS // 2
+            m["content"] = (f"{content[:half]}\n... [{len(content) - TRIM_TOOL_CHARS} chars trimmed "
+                            f"to fit context] ...\n{content[-half:]}")
+            if fits(out):
+                return out
+
+    # Group the tail into turns so tool results never lose their tool_calls.
+    turns, current = [], []
+    for m in out[head:]:
+        if m.get("role") != "tool" and current:
+            turns.append(current)
+            current = []
+        current.append(m)
+    if current:
+        turns.append(current)
+    dropped = 0
+    while len(turns) > 1:
+        dropped += len(turns.pop(0))
+        note = {"role": "user", "content": f"[{dropped} earlier messages trimmed to fit context]"}
+        candidate = out[:head] + [note] + [m for t in turns for m in t]
+        if fits(candidate):
+            return candidate
+    return out[:head] + ([note] if dropped else []) + [m for t in turns for m in t]
+
+
+def _has_content(result: dict) -> bool:
+    """Acceptance check for text completions: no error and a non-empty message."""
+    if "error" in result:
+        return False
+    choices = result.get("choices") or [{}]
+    return bool(choices[0].get("message", {}).get("content"))
+
+
+def _no_error(result: dict) -> bool:
+    return "error" not in result
+
+
 class LLMClient:
     """OpenRouter LLM client with automatic fallback chain."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 hedge: bool = False, hedge_delay: Optional[float] = None,
+                 cache: Any = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 adaptive: bool = False,
+                 routing_stats: Optional[RoutingStats] = None):
         self.api_key = api_key or self._load_key()
         self.paid_authorized = False  # Only Nikolas can flip this
+        self.breaker = breaker or BREAKER
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        # Adaptive routing: re-rank each task's chain by observed quality.
+        self.adaptive = adaptive
+        self.routing_stats = routing_stats or ROUTING_STATS
+        # Response cache: None/False = off, True = default on-disk store.
+        self.cache = ResponseCache() if cache is True else (cache or None)
+        # Hedging: if a model has not answered after hedge_delay seconds
+        # (default: its measured p95), race the next model in the chain.
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        # Token accounting: totals of the usage reported by completed calls.
+        self.tokens = TOKENS
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self._usage_lock = threading.Lock()
 
     def _load_key(self) -> str:
         try:
@@ -205,7 +1155,8 @@ class LLMClient:
     def get_fallback_chain(self, task: Optional[str] = None,
                            needs_tools: bool = False,
                            needs_reasoning: bool = False,
-                           min_context: int = 0) -> List[dict]:
+                           min_context: int = 0,
+                           adaptive: Optional[bool] = None) -> List[dict]:
         chain_names = TASK_MODEL_MAP.get(task, DEFAULT_FALLBACK)
         chain = []
         for name in chain_names:
@@ -223,7 +1174,31 @@ class LLMClient:
             chain.append(m)
         if not any(m["id"] == "openrouter/free" for m in chain):
             chain.append(MODELS["free_router"])
-        return chain
+        if self.adaptive if adaptive is None else adaptive:
+            chain = self.routing_stats.rank(chain, task or "general")
+        # Skip models whose circuit is open; if every one is tripped, keep the
+        # chain so half-open probes can still go out once retry_at passes.
+        healthy = [m for m in chain if self.breaker.available(m["id"])]
+        return healthy or chain
+
+    def fit_context(self, chain: List[dict], messages: list,
+                    tools: Optional[list] = None,
+                    max_tokens: int = 4096) -> Tuple[List[dict], list]:
+        """Restrict `chain` to models whose context window fits the request.
+
+        Returns (chain, messages). When no model fits, the messages are
+        trimmed (see trim_messages) to the largest window in the chain, so
+        calls do not fail down the chain on context overflow.
+        """
+        need = self.tokens.count(messages, tools) + max_tokens
+        fitting = [m for m in chain if m["context"] >= need]
+        if fitting or not chain:
+            return fitting, messages
+        largest = max(m["context"] for m in chain)
+        messages = trim_messages(messages, largest - max_tokens, tools, self.tokens)
+        need = self.tokens.count(messages, tools) + max_tokens
+        return [m for m in chain if m["context"] >= need] or \
+            [m for m in chain if m["context"] == largest], messages
 
     def chat(self, message: str,
              system: Optional[str] = None,
@@ -231,7 +1206,9 @@ class LLMClient:
              model: Optional[str] = None,
              paid: bool = False,
              temperature: float = 0.7,
-             max_tokens: int = 4096) -> str:
+             max_tokens: int = 4096,
+             hedge: Optional[bool] = None,
+             force_cache: bool = False) -> str:
         if paid:
             self.paid_authorized = True
 
@@ -256,44 +1233,285 @@ class LLMClient:
 
         # Fallback chain
         chain = self.get_fallback_chain(task=task)
-        last_err = "No models available"
-        for m in chain:
-            result = self._call(m["id"], messages, temperature, max_tokens)
-            if not result.startswith("ERROR:"):
-                return result
-            last_err = result
-        return last_err
+        result, _ = self._complete(chain, messages, temperature, max_tokens,
+                                   accept=_has_content, hedge=hedge,
+                                   force_cache=force_cache, task=task or "general")
+        return self._text(result)
 
     def chat_with_tools(self, message: str, tools: List[Dict],
                         system: Optional[str] = None,
                         task: Optional[str] = None,
                         temperature: float = 0.3,
-                        max_tokens: int = 4096) -> dict:
+                        max_tokens: int = 4096,
+                        hedge: Optional[bool] = None,
+                        force_cache: bool = False) -> dict:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": message})
         chain = self.get_fallback_chain(task=task or "tool_use", needs_tools=True)
-        for m in chain:
-            result = self._raw(m["id"], messages, temperature, max_tokens, tools=tools)
-            if "error" not in result:
-                return result
-        return {"error": "All models in fallback chain failed"}
+        result, model = self._complete(chain, messages, temperature, max_tokens,
+                                       tools=tools, hedge=hedge, force_cache=force_cache,
+                                       task=task or "tool_use")
+        if model is None:
+            return {"error": "All models in fallback chain failed"}
+        return result
 
     def multi_turn(self, messages: List[Dict],
                    task: Optional[str] = None,
                    temperature: float = 0.7,
-                   max_tokens: int = 4096) -> str:
+                   max_tokens: int = 4096,
+                   hedge: Optional[bool] = None,
+                   force_cache: bool = False) -> str:
         chain = self.get_fallback_chain(task=task)
+        result, model = self._complete(chain, messages, temperature, max_tokens,
+                                       accept=_has_content, hedge=hedge,
+                                       force_cache=force_cache, task=task or "general")
+        if model is None:
+            return "ERROR: All models failed"
+        return self._text(result)
+
+    def chat_batch(self, prompts: List[str],
+                   task: Optional[str] = "general",
+                   system: Optional[str] = None,
+                   temperature: float = 0.7,
+                   max_tokens: int = 4096,
+                   max_workers: int = 8,
+                   per_model_limit: int = 4,
+                   force_cache: bool = False) -> List[dict]:
+        """Run many independent prompts concurrently.
+
+        Each model has at most `per_model_limit` requests in flight. A model
+        that fails with a transport error or 5xx is skipped for the rest of
+        the batch, and so is one the rate limiter cannot fit in within
+        RATE_LIMIT_MAX_WAIT. Returns one dict per prompt, in input order:
+            {"ok": bool, "result": str | None, "model": str | None, "error": str | None}
+        """
+        chain = self.get_fallback_chain(task=task)
+        limits = {m["id"]: threading.BoundedSemaphore(per_model_limit) for m in chain}
+        failed = set()
+        failed_lock = threading.Lock()
+
+        def run_one(prompt: str) -> dict:
+            messages = []
+            if system:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": prompt})
+            with failed_lock:
+                live = [m for m in chain if m["id"] not in failed] or chain
+            last = {"error": "No models available"}
+            for m in live:
+                with limits[m["id"]]:
+                    result, model = self._complete([m], messages, temperature, max_tokens,
+                                                   accept=_has_content, hedge=False,
+                                                   force_cache=force_cache,
+                                                   task=task or "general")
+                if model is not None:
+                    return {"ok": True, "result": self._text(result),
+                            "model": m["name"], "error": None}
+                if "error" in result and not result.get("local") and (
+                        result.get("circuit_open") or result.get("throttled")
+                        or _counts_as_failure(result)):
+                    with failed_lock:
+                        failed.add(m["id"])
+                last = result
+            return {"ok": False, "result": None, "model": None, "error": self._text(last)}
+
+        def safe(prompt: str) -> dict:
+            try:
+                return run_one(prompt)
+            except Exception as e:
+                return {"ok": False, "result": None, "model": None, "error": f"ERROR: {e}"}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as pool:
+            return list(pool.map(safe, prompts))
+
+    def chat_stream(self, message: str,
+                    system: Optional[str] = None,
+                    task: Optional[str] = None,
+                    on_delta: Optional[Callable[[str], None]] = None,
+                    temperature: float = 0.7,
+                    max_tokens: int = 4096) -> str:
+        """Like chat(), but streams content deltas to on_delta as they arrive."""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": message})
+        return self.multi_turn_stream(messages, task=task, on_delta=on_delta,
+                                      temperature=temperature, max_tokens=max_tokens)
+
+    def multi_turn_stream(self, messages: List[Dict],
+                          task: Optional[str] = None,
+                          on_delta: Optional[Callable[[str], None]] = None,
+                          temperature: float = 0.7,
+                          max_tokens: int = 4096) -> str:
+        """Like multi_turn(), but streams content deltas to on_delta."""
+        chain = self.get_fallback_chain(task=task)
+        result, model = self._complete(chain, messages, temperature, max_tokens,
+                                       accept=_has_content, stream=True, on_delta=on_delta,
+                                       task=task or "general")
+        if model is None:
+            return "ERROR: All models failed"
+        return self._text(result)
+
+    def chat_with_tools_stream(self, message: str, tools: List[Dict],
+                               system: Optional[str] = None,
+                               task: Optional[str] = None,
+                               on_delta: Optional[Callable[[str], None]] = None,
+                               on_tool_call: Optional[Callable[[dict], None]] = None,
+                               temperature: float = 0.3,
+                               max_tokens: int = 4096) -> dict:
+        """Like chat_with_tools(), but streams; each tool call is handed to
+        on_tool_call as soon as its arguments are complete."""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": message})
+        chain = self.get_fallback_chain(task=task or "tool_use", needs_tools=True)
+        result, model = self._complete(chain, messages, temperature, max_tokens,
+                                       tools=tools, stream=True,
+                                       on_delta=on_delta, on_tool_call=on_tool_call,
+                                       task=task or "tool_use")
+        if model is None:
+            return {"error": "All models in fallback chain failed"}
+        return result
+
+    def _complete(self, chain: List[dict], messages: list,
+                  temperature: float, max_tokens: int,
+                  tools: Optional[list] = None,
+                  accept=_no_error,
+                  hedge: Optional[bool] = None,
+                  stream: bool = False,
+                  on_delta: Optional[Callable[[str], None]] = None,
+                  on_tool_call: Optional[Callable[[dict], None]] = None,
+                  force_cache: bool = False,
+                  task: Optional[str] = None) -> Tuple[dict, Optional[dict]]:
+        """Walk the fallback chain until a response passes `accept`.
+
+        Returns (response, model). On total failure model is None and the
+        response is the last one received. With stream=True each model is
+        called through _raw_stream; if one stalls mid-stream, deltas restart
+        from the next model in the chain.
+
+        With a response cache, temperature-0 (or force_cache) calls first
+        look for a cached answer from any model in the chain, in order.
+        `task` labels the calls in the adaptive routing statistics. Models
+        too small for the conversation are skipped (see fit_context).
+        """
+        if not chain:
+            return {"error": "No models available"}, None
+        chain, messages = self.fit_context(chain, messages, tools, max_tokens)
+        if self.cache is not None:
+            if temperature > 0 and not force_cache:
+                self.cache.bypassed += 1
+            else:
+                for m in chain:
+                    hit = self.cache.get(self.cache.key(m["id"], messages, tools,
+                                                        temperature, max_tokens))
+                    if hit is not None and accept(hit):
+                        hit["cached"] = True
+                        msg = hit["choices"][0]["message"]
+                        if stream and on_delta and msg.get("content"):
+                            on_delta(msg["content"])
+                        if stream and on_tool_call:
+                            for tc in msg.get("tool_calls") or []:
+                                on_tool_call(tc)
+                        return hit, m
+                self.cache.misses += 1
+                result, model = self._complete_live(chain, messages, temperature, max_tokens,
+                                                    tools, accept, hedge, stream,
+                                                    on_delta, on_tool_call, task)
+                if model is not None:
+                    stored = {k: v for k, v in result.items() if k != "stream_stats"}
+                    self.cache.put(self.cache.key(model["id"], messages, tools,
+                                                  temperature, max_tokens), model["id"], stored)
+                self._account(model, messages, tools, result)
+                return result, model
+        result, model = self._complete_live(chain, messages, temperature, max_tokens,
+                                            tools, accept, hedge, stream, on_delta,
+                                            on_tool_call, task)
+        self._account(model, messages, tools, result)
+        return result, model
+
+    def _complete_live(self, chain: List[dict], messages: list,
+                       temperature: float, max_tokens: int,
+                       tools: Optional[list], accept, hedge: Optional[bool],
+                       stream: bool, on_delta, on_tool_call,
+                       task: Optional[str] = None) -> Tuple[dict, Optional[dict]]:
+        """The uncached part of _complete: call models down the chain."""
+        if stream:
+            # Streams are not hedged: a stalled model is detected between
+            # chunks, and racing two streams would interleave their deltas.
+            result = {"error": "No models available"}
+            for m in chain:
+                result = self._raw_stream(m["id"], messages, temperature, max_tokens,
+                                          tools=tools, on_delta=on_delta,
+                                          on_tool_call=on_tool_call, task=task)
+                if accept(result):
+                    return result, m
+            return result, None
+        if (self.hedge if hedge is None else hedge):
+            return self._complete_hedged(chain, messages, temperature, max_tokens,
+                                         tools, accept, task)
+        result = {"error": "No models available"}
         for m in chain:
-            result = self._call(m["id"], messages, temperature, max_tokens)
-            if not result.startswith("ERROR:"):
-                return result
-        return "ERROR: All models failed"
+            result = self._raw(m["id"], messages, temperature, max_tokens, tools=tools, task=task)
+            if accept(result):
+                return result, m
+        return result, None
 
-    def _call(self, model_id: str, messages: list,
-              temperature: float, max_tokens: int) -> str:
-        result = self._raw(model_id, messages, temperature, max_tokens)
+    def _hedge_after(self, model: dict) -> float:
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        p95 = LATENCY.percentile(model["id"], 95)
+        return p95 if p95 is not None else HEDGE_DEFAULT_DELAY
+
+    def _complete_hedged(self, chain: List[dict], messages: list,
+                         temperature: float, max_tokens: int,
+                         tools: Optional[list], accept,
+                         task: Optional[str] = None) -> Tuple[dict, Optional[dict]]:
+        """Race models down the chain: start the next one when the newest
+        attempt is slower than its hedge delay or has failed. The first
+        acceptable response wins and the other attempts are cancelled."""
+        done = queue.Queue()
+        tokens = []
+
+        def attempt(m: dict, token: CancelToken):
+            r = self._raw(m["id"], messages, temperature, max_tokens, tools=tools,
+                          cancel=token, task=task)
+            done.put((m, r))
+
+        def launch():
+            token = CancelToken()
+            tokens.append(token)
+            threading.Thread(target=attempt, args=(chain[len(tokens) - 1], token),
+                             daemon=True).start()
+
+        launch()
+        pending = 1
+        result = {"error": "No models available"}
+        while pending:
+            wait = self._hedge_after(chain[len(tokens) - 1]) if len(tokens) < len(chain) else None
+            try:
+                m, r = done.get(timeout=wait)
+            except queue.Empty:
+                launch()
+                pending += 1
+                continue
+            pending -= 1
+            if accept(r):
+                for token in tokens:
+                    token.cancel()
+                return r, m
+            result = r
+            if not pending and len(tokens) < len(chain):
+                launch()
+                pending += 1
+        return result, None
+
+    @staticmethod
+    def _text(result: dict) -> str:
+        """Message content of a completion, or an ERROR: string."""
         if "error" in result:
             return f"ERROR: {result['error']}"
         choices = result.get("choices", [])
@@ -303,12 +1521,15 @@ class LLMClient:
                 return content
         return "ERROR: Empty response"
 
-    def _raw(self, model_id: str, messages: list,
-             temperature: float, max_tokens: int,
-             tools: Optional[list] = None) -> dict:
-        if not self.api_key:
-            return {"error": "No OPENROUTER_API_KEY configured"}
+    def _call(self, model_id: str, messages: list,
+              temperature: float, max_tokens: int) -> str:
+        return self._text(self._raw(model_id, messages, temperature, max_tokens))
 
+    def _request(self, model_id: str, messages: list,
+                 temperature: float, max_tokens: int,
+                 tools: Optional[list] = None,
+                 stream: bool = False) -> Tuple[bytes, dict]:
+        """Encode a chat/completions request body and its headers."""
         payload = {
             "model": model_id,
             "messages": messages,
@@ -317,6 +1538,8 @@ class LLMClient:
         }
         if tools:
             payload["tools"] = tools
+        if stream:
+            payload["stream"] = True
 
         data = json.dumps(payload).encode()
         headers = {
@@ -325,20 +1548,270 @@ class LLMClient:
             "HTTP-Referer": "https://agent-os.local",
             "X-Title": "AgentOS Multi-Agent System"
         }
+        return data, headers
+
+    def _settle(self, model_id: str, result: dict, started: float,
+                cancel: Optional[CancelToken] = None,
+                task: Optional[str] = None, tools: bool = False) -> dict:
+        """Feed the outcome of a call into the breaker, latency and routing stats."""
+        if cancel is not None and cancel.cancelled:
+            # Lost a hedge race; says nothing about the model's health.
+            return {"error": "Cancelled", "cancelled": True}
+        if task is not None:
+            self._observe(model_id, task, result, time.monotonic() - started, tools)
+        if "error" in result:
+            status = _status(result)
+            if _counts_as_failure(result):
+                self.breaker.record_failure(model_id, str(result["error"]), status)
+            elif status is not None and 400 <= status < 500 and status != 429:
+                # The model answered; the request was at fault. This also
+                # settles a half-open probe instead of leaving it pending.
+                self.breaker.record_success(model_id)
+        else:
+            self.breaker.record_success(model_id)
+            LATENCY.record(model_id, time.monotonic() - started)
+        return result
+
+    def _observe(self, model_id: str, task: str, result: dict, elapsed: float, tools: bool):
+        ok = "error" not in result
+        msg = ((result.get("choices") or [{}])[0].get("message") or {}) if ok else {}
+        tool_valid = None
+        if tools and msg.get("tool_calls"):
+            tool_valid = True
+            for tc in msg["tool_calls"]:
+                try:
+                    json.loads(tc.get("function", {}).get("arguments") or "{}")
+                except ValueError:
+                    tool_valid = False
+        try:
+            self.routing_stats.record(
+                model_id, task, ok, latency=elapsed if ok else None,
+                empty=ok and not msg.get("content") and not msg.get("tool_calls"),
+                tool_valid=tool_valid)
+        except sqlite3.Error:
+            pass  # statistics are best-effort
+
+    def _account(self, model: Optional[dict], messages: list,
+                 tools: Optional[list], result: dict):
+        """Add a live response's reported usage to the totals and calibrate
+        the token estimator against it."""
+        usage = result.get("usage") if model is not None else None
+        if not usage:
+            return
+        self.tokens.calibrate(model["id"], self.tokens.raw(messages, tools),
+                              usage.get("prompt_tokens") or 0)
+        with self._usage_lock:
+            totals = self.usage.setdefault(model["id"], {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
+            totals["calls"] += 1
+            for k in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                totals[k] += usage.get(k) or 0
+
+    @staticmethod
+    def _throttled(model_id: str) -> dict:
+        return {"error": f"Rate limited: no capacity for {model_id} within {RATE_LIMIT_MAX_WAIT:.0f}s",
+                "status": 429, "throttled": True}
+
+    @staticmethod
+    def _requeue(result: dict, headers: dict) -> bool:
+        """A 429 that says when to come back, so worth waiting for on the same model."""
+        return result.get("status") == 429 and _retry_after(headers, time.time()) is not None
+
+    def _raw(self, model_id: str, messages: list,
+             temperature: float, max_tokens: int,
+             tools: Optional[list] = None,
+             cancel: Optional[CancelToken] = None,
+             task: Optional[str] = None) -> dict:
+        if not self.api_key:
+            return {"error": "No OPENROUTER_API_KEY configured"}
+
+        data, headers = self._request(model_id, messages, temperature, max_tokens, tools)
+
+        # A 429 that says when to come back goes back into the model's queue
+        # (up to RATE_LIMIT_RETRIES times); one that does not fails over to
+        # the next model in the chain rather than waiting blind.
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            delay = self.rate_limiter.reserve(model_id)
+            if delay is None:
+                return self._throttled(model_id)
+            time.sleep(delay)
+
+            if not self.breaker.allow(model_id):
+                return {"error": f"Circuit open for {model_id}", "circuit_open": True}
+
+            started = time.monotonic()
+            resp_headers = {}
+            try:
+                status, resp_headers, body = HTTP_POOL.request(
+                    "POST", f"{BASE_URL}/chat/completions",
+                    body=data, headers=headers, timeout=90, cancel=cancel
+                )
+                self.rate_limiter.observe(model_id, status, resp_headers)
+                if status >= 400:
+                    result = {"error": f"HTTP {status}: {body.decode(errors='replace')[:300]}",
+                              "status": status}
+                else:
+                    result = json.loads(body.decode())
+            except PoolExhausted as e:
+                # Busy locally, not a model failure: keep it out of the breaker.
+                return {"error": str(e), "local": True}
+            except _TRANSPORT_ERRORS as e:
+                result = {"error": str(e), "transport": True}
+            except Exception as e:
+                result = {"error": str(e)}
+            if not self._requeue(result, resp_headers) or (cancel is not None and cancel.cancelled):
+                break
+        return self._settle(model_id, result, started, cancel, task, bool(tools))
+
+    def _raw_stream(self, model_id: str, messages: list,
+                    temperature: float, max_tokens: int,
+                    tools: Optional[list] = None,
+                    on_delta: Optional[Callable[[str], None]] = None,
+                    on_tool_call: Optional[Callable[[dict], None]] = None,
+                    cancel: Optional[CancelToken] = None,
+                    task: Optional[str] = None) -> dict:
+        """Streaming (SSE) variant of _raw.
+
+        Content deltas go to on_delta as they arrive. Each tool call goes to
+        on_tool_call as soon as its arguments are complete, i.e. when the
+        next call starts or the stream ends. The assembled response has the
+        same shape as a non-streaming one, plus "stream_stats" with
+        time-to-first-token. A gap longer than STREAM_STALL_TIMEOUT between
+        chunks aborts the call as stalled.
+        """
+        if not self.api_key:
+            return {"error": "No OPENROUTER_API_KEY configured"}
+
+        data, headers = self._request(model_id, messages, temperature, max_tokens,
+                                      tools, stream=True)
+        headers["Accept"] = "text/event-stream"
+
+        delay = self.rate_limiter.reserve(model_id)
+        if delay is None:
+            return self._throttled(model_id)
+        time.sleep(delay)
+
+        if not self.breaker.allow(model_id):
+            return {"error": f"Circuit open for {model_id}", "circuit_open": True}
+
+        started = time.monotonic()
+        content: List[str] = []
+        calls: Dict[int, dict] = {}
+        emitted: set = set()
+        finish_reason = None
+        usage = None
+        ttft = None
+        chunks = 0
+        last_data = started
 
-        req = urllib.request.Request(
-            f"{BASE_URL}/chat/completions",
-            data=data, headers=headers, method="POST"
-        )
+        def emit_until(index: Optional[int]):
+            if on_tool_call is None:
+                return
+            for i in sorted(calls):
+                if (index is None or i < index) and i not in emitted:
+                    emitted.add(i)
+                    on_tool_call(calls[i])
 
         try:
-            with urllib.request.urlopen(req, timeout=90) as resp:
-                return json.loads(resp.read().decode())
-        except urllib.error.HTTPError as e:
-            body = e.read().decode() if e.fp else ""
-            return {"error": f"HTTP {e.code}: {body[:300]}"}
+            with HTTP_POOL.stream("POST", f"{BASE_URL}/chat/completions",
+                                  body=data, headers=headers, timeout=90,
+                                  read_timeout=STREAM_STALL_TIMEOUT, cancel=cancel) as resp:
+                self.rate_limiter.observe(model_id, resp.status,
+                                          {k.lower(): v for k, v in resp.getheaders()})
+                if resp.status >= 400:
+                    body = resp.read().decode(errors="replace")
+                    result = {"error": f"HTTP {resp.status}: {body[:300]}", "status": resp.status}
+                    return self._settle(model_id, result, started, cancel, task, bool(tools))
+                for raw in iter(resp.readline, b""):
+                    now = time.monotonic()
+                    line = raw.decode(errors="replace").strip()
+                    if not line.startswith("data:"):
+                        # Blank separators and ": keep-alive" comments.
+                        limit = 90 if ttft is None else STREAM_STALL_TIMEOUT
+                        if now - last_data > limit:
+                            raise TimeoutError("only keep-alives")
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        resp.read()
+                        break
+                    chunk = json.loads(payload)
+                    last_data = now
+                    chunks += 1
+                    if "error" in chunk:
+                        resp.read()
+                        return self._settle(model_id, {"error": chunk["error"]},
+                                            started, cancel, task, bool(tools))
+                    usage = chunk.get("usage") or usage
+                    for choice in chunk.get("choices", []):
+                        delta = choice.get("delta") or {}
+                        if delta.get("content"):
+                            ttft = ttft if ttft is not None else now - started
+                            content.append(delta["content"])
+                            if on_delta:
+                                on_delta(delta["content"])
+                        for tc in delta.get("tool_calls") or []:
+                            ttft = ttft if ttft is not None else now - started
+                            index = tc.get("index", len(calls))
+                            if index not in calls:
+                                emit_until(index)
+                                calls[index] = {"id": None, "type": "function",
+                                                "function": {"name": "", "arguments": ""}}
+                            entry = calls[index]
+                            if tc.get("id"):
+                                entry["id"] = tc["id"]
+                            fn = tc.get("function") or {}
+                            entry["function"]["name"] += fn.get("name") or ""
+                            entry["function"]["arguments"] += fn.get("arguments") or ""
+                        if choice.get("finish_reason"):
+                            finish_reason = choice["finish_reason"]
+        except PoolExhausted as e:
+            return {"error": str(e), "local": True}
+        except (TimeoutError, socket.timeout):
+            waited = STREAM_STALL_TIMEOUT if ttft is not None else 90
+            return self._settle(model_id, {"error": f"Stream stalled: no data for {waited}s",
+                                           "transport": True},
+                                started, cancel, task, bool(tools))
+        except _TRANSPORT_ERRORS as e:
+            return self._settle(model_id, {"error": str(e), "transport": True},
+                                started, cancel, task, bool(tools))
         except Exception as e:
-            return {"error": str(e)}
+            return self._settle(model_id, {"error": str(e)}, started, cancel, task, bool(tools))
+
+        emit_until(None)
+        message = {"role": "assistant", "content": "".join(content)}
+        if calls:
+            message["tool_calls"] = [calls[i] for i in sorted(calls)]
+        result = {
+            "choices": [{"message": message, "finish_reason": finish_reason}],
+            "stream_stats": {"ttft": ttft, "chunks": chunks,
+                             "elapsed": time.monotonic() - started},
+        }
+        if usage:
+            result["usage"] = usage
+        if ttft is not None:
+            TTFT.record(model_id, ttft)
+        return self._settle(model_id, result, started, cancel, task, bool(tools))
+
+    def connection_stats(self) -> dict:
+        """Counters for the shared keep-alive pool (reused vs newly opened)."""
+        return HTTP_POOL.stats()
+
+    def rate_limit_stats(self) -> Dict[str, dict]:
+        """Per-model learned rates, 429 counts and time spent queued."""
+        return self.rate_limiter.stats()
+
+    def usage_stats(self) -> dict:
+        """Tokens reported by completed calls, per model and in total."""
+        with self._usage_lock:
+            per_model = {k: dict(v) for k, v in self.usage.items()}
+        total = {k: sum(v[k] for v in per_model.values())
+                 for k in ("calls", "prompt_tokens", "completion_tokens", "total_tokens")}
+        return {"total": total, "models": per_model}
+
+    def cache_stats(self) -> dict:
+        """Response cache hit/miss counters ({} when caching is off)."""
+        return self.cache.stats() if self.cache is not None else {}
 
     def list_models(self, tier: Optional[str] = None) -> list:
         result = []
@@ -356,10 +1829,349 @@ class LLMClient:
         return result
 
 
+# ── Async Client ─────────────────────────────────────────────────────────
+
+class AsyncConnectionPool:
+    """Keep-alive HTTP/1.1 pool on asyncio streams (one per event loop).
+
+    Like ConnectionPool, at most `max_per_host` connections per host are in
+    use at once; further requests wait up to `wait_timeout` for one and then
+    raise PoolExhausted.
+    """
+
+    def __init__(self, max_per_host: int = POOL_MAX_PER_HOST, idle_timeout: float = 60.0,
+                 wait_timeout: float = POOL_WAIT_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self._idle: Dict[tuple, List[tuple]] = {}
+        self._slots: Dict[tuple, asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+        self.opened = 0
+        self.reused = 0
+
+    async def _connect(self, key: tuple, timeout: float) -> Tuple[tuple, bool]:
+        now = time.monotonic()
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer, last_used = idle.pop()
+            if now - last_used <= self.idle_timeout and not reader.at_eof():
+                self.reused += 1
+                return (reader, writer), True
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == "https" else None), timeout)
+        self.opened += 1
+        return (reader, writer), False
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, dict, bytes]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, body
+
+    async def request(self, method: str, url: str, body: bytes = b"",
+                      headers: Optional[dict] = None, timeout: float = 90) -> Tuple[int, dict, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "https"
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head = [f"{method} {path} HTTP/1.1", f"Host: {parts.hostname}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        raw = ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+        slots = self._slots.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        try:
+            await asyncio.wait_for(slots.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise PoolExhausted(f"No free connection to {key[1]} within "
+                                f"{self.wait_timeout:.0f}s") from None
+        try:
+            return await self._send(key, raw, timeout)
+        finally:
+            slots.release()
+
+    async def _send(self, key: tuple, raw: bytes, timeout: float) -> Tuple[int, dict, bytes]:
+        conn, reused = await self._connect(key, timeout)
+        while True:
+            reader, writer = conn
+            try:
+                writer.write(raw)
+                await writer.drain()
+                status, resp_headers, data = await asyncio.wait_for(
+                    self._read_response(reader), timeout)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                # Stale keep-alive connection: retry once on a fresh one.
+                conn, reused = await self._connect(key, timeout)
+            except BaseException:
+                writer.close()
+                raise
+        if resp_headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+        return status, resp_headers, data
+
+    def stats(self) -> dict:
+        return {"opened": self.opened, "reused": self.reused,
+                "idle": sum(len(v) for v in self._idle.values())}
+
+
+class AsyncLLMClient(LLMClient):
+    """asyncio flavour of LLMClient: achat, achat_with_tools, amulti_turn.
+
+    Routing (MODELS / TASK_MODEL_MAP), fallback, circuit breaker, hedging
+    and response cache behave as in LLMClient. At most `max_concurrency`
+    requests are in flight per client; the rest wait on a semaphore.
+    Create and use one instance per event loop.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 32, **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._pool = AsyncConnectionPool()
+
+    async def aget_fallback_chain(self, **kwargs) -> List[dict]:
+        """get_fallback_chain off the event loop: the breaker and routing
+        stats behind it read SQLite."""
+        return await asyncio.to_thread(self.get_fallback_chain, **kwargs)
+
+    async def _araw(self, model_id: str, messages: list,
+                    temperature: float, max_tokens: int,
+                    tools: Optional[list] = None,
+                    task: Optional[str] = None) -> dict:
+        if not self.api_key:
+            return {"error": "No OPENROUTER_API_KEY configured"}
+
+        data, headers = self._request(model_id, messages, temperature, max_tokens, tools)
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            delay = self.rate_limiter.reserve(model_id)
+            if delay is None:
+                return self._throttled(model_id)
+            await asyncio.sleep(delay)
+
+            # Breaker state lives in SQLite; keep its I/O off the event loop.
+            if not await asyncio.to_thread(self.breaker.allow, model_id):
+                return {"error": f"Circuit open for {model_id}", "circuit_open": True}
+
+            async with self._sem:
+                started = time.monotonic()
+                resp_headers = {}
+                try:
+                    status, resp_headers, body = await self._pool.request(
+                        "POST", f"{BASE_URL}/chat/completions",
+                        body=data, headers=headers, timeout=90)
+                    self.rate_limiter.observe(model_id, status, resp_headers)
+                    if status >= 400:
+                        result = {"error": f"HTTP {status}: {body.decode(errors='replace')[:300]}",
+                                  "status": status}
+                    else:
+                        result = json.loads(body.decode())
+                except asyncio.CancelledError:
+                    raise
+                except PoolExhausted as e:
+                    return {"error": str(e), "local": True}
+                except _TRANSPORT_ERRORS as e:
+                    result = {"error": str(e) or type(e).__name__, "transport": True}
+                except Exception as e:
+                    result = {"error": str(e) or type(e).__name__}
+            if not self._requeue(result, resp_headers):
+                break
+        return await asyncio.to_thread(self._settle, model_id, result, started,
+                                       None, task, bool(tools))
+
+    async def _acomplete(self, chain: List[dict], messages: list,
+                         temperature: float, max_tokens: int,
+                         tools: Optional[list] = None,
+                         accept=_no_error,
+                         hedge: Optional[bool] = None,
+                         force_cache: bool = False,
+                         task: Optional[str] = None) -> Tuple[dict, Optional[dict]]:
+        """Async counterpart of _complete (without streaming)."""
+        if not chain:
+            return {"error": "No models available"}, None
+        chain, messages = self.fit_context(chain, messages, tools, max_tokens)
+        use_cache = self.cache is not None and (temperature == 0 or force_cache)
+        if self.cache is not None and not use_cache:
+            self.cache.bypassed += 1
+        if use_cache:
+            for m in chain:
+                key = self.cache.key(m["id"], messages, tools, temperature, max_tokens)
+                hit = await asyncio.to_thread(self.cache.get, key)
+                if hit is not None and accept(hit):
+                    hit["cached"] = True
+                    return hit, m
+            self.cache.misses += 1
+
+        if (self.hedge if hedge is None else hedge):
+            result, model = await self._acomplete_hedged(chain, messages, temperature,
+                                                         max_tokens, tools, accept, task)
+        else:
+            result, model = {"error": "No models available"}, None
+            for m in chain:
+                result = await self._araw(m["id"], messages, temperature, max_tokens,
+                                          tools=tools, task=task)
+                if accept(result):
+                    model = m
+                    break
+
+        if use_cache and model is not None:
+            key = self.cache.key(model["id"], messages, tools, temperature, max_tokens)
+            await asyncio.to_thread(self.cache.put, key, model["id"], result)
+        self._account(model, messages, tools, result)
+        return result, model
+
+    async def _acomplete_hedged(self, chain: List[dict], messages: list,
+                                temperature: float, max_tokens: int,
+                                tools: Optional[list], accept,
+                                task: Optional[str] = None) -> Tuple[dict, Optional[dict]]:
+        """Async counterpart of _complete_hedged; losers are task-cancelled."""
+        running: Dict[asyncio.Task, dict] = {}
+
+        def launch():
+            m = chain[launched[0]]
+            launched[0] += 1
+            fut = asyncio.ensure_future(
+                self._araw(m["id"], messages, temperature, max_tokens, tools=tools, task=task))
+            running[fut] = m
+
+        launched = [0]
+        launch()
+        result = {"error": "No models available"}
+        try:
+            while running:
+                wait = (self._hedge_after(chain[launched[0] - 1])
+                        if launched[0] < len(chain) else None)
+                done, _ = await asyncio.wait(running, timeout=wait,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch()
+                    continue
+                for fut in done:
+                    m = running.pop(fut)
+                    r = fut.result()
+                    if accept(r):
+                        return r, m
+                    result = r
+                if not running and launched[0] < len(chain):
+                    launch()
+            return result, None
+        finally:
+            for fut in running:
+                fut.cancel()
+
+    async def achat(self, message: str,
+                    system: Optional[str] = None,
+                    task: Optional[str] = None,
+                    model: Optional[str] = None,
+                    paid: bool = False,
+                    temperature: float = 0.7,
+                    max_tokens: int = 4096,
+                    hedge: Optional[bool] = None,
+                    force_cache: bool = False) -> str:
+        if paid:
+            self.paid_authorized = True
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": message})
+
+        if model:
+            if model in MODELS:
+                info = MODELS[model]
+                if info["tier"] == "paid" and not self.paid_authorized:
+                    return "ERROR: Paid model not authorized. Only Nikolas can approve paid model usage."
+                result = self._text(await self._araw(info["id"], messages, temperature, max_tokens))
+                if not result.startswith("ERROR:"):
+                    return result
+            # Try as raw model ID
+            return self._text(await self._araw(model, messages, temperature, max_tokens))
+
+        chain = await self.aget_fallback_chain(task=task)
+        result, _ = await self._acomplete(chain, messages, temperature, max_tokens,
+                                          accept=_has_content, hedge=hedge,
+                                          force_cache=force_cache, task=task or "general")
+        return self._text(result)
+
+    async def achat_with_tools(self, message: str, tools: List[Dict],
+                               system: Optional[str] = None,
+                               task: Optional[str] = None,
+                               temperature: float = 0.3,
+                               max_tokens: int = 4096,
+                               hedge: Optional[bool] = None,
+                               force_cache: bool = False) -> dict:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": message})
+        chain = await self.aget_fallback_chain(task=task or "tool_use", needs_tools=True)
+        result, model = await self._acomplete(chain, messages, temperature, max_tokens,
+                                              tools=tools, hedge=hedge, force_cache=force_cache,
+                                              task=task or "tool_use")
+        if model is None:
+            return {"error": "All models in fallback chain failed"}
+        return result
+
+    async def amulti_turn(self, messages: List[Dict],
+                          task: Optional[str] = None,
+                          temperature: float = 0.7,
+                          max_tokens: int = 4096,
+                          hedge: Optional[bool] = None,
+                          force_cache: bool = False) -> str:
+        chain = await self.aget_fallback_chain(task=task)
+        result, model = await self._acomplete(chain, messages, temperature, max_tokens,
+                                              accept=_has_content, hedge=hedge,
+                                              force_cache=force_cache, task=task or "general")
+        if model is None:
+            return "ERROR: All models failed"
+        return self._text(result)
+
+    def connection_stats(self) -> dict:
+        return self._pool.stats()
+
+
 def quick_chat(message: str, task: str = "general", system: str = None) -> str:
     return LLMClient().chat(message, system=system, task=task)
 
 
+def quick_chat_batch(prompts: List[str], task: str = "general", system: str = None) -> List[dict]:
+    return LLMClient().chat_batch(prompts, task=task, system=system)
+
+
 if __name__ == "__main__":
     llm = LLMClient()
 
@@ -376,6 +2188,22 @@ if __name__ == "__main__":
         reason = "🧠" if m["reasoning"] else "  "
         print(f"  {tier} P{m['priority']:<3d} {m['name']:20s} {cost:>8s} {tools}{reason} ctx:{m['context']:>7d}  {m['display']}")
 
+    health = llm.breaker.scoreboard()
+    if health:
+        print("\n=== Model Health ===")
+        for h in health:
+            wait = max(0, h["retry_at"] - time.time()) if h["state"] != "closed" else 0
+            retry = f"retry in {wait:.0f}s" if wait else ""
+            print(f"  {h['state']:9s} {h['model_id']:45s} ok:{h['successes']:<5d} fail:{h['total_failures']:<5d} {retry}")
+
+    routing = ROUTING_STATS.table()
+    if routing:
+        print("\n=== Routing Stats ===")
+        for r in routing:
+            score = f"{r['score']:.3f}" if r["score"] is not None else "  -  "
+            print(f"  {r['task']:12s} {r['model_id']:45s} n:{r['samples']:<5d} ok:{r['success']:.2f} "
+                  f"empty:{r['empty']:.2f} p50:{r['p50_latency'] or 0:.1f}s score:{score}")
+
     if llm.api_key:
         print("\n=== Live Test ===")
         r = llm.chat("What is 2+2? Reply with ONLY the number.", task="simple")
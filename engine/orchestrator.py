@@ -16,20 +16,41 @@ Usage:
     
     # Or step by step
     plan = orch.plan("Prepare a full market analysis for healthcare AI", project="personal")
-    results = orch.execute_plan(plan, project="personal")
+    results = orch.execute_plan(plan, parallel=True, project="personal")
     summary = orch.consolidate("...", results, project="personal")
 """
 
+import copy
+import hashlib
 import json
 import os
 import sys
 import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 sys.path.insert(0, "/home/executive-workspace/engine")
-from llm_client import LLMClient
+sys.path.insert(0, "/home/executive-workspace/knowledge")
+from llm_client import STATE_DB, LLMClient, _connect_state_db
 from agent_executor import AgentExecutor, AGENT_HOMES, enqueue_task, init_queue, list_tasks, process_next_task
+from capability_index import CapabilityIndex
+
+PLAN_WORKERS = 4       # subtasks of one plan running at once
+PER_AGENT_LIMIT = 1    # ...of which at most this many on the same agent
+DEFAULT_ESTIMATE = 10.0  # minutes assumed for a subtask with no estimate or history
+UPSTREAM_RESULT_CHARS = 4000  # chars of each dependency's result handed to a dependent
+SUMMARY_WORKERS = 2      # results summarized at once while the plan runs
+DIGEST_DIRECT_CHARS = 1500   # results up to this size go to the reduce step as they are
+DIGEST_CHUNK_CHARS = 12000   # longer ones are summarized in chunks of about this size
+REDUCE_BATCH_CHARS = 8000    # digests merged per reduce call
+PLAN_COLLECTION = "plans"        # knowledge base collection holding cached plans
+PLAN_REUSE_SIMILARITY = 0.95     # cached plans this similar are reused as they are
+PLAN_ADAPT_SIMILARITY = 0.85     # ...and this similar are adapted by a cheap call
+PLAN_SHORTLIST = 8               # best-matching agents offered to the planner, besides executives
 
 # ── Agent Capability Map ─────────────────────────────────────────────────
 
@@ -39,6 +60,7 @@ AGENT_CAPABILITIES = {
     "warren": ["finance", "budgeting", "accounting", "resource_management", "administration", "cost_analysis"],
     "steve":  ["marketing", "branding", "content", "social_media", "seo", "analytics", "growth"],
     "tony":   ["legal", "compliance", "contracts", "ip", "governance", "risk", "regulatory"],
+    "jordan": ["sales", "revenue", "go_to_market", "client_relations", "partnerships"],
     
     # Tesla's team
     "backend":           ["api", "server", "database", "python", "backend_dev"],
@@ -67,6 +89,22 @@ AGENT_CAPABILITIES = {
     "intellectual-property": ["patents", "trademarks", "copyright", "ip_strategy"],
     "litigation-support":    ["litigation", "disputes", "evidence", "legal_research"],
     "corporate-governance":  ["governance", "board", "bylaws", "corporate_structure"],
+    
+    # Jordan's team
+    "sales-director":       ["sales_pipeline", "deal_strategy", "quota_tracking", "sales_forecasting"],
+    "account-executive":    ["client_meetings", "proposals", "presentations", "deal_closing"],
+    "business-development": ["prospecting", "outreach", "lead_qualification", "market_mapping"],
+    "client-success":       ["onboarding", "retention", "upselling", "renewals"],
+    "sales-operations":     ["crm", "sales_analytics", "sales_reporting", "process_optimization"],
+}
+
+# task_type of a directly routed subtask, by the routed agent's team
+TEAM_TASK_TYPES = {
+    "tesla": "coding",
+    "warren": "financial",
+    "steve": "marketing",
+    "tony": "legal_analysis",
+    "jordan": "analysis",
 }
 
 PLANNING_PROMPT = """You are Jarvis, the Chief Operating Officer of a multi-agent AI organization.
@@ -112,19 +150,471 @@ Provide:
 3. Action items
 4. Any issues or blockers"""
 
+DIGEST_PROMPT = """You are Jarvis, condensing one subtask's result for the executive summary of a directive.
+
+Directive: {directive}
+
+Rewrite the result below as a compact digest (at most ~200 words). Keep every finding, figure,
+name, decision, deliverable path, action item and blocker; drop process narration and repetition."""
+
+MERGE_PROMPT = """You are Jarvis, merging digests of subtask results for the executive summary of a directive.
+
+Directive: {directive}
+
+Merge the digests below into one digest (at most ~400 words). Keep which task and agent each
+point came from, every figure, action item and blocker; merge duplicates."""
+
+ADAPT_PROMPT = """You are Jarvis. A plan made for an earlier directive is being reused for a similar new one.
+
+Adapt the plan to the new directive: update titles and descriptions (dates, names, scope,
+figures) so they fit it. Keep the ids, agents, dependencies and priorities unless the new
+directive clearly needs a change. Only use agents that already appear in the plan.
+
+Respond with the adapted plan in the same EXACT JSON format, and nothing else."""
+
+
+def plan_dependencies(subtasks: List[dict]) -> Dict[str, Set[str]]:
+    """Dependencies of each subtask, by str(id); raises ValueError on a cycle.
+    
+    Dependencies on ids that are not in the plan are dropped with a warning,
+    so a typo in the plan does not block its dependents forever. A single id
+    given instead of a list is accepted.
+    """
+    ids = [str(t["id"]) for t in subtasks]
+    duplicates = sorted(i for i, n in Counter(ids).items() if n > 1)
+    if duplicates:
+        raise ValueError(f"Plan has duplicate subtask ids: {', '.join(duplicates)}")
+    known, deps = set(ids), {}
+    for tid, t in zip(ids, subtasks):
+        deps[tid] = set()
+        depends_on = t.get("depends_on") or []
+        if isinstance(depends_on, (str, int, float)):
+            depends_on = [depends_on]   # planners sometimes write "depends_on": 1
+        elif not isinstance(depends_on, (list, tuple)):
+            raise ValueError(f"Subtask {tid} has a malformed depends_on: {depends_on!r}")
+        for d in depends_on:
+            if str(d) in known:
+                deps[tid].add(str(d))
+            else:
+                print(f"  [{tid}] ignoring dependency on unknown subtask {d}")
+    # Kahn's algorithm: whatever cannot be peeled off is on (or behind) a cycle.
+    pending = {tid: set(d) for tid, d in deps.items()}
+    while True:
+        free = [tid for tid, d in pending.items() if not d]
+        if not free:
+            break
+        for tid in free:
+            del pending[tid]
+        for d in pending.values():
+            d.difference_update(free)
+    if pending:
+        raise ValueError(f"Plan has a dependency cycle among subtasks: {', '.join(sorted(pending))}")
+    return deps
+
+
+def critical_path(deps: Dict[str, Set[str]],
+                  estimates: Dict[str, float]) -> Tuple[Dict[str, float], List[str]]:
+    """(rank, path) for an acyclic plan.
+    
+    rank[id] is the estimated minutes from the start of that subtask to the
+    end of the longest chain of dependents behind it; starting the highest
+    ranks first keeps the longest chains moving when workers are scarce.
+    path is the critical path itself, the chain with the highest rank.
+    """
+    dependents: Dict[str, List[str]] = {tid: [] for tid in deps}
+    for tid, ds in deps.items():
+        for d in ds:
+            dependents[d].append(tid)
+    rank: Dict[str, float] = {}
+
+    def visit(tid: str) -> float:
+        if tid not in rank:
+            rank[tid] = estimates[tid] + max((visit(n) for n in dependents[tid]), default=0.0)
+        return rank[tid]
+
+    for tid in deps:
+        visit(tid)
+    path, step = [], [tid for tid, ds in deps.items() if not ds]
+    while step:
+        tid = max(step, key=rank.get)
+        path.append(tid)
+        step = dependents[tid]
+    return rank, path
+
+
+class DurationStats:
+    """How long subtasks really take, per (agent, task_type), persisted in SQLite.
+    
+    Keeps EWMAs of actual/estimated minutes and of actual minutes. estimate()
+    scales the planner's estimated_minutes by the learned ratio once there
+    are `min_samples` runs, and falls back to the learned duration when the
+    planner gave no estimate.
+    """
+
+    def __init__(self, path: str = STATE_DB, alpha: float = 0.3, min_samples: int = 3):
+        self.path = path
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS subtask_durations (
+                agent TEXT,
+                task_type TEXT,
+                samples INTEGER DEFAULT 0,
+                ratio REAL,
+                minutes REAL,
+                updated REAL,
+                PRIMARY KEY (agent, task_type)
+            )""")
+        return self._conn
+
+    def _row(self, agent: str, task_type: str) -> tuple:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT samples, ratio, minutes FROM subtask_durations WHERE agent=? AND task_type=?",
+                (agent, task_type)).fetchone()
+        return row or (0, None, None)
+
+    def estimate(self, task: dict) -> float:
+        """Expected minutes for a plan subtask."""
+        planned = _minutes(task.get("estimated_minutes"))
+        samples, ratio, minutes = self._row(task.get("assigned_to", ""), task.get("task_type", "general"))
+        if samples < self.min_samples:
+            return planned or DEFAULT_ESTIMATE
+        if planned and ratio:
+            return planned * ratio
+        return minutes or planned or DEFAULT_ESTIMATE
+
+    def record(self, agent: str, task_type: str, planned: Optional[float], actual: float):
+        a = self.alpha
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT samples, ratio, minutes FROM subtask_durations WHERE agent=? AND task_type=?",
+                    (agent, task_type)).fetchone()
+                samples, ratio, minutes = row or (0, None, None)
+                if planned:
+                    r = min(10.0, max(0.1, actual / planned))
+                    ratio = r if ratio is None else (1 - a) * ratio + a * r
+                minutes = actual if minutes is None else (1 - a) * minutes + a * actual
+                db.execute(
+                    "INSERT OR REPLACE INTO subtask_durations (agent, task_type, samples, ratio, minutes, updated) "
+                    "VALUES (?,?,?,?,?,?)", (agent, task_type, samples + 1, ratio, minutes, time.time()))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def table(self) -> List[dict]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT agent, task_type, samples, ratio, minutes FROM subtask_durations "
+                "ORDER BY agent, task_type").fetchall()
+        return [dict(zip(("agent", "task_type", "samples", "ratio", "minutes"), r)) for r in rows]
+
+
+def _minutes(value) -> Optional[float]:
+    """A planner's estimated_minutes as a positive float, or None."""
+    try:
+        minutes = float(value)
+    except (TypeError, ValueError):
+        return None
+    return minutes if minutes > 0 else None
+
+
+def _subtask_text(task: dict, upstream: List[dict]) -> str:
+    """A subtask's instructions, followed by the results of the subtasks it depends on."""
+    text = f"{task['title']}\n\n{task['description']}"
+    if not upstream:
+        return text
+    parts = []
+    for r in upstream:
+        out = str(r.get("result") or "")
+        if len(out) > UPSTREAM_RESULT_CHARS:
+            out = out[:UPSTREAM_RESULT_CHARS] + f"\n... [cut; {len(out)} chars in all]"
+        parts.append(f"### [{r.get('task_id')}] {r.get('title')} "
+                     f"({r.get('agent')}, {r.get('status')})\n{out}")
+    return text + "\n\n## Results of the subtasks this one depends on\n\n" + "\n\n".join(parts)
+
+
+def _chunks(text: str, size: int) -> List[str]:
+    """`text` split into pieces of at most ~size chars, at line breaks where possible."""
+    chunks = []
+    while len(text) > size:
+        cut = text.rfind("\n", size // 2, size)
+        cut = cut + 1 if cut > 0 else size
+        chunks.append(text[:cut])
+        text = text[cut:]
+    return chunks + [text] if text else chunks
+
+
+class Consolidation:
+    """Map-reduce consolidation of one directive's results, fed as they arrive.
+    
+    add() digests a result on a background pool while the rest of the plan
+    runs: short results are kept verbatim, longer ones are summarized in
+    DIGEST_CHUNK_CHARS chunks, so nothing is cut off. finish() merges the
+    digests in batches of REDUCE_BATCH_CHARS, level by level, until they fit
+    one final CONSOLIDATION_PROMPT call. Every call sees a bounded input, and
+    the number of calls grows linearly with the total result size.
+    """
+
+    def __init__(self, llm: LLMClient, directive: str, project: str = None,
+                 workers: int = SUMMARY_WORKERS):
+        self.llm = llm
+        self.directive = directive
+        self.project = project
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest")
+        self.digests: Dict[str, object] = {}   # str(task_id) -> future of [digest, ...]
+        self.calls = 0                          # summarization calls made so far
+        self._lock = threading.Lock()
+
+    def _summarize(self, system: str, text: str, max_tokens: int) -> Optional[str]:
+        with self._lock:
+            self.calls += 1
+        out = self.llm.chat(text, system=system, task="summarization", temperature=0,
+                            max_tokens=max_tokens)
+        return None if out.startswith("ERROR:") else out.strip()
+
+    def _digest(self, r: dict) -> List[str]:
+        header = (f"### Task {r.get('task_id', '?')}: {r.get('title', 'Unknown')} "
+                  f"(Agent: {r.get('agent', '?')})\nStatus: {r.get('status', '?')}\n")
+        text = str(r.get("result") or "N/A")
+        if len(text) <= DIGEST_DIRECT_CHARS:
+            return [header + text]
+        system = DIGEST_PROMPT.format(directive=self.directive)
+        pieces = _chunks(text, DIGEST_CHUNK_CHARS)
+        out = []
+        for n, piece in enumerate(pieces, 1):
+            part = f" (part {n}/{len(pieces)})" if len(pieces) > 1 else ""
+            digest = self._summarize(system, piece, max_tokens=400)
+            out.append(header.replace("\nStatus", part + "\nStatus", 1) + (digest or piece))
+        return out
+
+    def add(self, result: dict):
+        """Start digesting a finished subtask's result."""
+        self.digests[str(result.get("task_id"))] = self.pool.submit(self._digest, result)
+
+    def _reduce(self, digests: List[str]) -> List[str]:
+        """Merge digests batch by batch until they fit in one REDUCE_BATCH_CHARS batch."""
+        system = MERGE_PROMPT.format(directive=self.directive)
+        while sum(len(d) for d in digests) > REDUCE_BATCH_CHARS and len(digests) > 1:
+            batches, batch = [], []
+            for d in digests:
+                if batch and sum(map(len, batch)) + len(d) > REDUCE_BATCH_CHARS:
+                    batches.append(batch)
+                    batch = []
+                batch.append(d)
+            batches.append(batch)
+            if len(batches) == len(digests):
+                # Every digest fills a batch on its own; merge neighbours in pairs.
+                batches = [digests[i:i + 2] for i in range(0, len(digests), 2)]
+            merged = list(self.pool.map(
+                lambda b: b[0] if len(b) == 1 else self._summarize(system, "\n\n".join(b), max_tokens=800),
+                batches))
+            if any(m is None for m in merged):
+                break  # the model is failing; hand what we have to the final step
+            digests = merged
+        return digests
+
+    def finish(self, results: List[dict]) -> str:
+        """Wait for outstanding digests, reduce them, and write the executive summary."""
+        for r in results:
+            if str(r.get("task_id")) not in self.digests:
+                self.add(r)
+        try:
+            digests = [d for r in results for d in self.digests[str(r.get("task_id"))].result()]
+            digests = self._reduce(digests)
+        finally:
+            self.pool.shutdown(wait=False)
+        project_context = ""
+        if self.project and self.project != "default":
+            project_context = f"**Project:** {self.project}\n\n"
+        system = CONSOLIDATION_PROMPT.format(
+            directive=self.directive, results="\n\n".join(digests), project_context=project_context)
+        with self._lock:
+            self.calls += 1
+        return self.llm.chat("Consolidate these results.", system=system, task="summarization")
+
+
+def _parse_plan(response: str) -> Optional[dict]:
+    """A plan from a model response (JSON, possibly fenced), or None."""
+    try:
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0]
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0]
+        plan = json.loads(response.strip())
+    except (json.JSONDecodeError, IndexError):
+        return None
+    if not isinstance(plan, dict) or not isinstance(plan.get("subtasks"), list):
+        return None
+    return plan
+
+
+def capabilities_fingerprint() -> str:
+    """Changes whenever AGENT_CAPABILITIES or the planning prompt does."""
+    blob = json.dumps([AGENT_CAPABILITIES, PLANNING_PROMPT], sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+class PlanCache:
+    """Plans for earlier directives, found again by semantic similarity.
+    
+    Directives are embedded and searched through the knowledge base
+    (knowledge_client), in a PLAN_COLLECTION per project, so plans are only
+    reused within the project they were made for. Each entry records the
+    capabilities_fingerprint it was planned under and is ignored once the
+    agent roster changes. Without ChromaDB the cache stays disabled.
+    """
+
+    def __init__(self, collection: str = PLAN_COLLECTION):
+        self.collection = collection
+        self.enabled = True
+        self._kb = None
+        self._lock = threading.Lock()
+
+    def _knowledge(self):
+        with self._lock:
+            if self._kb is None and self.enabled:
+                try:
+                    from knowledge_client import KnowledgeBase
+                    self._kb = KnowledgeBase()
+                except Exception:
+                    self.enabled = False   # chromadb missing or store unusable
+            return self._kb
+
+    def lookup(self, directive: str, project: str = None) -> Optional[Tuple[float, str, dict]]:
+        """(similarity, earlier directive, plan) of the closest valid entry, or None."""
+        kb = self._knowledge()
+        if kb is None:
+            return None
+        try:
+            hits = kb.query(self.collection, directive, n_results=1, project=project,
+                            where={"capabilities": capabilities_fingerprint()})
+        except Exception:
+            return None
+        # Cosine similarity, derived by the knowledge base from the collection's space.
+        similarity = hits[0].get("similarity") if hits else None
+        if similarity is None:
+            return None
+        try:
+            plan = json.loads(hits[0]["metadata"]["plan"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return similarity, hits[0]["document"], plan
+
+    def store(self, directive: str, plan: dict, project: str = None):
+        kb = self._knowledge()
+        if kb is None:
+            return
+        plan = {k: v for k, v in plan.items() if k not in ("project", "cache")}
+        try:
+            kb.store(self.collection, directive,
+                     {"plan": json.dumps(plan), "capabilities": capabilities_fingerprint(),
+                      "author": "jarvis"}, project=project)
+        except Exception:
+            pass  # the cache is an optimization; planning already succeeded
+
 
 class Orchestrator:
     """Jarvis's task planning and dispatch engine."""
 
     def __init__(self):
-        self.llm = LLMClient()
+        # Re-dispatched directives reuse cached plans and digests: temperature-0
+        # calls only, so sampled answers are never replayed (see ResponseCache).
+        self.llm = LLMClient(cache=True)
+        self.durations = DurationStats()
+        self.plan_cache = PlanCache()
+        self.capability_index = CapabilityIndex(AGENT_CAPABILITIES)
         init_queue()
 
-    def plan(self, directive: str, project: str = None) -> dict:
-        """Break a directive into subtasks with agent assignments."""
+    def _valid_plan(self, plan: Optional[dict]) -> bool:
+        if not plan or not plan["subtasks"]:
+            return False
+        if any(not isinstance(t, dict) or t.get("assigned_to") not in AGENT_CAPABILITIES
+               for t in plan["subtasks"]):
+            return False
+        try:
+            plan_dependencies(plan["subtasks"])
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def _cached_plan(self, directive: str, project: str = None) -> Optional[dict]:
+        """A plan from the plan cache, reused or adapted to `directive`; None on a miss."""
+        hit = self.plan_cache.lookup(directive, project)
+        if hit is None or hit[0] < PLAN_ADAPT_SIMILARITY:
+            return None
+        similarity, earlier, cached = hit
+        info = {"similarity": round(similarity, 3), "directive": earlier}
+        if similarity >= PLAN_REUSE_SIMILARITY:
+            return dict(copy.deepcopy(cached), cache=dict(info, status="reused"))
+        response = self.llm.chat(
+            f"Earlier directive: {earlier}\n\nNew directive: {directive}\n\n"
+            f"Plan:\n{json.dumps(cached, indent=2)}",
+            system=ADAPT_PROMPT, task="extraction", temperature=0)
+        adapted = _parse_plan(response)
+        if not self._valid_plan(adapted):
+            return None
+        self.plan_cache.store(directive, adapted, project)
+        return dict(adapted, cache=dict(info, status="adapted"))
+
+    def _routed_plan(self, directive: str) -> Optional[dict]:
+        """A one-subtask plan for a single-skill directive, made without a model call."""
+        routed = self.capability_index.route(directive)
+        if routed is None:
+            return None
+        agent, score, skills = routed
+        team = AGENT_HOMES.get(agent, {}).get("team")
+        return {
+            "plan_summary": f"Routed directly to {agent} ({', '.join(skills)})",
+            "subtasks": [{
+                "id": 1,
+                "title": directive[:100],
+                "description": directive,
+                "assigned_to": agent,
+                "task_type": TEAM_TASK_TYPES.get(team, "general"),
+                "priority": "MEDIUM",
+                "depends_on": []
+            }],
+            "routing": {"agent": agent, "score": round(score, 3), "skills": skills}
+        }
+
+    def plan(self, directive: str, project: str = None, use_cache: bool = True,
+             route: bool = True) -> dict:
+        """Break a directive into subtasks with agent assignments.
+        
+        With `route`, a directive that needs a single agent's skills goes
+        straight to that agent (see CapabilityIndex.route); such plans carry
+        a "routing" entry. With `use_cache`, a plan made for a similar
+        directive in the same project is reused (or lightly adapted) instead
+        of planning from scratch; see PlanCache. Such plans carry a "cache"
+        entry. Otherwise the planner picks from a shortlist of agents.
+        """
+        plan = self._routed_plan(directive) if route else None
+        if plan is None and use_cache:
+            plan = self._cached_plan(directive, project)
+        if plan is None:
+            plan = self._new_plan(directive, project)
+        if project:
+            plan["project"] = project
+        return plan
+
+    def _new_plan(self, directive: str, project: str = None) -> dict:
+        # Only the best-matching agents, plus the executives as generalists.
+        candidates = set(self.capability_index.shortlist(directive, PLAN_SHORTLIST))
+        candidates.update(a for a in AGENT_CAPABILITIES
+                          if AGENT_HOMES.get(a, {}).get("type") == "executive")
         agents_desc = "\n".join(
-            f"  - {name}: {', '.join(caps)}"
-            for name, caps in sorted(AGENT_CAPABILITIES.items())
+            f"  - {name}: {', '.join(AGENT_CAPABILITIES[name])}"
+            for name in sorted(candidates)
         )
         
         project_context = ""
@@ -132,87 +622,121 @@ class Orchestrator:
             project_context = f"**Project Context:** You are planning within the '{project}' project. All tasks should be scoped to this project.\n\n"
         
         system = PLANNING_PROMPT.format(agents=agents_desc, project_context=project_context)
-        response = self.llm.chat(directive, system=system, task="reasoning", temperature=0.3)
+        # Planned at temperature 0: a re-dispatched directive gets the same plan from
+        # the response cache, and only a deterministic answer is worth replaying.
+        response = self.llm.chat(directive, system=system, task="reasoning", temperature=0)
         
-        # Parse JSON from response
+        plan = _parse_plan(response)
+        if plan is not None:
+            if self._valid_plan(plan):
+                self.plan_cache.store(directive, plan, project)
+            return plan
+        return {
+            "plan_summary": "Direct execution",
+            "subtasks": [{
+                "id": 1,
+                "title": directive[:100],
+                "description": directive,
+                "assigned_to": "tesla",
+                "task_type": "general",
+                "priority": "MEDIUM",
+                "depends_on": [],
+                "estimated_minutes": 10
+            }]
+        }
+
+    def _run_subtask(self, task: dict, proj: str, upstream: Optional[List[dict]] = None) -> dict:
+        agent = task["assigned_to"]
+        proj_tag = f" [{proj}]" if proj and proj != "default" else ""
+        print(f"  [{task['id']}] Dispatching to {agent}{proj_tag}: {task['title']}")
+        started = time.monotonic()
         try:
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0]
-            plan = json.loads(response.strip())
-        except json.JSONDecodeError:
-            plan = {
-                "plan_summary": "Direct execution",
-                "subtasks": [{
-                    "id": 1,
-                    "title": directive[:100],
-                    "description": directive,
-                    "assigned_to": "tesla",
-                    "task_type": "general",
-                    "priority": "MEDIUM",
-                    "depends_on": [],
-                    "estimated_minutes": 10
-                }]
-            }
-        
-        if project:
-            plan["project"] = project
-        return plan
+            executor = AgentExecutor(agent)
+            result = executor.run(
+                task=_subtask_text(task, upstream or []),
+                task_type=task.get("task_type", "general"),
+                project=proj
+            )
+        except Exception as e:
+            # One broken subtask must not take down the rest of the plan.
+            result = {"agent": agent, "status": "error", "result": f"Error: {e}",
+                      "iterations": 0, "model_used": None, "project": proj}
+        result["task_id"] = task["id"]
+        result["title"] = task["title"]
+        planned = _minutes(task.get("estimated_minutes"))
+        result["estimated_minutes"] = planned
+        result["actual_minutes"] = round((time.monotonic() - started) / 60, 2)
+        if result["status"] == "completed":
+            # Failed runs end early or hang on retries; they say little about real durations.
+            try:
+                self.durations.record(agent, task.get("task_type", "general"), planned,
+                                      result["actual_minutes"])
+            except sqlite3.Error:
+                pass
+        print(f"  [{task['id']}] {result['status']} ({result.get('iterations', 0)} iterations, model: {result.get('model_used')})")
+        return result
 
-    def execute_plan(self, plan: dict, parallel: bool = False, project: str = None) -> List[dict]:
-        """Execute all subtasks in a plan. Returns list of results."""
-        results = []
-        completed_ids = set()
-        subtasks = plan.get("subtasks", [])
-        proj = project or plan.get("project", "default")
+    def execute_plan(self, plan: dict, parallel: bool = False, project: str = None,
+                     workers: int = PLAN_WORKERS, per_agent: int = PER_AGENT_LIMIT,
+                     on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
+        """Execute all subtasks in a plan, in dependency order. Returns results in plan order.
         
-        remaining = list(subtasks)
+        A subtask starts as soon as everything it depends_on has finished,
+        and its agent gets those subtasks' results (up to
+        UPSTREAM_RESULT_CHARS each) after its own instructions. With
+        `parallel`, ready subtasks run concurrently on up to `workers`
+        threads, at most `per_agent` of them on the same agent; otherwise
+        one at a time. Ready subtasks on the longest remaining chain start
+        first (see critical_path), by durations from self.durations.
         
-        while remaining:
-            ready = [t for t in remaining if all(d in completed_ids for d in t.get("depends_on", []))]
-            
-            if not ready:
-                ready = remaining
-            
-            for task in ready:
-                agent = task["assigned_to"]
-                proj_tag = f" [{proj}]" if proj and proj != "default" else ""
-                print(f"  [{task['id']}] Dispatching to {agent}{proj_tag}: {task['title']}")
-                
-                executor = AgentExecutor(agent)
-                result = executor.run(
-                    task=f"{task['title']}\n\n{task['description']}",
-                    task_type=task.get("task_type", "general"),
-                    project=proj
-                )
-                result["task_id"] = task["id"]
-                result["title"] = task["title"]
-                results.append(result)
-                completed_ids.add(task["id"])
-                
-                print(f"  [{task['id']}] {result['status']} ({result['iterations']} iterations, model: {result['model_used']})")
-            
-            remaining = [t for t in remaining if t["id"] not in completed_ids]
+        `on_result` is called with each result as soon as it is in.
+        Raises ValueError if the plan's dependencies form a cycle, before
+        anything runs.
+        """
+        subtasks = plan.get("subtasks", [])
+        proj = project or plan.get("project", "default")
+        deps = plan_dependencies(subtasks)
+        workers = max(1, workers) if parallel else 1
+        per_agent = max(1, per_agent) if parallel else 1
+        estimates = {str(t["id"]): self.durations.estimate(t) for t in subtasks}
+        rank, path = critical_path(deps, estimates)
+        if len(subtasks) > 1:
+            print(f"  Critical path: {' → '.join(path)} (~{rank[path[0]]:.0f} min est.)")
         
-        return results
-
-    def consolidate(self, directive: str, results: List[dict], project: str = None) -> str:
-        """Consolidate results into an executive summary."""
-        results_text = "\n\n".join(
-            f"### Task {r.get('task_id', '?')}: {r.get('title', 'Unknown')} (Agent: {r['agent']})\n"
-            f"Status: {r['status']}\n"
-            f"Result: {r.get('result', 'N/A')[:500]}"
-            for r in results
-        )
+        done: Dict[str, dict] = {}
+        waiting = sorted(subtasks, key=lambda t: -rank[str(t["id"])])
+        running = {}              # future -> subtask
+        busy = Counter()          # agent -> subtasks running
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plan") as pool:
+            while waiting or running:
+                for task in list(waiting):
+                    if len(running) >= workers:
+                        break
+                    agent = task["assigned_to"]
+                    if busy[agent] < per_agent and deps[str(task["id"])] <= done.keys():
+                        waiting.remove(task)
+                        busy[agent] += 1
+                        upstream = [done[d] for d in sorted(deps[str(task["id"])])]
+                        running[pool.submit(self._run_subtask, task, proj, upstream)] = task
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    busy[task["assigned_to"]] -= 1
+                    done[str(task["id"])] = future.result()
+                    if on_result:
+                        on_result(done[str(task["id"])])
         
-        project_context = ""
-        if project and project != "default":
-            project_context = f"**Project:** {project}\n\n"
+        return [done[str(t["id"])] for t in subtasks]
+
+    def consolidate(self, directive: str, results: List[dict], project: str = None,
+                    consolidation: Optional[Consolidation] = None) -> str:
+        """Consolidate results into an executive summary.
         
-        system = CONSOLIDATION_PROMPT.format(
-            directive=directive, results=results_text, project_context=project_context)
-        return self.llm.chat("Consolidate these results.", system=system, task="summarization")
+        Pass the Consolidation that execute_plan fed through on_result to reuse
+        the digests it already made; otherwise all results are digested now.
+        """
+        consolidation = consolidation or Consolidation(self.llm, directive, project)
+        return consolidation.finish(results)
 
     def dispatch(self, directive: str, dry_run: bool = False, project: str = None) -> dict:
         """
@@ -229,6 +753,12 @@ class Orchestrator:
         print("\n📋 Planning...")
         plan = self.plan(directive, project=proj)
         print(f"  Plan: {plan.get('plan_summary', 'N/A')}")
+        if plan.get("routing"):
+            print(f"  Routed without planning (score {plan['routing']['score']})")
+        if plan.get("cache"):
+            cache = plan["cache"]
+            print(f"  Plan cache: {cache['status']} (similarity {cache['similarity']}) "
+                  f"from \"{cache['directive']}\"")
         print(f"  Subtasks: {len(plan.get('subtasks', []))}")
         
         for t in plan.get("subtasks", []):
@@ -240,11 +770,19 @@ class Orchestrator:
         
         # Execute
         print("\n🚀 Executing...")
-        results = self.execute_plan(plan, project=proj)
+        # Results are digested as they arrive, while later subtasks still run.
+        consolidation = Consolidation(self.llm, directive, proj)
+        try:
+            results = self.execute_plan(plan, parallel=True, project=proj,
+                                        on_result=consolidation.add)
+        except ValueError as e:
+            print(f"  ❌ {e}")
+            return {"directive": directive, "plan": plan, "results": [], "summary": f"Plan rejected: {e}",
+                    "project": proj, "status": "invalid_plan"}
         
         # Consolidate
         print("\n📊 Consolidating...")
-        summary = self.consolidate(directive, results, project=proj)
+        summary = self.consolidate(directive, results, project=proj, consolidation=consolidation)
         
         total_iters = sum(r.get("iterations", 0) for r in results)
         agents_used = list(set(r["agent"] for r in results))
@@ -256,6 +794,7 @@ class Orchestrator:
             "summary": summary,
             "total_iterations": total_iters,
             "agents_used": agents_used,
+            "summary_calls": consolidation.calls,
             "project": proj
         }
         
@@ -337,6 +876,7 @@ Usage:
   python3 orchestrator.py queue "Your directive here" [--project PROJECT]
   python3 orchestrator.py process <agent> [--project PROJECT]
   python3 orchestrator.py status [--project PROJECT]
+  python3 orchestrator.py durations
 
 Examples:
   python3 orchestrator.py dispatch --project "acme-corp" "Prepare Q2 financial analysis"
@@ -383,5 +923,11 @@ Examples:
                     proj_tag = f" [{t.get('project','default')}]" if not project else ""
                     print(f"  [{t['id']}] {t['assigned_to']:20s} {t['priority']:8s} {t['title']}{proj_tag}")
     
+    elif cmd == "durations":
+        print(f"{'agent':28s} {'task_type':16s} {'runs':>5s} {'actual/est':>10s} {'minutes':>8s}")
+        for row in orch.durations.table():
+            ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+            print(f"{row['agent']:28s} {row['task_type']:16s} {row['samples']:5d} {ratio:>10s} {row['minutes']:8.1f}")
+    
     else:
         print(f"Unknown command: {cmd}")
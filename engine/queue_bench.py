@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Queue Bench — claim latency of task_queue.db as the tasks table grows.
+
+For each size, builds a throwaway queue in the pre-index layout (TEXT
+priorities, no indexes) with that many tasks, mostly finished ones spread
+over every agent like a long-lived deployment's history. It then times:
+
+  legacy   claims ordered by the CASE over priority labels, no indexes
+  migrate  init_queue upgrading the table in place (backfill + indexes)
+  indexed  claim_task on the migrated table
+
+Claim latency is per claim, connection included, as a worker sees it.
+
+Usage:
+    python3 queue_bench.py [--sizes 10000,100000,1000000] [--claims 200]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, "/home/executive-workspace/engine")
+
+import agent_executor
+from agent_executor import AGENT_HOMES, _extract_flag, claim_task, init_queue
+
+PENDING_SHARE = 0.02   # fraction of rows still pending
+PRIORITIES = ["CRITICAL", "HIGH", "MEDIUM", "MEDIUM", "LOW"]
+
+LEGACY_CLAIM = (
+    "UPDATE tasks SET status='active', started=CURRENT_TIMESTAMP WHERE id = "
+    "(SELECT id FROM tasks WHERE assigned_to=? AND status='pending' "
+    "ORDER BY CASE priority WHEN 'CRITICAL' THEN 0 WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 "
+    "ELSE 3 END, created ASC LIMIT 1) AND status='pending' RETURNING id")
+
+
+def build(path: str, rows: int):
+    """A pre-index queue with `rows` tasks."""
+    db = sqlite3.connect(path)
+    db.execute("""CREATE TABLE tasks (
+        id TEXT PRIMARY KEY, created TEXT, assigned_to TEXT, assigned_by TEXT DEFAULT 'jarvis',
+        task_type TEXT DEFAULT 'general', priority TEXT DEFAULT 'MEDIUM',
+        status TEXT DEFAULT 'pending', title TEXT, description TEXT, model TEXT, result TEXT,
+        started TEXT, completed TEXT, project TEXT DEFAULT 'default')""")
+    agents, rng = list(AGENT_HOMES), random.Random(rows)
+    start = time.time() - rows
+
+    def gen():
+        for i in range(rows):
+            pending = rng.random() < PENDING_SHARE
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start + i))
+            yield (f"{i:08x}", created, rng.choice(agents), rng.choice(PRIORITIES),
+                   "pending" if pending else "completed", f"task {i}", "")
+
+    db.executemany("INSERT INTO tasks (id, created, assigned_to, priority, status, title, description) "
+                   "VALUES (?,?,?,?,?,?,?)", gen())
+    db.commit()
+    db.close()
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {p(0.5):7.3f} ms   p95 {p(0.95):7.3f} ms"
+
+
+def bench(rows: int, claims: int):
+    agents = list(AGENT_HOMES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "task_queue.db")
+        build(path, rows)
+
+        legacy = []
+        for i in range(claims):
+            t = time.perf_counter()
+            db = sqlite3.connect(path, timeout=10)
+            db.execute(LEGACY_CLAIM, (agents[i % len(agents)],)).fetchone()
+            db.commit()
+            db.close()
+            legacy.append(time.perf_counter() - t)
+
+        agent_executor.QUEUE_DB = path
+        t = time.perf_counter()
+        init_queue()
+        migrate = time.perf_counter() - t
+
+        indexed = []
+        for i in range(claims):
+            t = time.perf_counter()
+            claim_task(agents[i % len(agents)], "bench")
+            indexed.append(time.perf_counter() - t)
+
+    print(f"{rows:>10,} rows   legacy  {percentiles(legacy)}")
+    print(f"{'':>15}   indexed {percentiles(indexed)}   (migration {migrate:.2f} s)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sizes, args = _extract_flag(args, "--sizes", "10000,100000,1000000")
+    claims, args = _extract_flag(args, "--claims", "200")
+    if args:
+        print(__doc__)
+        sys.exit(1)
+    for n in sizes.split(","):
+        bench(int(n), int(claims))
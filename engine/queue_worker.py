@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Queue Worker — a supervisor daemon that drains task_queue.db continuously.
+
+A pool of long-lived worker processes runs tasks for every agent in
+AGENT_HOMES. The supervisor polls the queue for agents with pending work
+and hands each agent to an idle worker, within two caps:
+
+  --workers N     global: at most N tasks run at once (one per worker)
+  --per-agent N   at most N tasks of the same agent run at once
+
+Workers keep their process-wide state (keep-alive connections, shell
+sessions, caches) between tasks. While a task runs, its worker writes a
+heartbeat to status/<agent>.json every HEARTBEAT_INTERVAL seconds; the
+agent goes back to "idle" when its last task ends. A worker that dies is
+replaced, and its task is requeued once its lease expires.
+
+SIGTERM (or Ctrl-C) drains: no new tasks are started, running tasks are
+allowed to finish for up to --drain-timeout seconds, then workers exit.
+
+Usage:
+    python3 queue_worker.py [--workers 4] [--per-agent 1] [--agents a,b,c]
+                            [--poll 2] [--drain-timeout 600]
+"""
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+sys.path.insert(0, "/home/executive-workspace/engine")
+
+import agent_executor
+from agent_executor import (AGENT_HOMES, _extract_flag, init_queue, process_next_task,
+                            reclaim_expired_leases)
+
+STATUS_DIR = "/home/executive-workspace/status"
+HEARTBEAT_INTERVAL = 30  # seconds between status/<agent>.json refreshes
+
+
+def write_status(agent: str, status: str, details: str = "", **extra):
+    """Write status/<agent>.json atomically, in report_status.sh's format."""
+    record = {
+        "agent": agent,
+        "status": status,
+        "details": details,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **extra,
+    }
+    path = os.path.join(STATUS_DIR, f"{agent}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(STATUS_DIR, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # status is advisory; never fail a task over it
+
+
+def pending_by_agent(agents: Iterable[str]) -> Dict[str, int]:
+    """Pending task counts for the given agents."""
+    wanted = set(agents)
+    db = sqlite3.connect(agent_executor.QUEUE_DB, timeout=10)
+    try:
+        rows = db.execute(
+            "SELECT assigned_to, COUNT(*) FROM tasks WHERE status='pending' GROUP BY assigned_to"
+        ).fetchall()
+    finally:
+        db.close()
+    return {agent: n for agent, n in rows if agent in wanted}
+
+
+# ── Worker process ───────────────────────────────────────────────────────
+
+def _worker_main(worker_id: int, inbox: mp.Queue, outbox: mp.Queue):
+    """Run one agent's next task per message until told to stop (None)."""
+    # The supervisor owns shutdown: finish the current task, then exit on None.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    while True:
+        agent = inbox.get()
+        if agent is None:
+            return
+        current = {"task": None}
+        stop = threading.Event()
+
+        def on_start(task: dict):
+            current["task"] = task
+            write_status(agent, "busy", f"Task {task['id']}: {task['title']}",
+                         task_id=task["id"], worker=os.getpid(), heartbeat=time.time())
+
+        def heartbeat():
+            while not stop.wait(HEARTBEAT_INTERVAL):
+                task = current["task"]
+                if task:
+                    write_status(agent, "busy", f"Task {task['id']}: {task['title']}",
+                                 task_id=task["id"], worker=os.getpid(), heartbeat=time.time())
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        status = "error"
+        try:
+            result = process_next_task(agent, on_start=on_start)
+            status = result["status"] if result else "empty"
+        except Exception as e:
+            status = f"error: {e}"
+        finally:
+            stop.set()
+            beat.join()
+        outbox.put((worker_id, agent, current["task"]["id"] if current["task"] else None, status))
+
+
+# ── Supervisor ───────────────────────────────────────────────────────────
+
+class Supervisor:
+    """Dispatches agents with pending tasks to a pool of worker processes."""
+
+    def __init__(self, workers: int = 4, per_agent: int = 1,
+                 agents: Optional[Iterable[str]] = None, poll: float = 2.0,
+                 drain_timeout: float = 600.0):
+        self.workers = workers
+        self.per_agent = per_agent
+        self.agents = list(agents or AGENT_HOMES)
+        self.poll = poll
+        self.drain_timeout = drain_timeout
+        self.ctx = mp.get_context("spawn")
+        self.outbox = self.ctx.Queue()
+        self.procs: Dict[int, mp.Process] = {}
+        self.inboxes: Dict[int, mp.Queue] = {}
+        self.assigned: Dict[int, Optional[str]] = {}   # worker -> agent it is running
+        self.draining = False
+        self.completed = 0
+
+    def _spawn(self, worker_id: int):
+        inbox = self.ctx.Queue()
+        proc = self.ctx.Process(target=_worker_main, args=(worker_id, inbox, self.outbox),
+                                name=f"queue-worker-{worker_id}", daemon=False)
+        proc.start()
+        self.procs[worker_id], self.inboxes[worker_id] = proc, inbox
+        self.assigned[worker_id] = None
+
+    def _running(self, agent: str) -> int:
+        return sum(1 for a in self.assigned.values() if a == agent)
+
+    def _finish(self, worker_id: int, agent: str):
+        self.assigned[worker_id] = None
+        if not self._running(agent):
+            write_status(agent, "idle", "Waiting for tasks")
+
+    def _collect(self, timeout: float):
+        """Handle finished tasks and dead workers."""
+        try:
+            while True:
+                worker_id, agent, task_id, status = self.outbox.get(timeout=timeout)
+                timeout = 0
+                if task_id:
+                    self.completed += 1
+                    print(f"[worker {worker_id}] {agent} task {task_id}: {status}", flush=True)
+                self._finish(worker_id, agent)
+        except queue.Empty:
+            pass
+        for worker_id, proc in list(self.procs.items()):
+            if not proc.is_alive():
+                agent = self.assigned.get(worker_id)
+                print(f"[worker {worker_id}] exited ({proc.exitcode})"
+                      + (f" while running {agent}" if agent else ""), flush=True)
+                if agent:
+                    self._finish(worker_id, agent)
+                if self.draining:
+                    del self.procs[worker_id]
+                else:
+                    self._spawn(worker_id)
+
+    def _dispatch(self):
+        idle = [w for w, a in self.assigned.items() if a is None and self.procs[w].is_alive()]
+        if not idle:
+            return
+        try:
+            reclaimed = reclaim_expired_leases()
+            if reclaimed:
+                print(f"Requeued {reclaimed} task(s) with expired leases", flush=True)
+            pending = pending_by_agent(self.agents)
+        except sqlite3.Error as e:
+            print(f"queue poll failed: {e}", flush=True)
+            return
+        # Agents with the most backlog first; each gets up to per_agent workers.
+        for agent, count in sorted(pending.items(), key=lambda kv: -kv[1]):
+            slots = min(count, self.per_agent - self._running(agent))
+            while slots > 0 and idle:
+                worker_id = idle.pop()
+                self.assigned[worker_id] = agent
+                self.inboxes[worker_id].put(agent)
+                slots -= 1
+            if not idle:
+                break
+
+    def _drain(self, *_):
+        if not self.draining:
+            print("Draining: no new tasks; waiting for running ones to finish", flush=True)
+        self.draining = True
+
+    def run(self):
+        init_queue()
+        signal.signal(signal.SIGTERM, self._drain)
+        signal.signal(signal.SIGINT, self._drain)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        print(f"Queue worker: {self.workers} workers, {self.per_agent} per agent, "
+              f"{len(self.agents)} agents", flush=True)
+        while not self.draining:
+            self._dispatch()
+            self._collect(self.poll)
+
+        deadline = time.monotonic() + self.drain_timeout
+        while any(self.assigned.values()) and time.monotonic() < deadline:
+            self._collect(1.0)
+        for worker_id, inbox in self.inboxes.items():
+            if worker_id in self.procs:
+                inbox.put(None)
+        for worker_id, proc in list(self.procs.items()):
+            proc.join(timeout=max(0.0, deadline - time.monotonic()) + 5)
+            if proc.is_alive():
+                print(f"[worker {worker_id}] still running after drain timeout; killing",
+                      flush=True)
+                proc.kill()  # workers ignore SIGTERM
+                proc.join(5)
+        for worker_id, agent in self.assigned.items():
+            if agent:
+                write_status(agent, "offline", "Queue worker stopped mid-task")
+        print(f"Queue worker stopped after {self.completed} tasks", flush=True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers, args = _extract_flag(args, "--workers", "4")
+    per_agent, args = _extract_flag(args, "--per-agent", "1")
+    agents, args = _extract_flag(args, "--agents")
+    poll, args = _extract_flag(args, "--poll", "2")
+    drain, args = _extract_flag(args, "--drain-timeout", "600")
+    if args:
+        print(__doc__)
+        sys.exit(1)
+    Supervisor(workers=int(workers), per_agent=int(per_agent),
+               agents=agents.split(",") if agents else None,
+               poll=float(poll), drain_timeout=float(drain)).run()
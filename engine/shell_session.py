@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Shell Sessions — long-lived bash workers for the run_shell tool.
+
+Forking `sudo -u <agent> bash -c` per command pays sudo/PAM and shell
+startup every time and forgets cwd and environment between calls. A
+ShellSession keeps one bash per agent user alive instead and feeds it
+commands over a small framed protocol:
+
+  request:   "<token> <base64 command>\\n" on the shell's stdin
+  response:  command output, then "\\n<token> <exit code>\\n" on stdout
+             and "\\n<token>\\n" on stderr
+
+The token is random per command, so output cannot forge a frame. A command
+that times out or kills its shell (e.g. `exit`) takes the session down;
+the next command starts a fresh one in the agent's home. Sessions idle
+for longer than `idle_timeout` are reaped.
+
+Usage:
+    from shell_session import SHELLS
+    out = SHELLS.run("tesla", "cd /tmp && ls", timeout=30)
+    out.exit_code, out.stdout, out.stderr
+"""
+
+import atexit
+import base64
+import os
+import secrets
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+SHELL_TIMEOUT = 30              # default seconds a command may run
+SHELL_MAX_OUTPUT = 16 * 2**20   # bytes per stream before the command is killed
+
+# Reads one framed command per line, runs it in this shell (so cd/export
+# persist) with stdin detached, then writes the trailers.
+_WORKER = r'''
+while IFS=' ' read -r __tok __b64; do
+  __cmd=$(printf '%s' "$__b64" | base64 -d)
+  eval "$__cmd" </dev/null
+  __rc=$?
+  printf '\n%s %d\n' "$__tok" "$__rc"
+  printf '\n%s\n' "$__tok" >&2
+done
+'''
+
+
+class OutputCapture:
+    """The head and tail of a byte stream plus its total size, in bounded memory.
+
+    The first `head` bytes are kept as they arrive; after that only the last
+    `tail` bytes are, in a sliding window. text() joins the two with a marker
+    saying how much was left out.
+    """
+
+    def __init__(self, head: int = 2000, tail: int = 1000):
+        self.head_limit = head
+        self.tail_limit = tail
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, chunk: bytes):
+        self.total += len(chunk)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self.tail += chunk
+            if len(self.tail) > self.tail_limit:
+                del self.tail[:len(self.tail) - self.tail_limit]
+
+    def unwrite(self, n: int):
+        """Drop the last n bytes written (a protocol trailer)."""
+        self.total -= n
+        cut = min(n, len(self.tail))
+        del self.tail[len(self.tail) - cut:]
+        if n > cut:
+            del self.head[len(self.head) - (n - cut):]
+
+    @property
+    def omitted(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        if self.omitted <= 0:
+            return (self.head + self.tail).decode(errors="replace")
+        return (f"{self.head.decode(errors='replace')}\n... [{self.omitted} bytes omitted, "
+                f"{self.total} total] ...\n{self.tail.decode(errors='replace')}")
+
+
+class ShellResult(NamedTuple):
+    exit_code: Optional[int]  # None if the command timed out or was killed
+    stdout: str               # head + tail of the output (see OutputCapture)
+    stderr: str
+    timed_out: bool = False
+    stdout_bytes: int = 0     # total bytes the command wrote, kept or not
+    stderr_bytes: int = 0
+    killed: bool = False      # the command hit max_output and was killed
+
+
+class ShellSession:
+    """One persistent bash process running as an agent's user."""
+
+    def __init__(self, user: str, home: str):
+        self.user = user
+        self.home = home
+        self.proc: Optional[subprocess.Popen] = None
+        self.last_used = time.monotonic()
+        self.commands = 0
+        self.lock = threading.Lock()
+        self.users = 0   # callers holding or waiting for the session; guarded by the pool lock
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        cwd = self.home if os.path.isdir(self.home) else None
+        self.proc = subprocess.Popen(
+            ["sudo", "-u", self.user, "-H", "bash", "--noprofile", "--norc", "-c", _WORKER],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=cwd, start_new_session=True)
+        self.commands = 0
+
+    def close(self):
+        """Stop the shell and anything it started."""
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            if proc.poll() is not None:
+                break
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                try:
+                    proc.kill()
+                except OSError:
+                    # Not ours to signal (sudo runs as root); closing its
+                    # pipes below ends the worker loop instead.
+                    break
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        for pipe in (proc.stdin, proc.stdout, proc.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def run(self, command: str, cwd: Optional[str] = None,
+            timeout: float = SHELL_TIMEOUT,
+            stdout_limits: tuple = (2000, 1000), stderr_limits: tuple = (300, 200),
+            max_output: int = SHELL_MAX_OUTPUT) -> ShellResult:
+        """Run `command`, starting (or restarting) the shell if needed.
+
+        Caller holds self.lock. A `cwd` changes the session's directory first,
+        as `cd` would in a terminal. Output is streamed into head/tail
+        captures sized by the *_limits (head, tail) pairs, so memory stays
+        bounded however much a command prints; a command writing more than
+        `max_output` bytes to either stream is killed with the session.
+        """
+        if not self.alive():
+            self.close()
+            self.start()
+        if cwd:
+            command = f"cd {_quote(cwd)} && {{\n{command}\n}}"
+        token = "__agentos_" + secrets.token_hex(8)
+        frame = f"{token} {base64.b64encode(command.encode()).decode()}\n".encode()
+        self.last_used = time.monotonic()
+        self.commands += 1
+        try:
+            self.proc.stdin.write(frame)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.close()
+            return ShellResult(None, "", "shell session died before the command ran")
+
+        out, err = OutputCapture(*stdout_limits), OutputCapture(*stderr_limits)
+        # Trailers are matched in a small window over the end of each stream,
+        # since the captures themselves may have dropped the bytes around them.
+        ends = {"out": f"\n{token} ".encode(), "err": f"\n{token}\n".encode()}
+        captures = {"out": out, "err": err}
+        windows = {"out": b"", "err": b""}
+        keep = len(ends["out"]) + 16
+        exit_code = None
+
+        def result(code=None, **flags) -> ShellResult:
+            return ShellResult(code, out.text(), err.text(), stdout_bytes=out.total,
+                               stderr_bytes=err.total, **flags)
+
+        sel = selectors.DefaultSelector()
+        sel.register(self.proc.stdout, selectors.EVENT_READ, "out")
+        sel.register(self.proc.stderr, selectors.EVENT_READ, "err")
+        deadline = time.monotonic() + timeout
+        try:
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    return result(timed_out=True)
+                for key, _ in sel.select(remaining):
+                    stream = key.data
+                    chunk = os.read(key.fileobj.fileno(), 65536)
+                    if not chunk:
+                        # The command ended the shell (exit, exec, crash).
+                        try:
+                            exit_code = self.proc.wait(timeout=1)
+                        except subprocess.TimeoutExpired:
+                            pass
+                        self.close()
+                        return result(exit_code)
+                    captures[stream].write(chunk)
+                    window = windows[stream] = (windows[stream] + chunk)[-keep:]
+                    i = window.find(ends[stream])
+                    if i < 0 or (stream == "out" and not window.endswith(b"\n")):
+                        if captures[stream].total > max_output:
+                            self.close()
+                            return result(killed=True)
+                        continue
+                    if stream == "out":
+                        exit_code = int(window[i + len(ends["out"]):].split(b"\n", 1)[0])
+                    captures[stream].unwrite(len(window) - i)
+                    sel.unregister(key.fileobj)
+        finally:
+            sel.close()
+        self.last_used = time.monotonic()
+        return result(exit_code)
+
+
+def _quote(s: str) -> str:
+    return "'" + s.replace("'", "'\\''") + "'"
+
+
+class ShellPool:
+    """Per-agent ShellSessions shared by every executor in a process.
+
+    Calls for the same agent are serialized on its session; different
+    agents run in parallel. Sessions idle longer than `idle_timeout`
+    seconds, with no caller using or waiting for them, are closed
+    whenever the pool is used.
+    """
+
+    def __init__(self, idle_timeout: float = 600.0):
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, ShellSession] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.reused = 0
+        self.reaped = 0
+
+    def reap(self):
+        """Close sessions that have been idle longer than idle_timeout."""
+        now = time.monotonic()
+        with self._lock:
+            idle = [name for name, s in self._sessions.items()
+                    if now - s.last_used > self.idle_timeout and not s.users]
+            stale = [self._sessions.pop(name) for name in idle]
+        for s in stale:
+            with s.lock:
+                s.close()
+            self.reaped += 1
+
+    def run(self, user: str, command: str, cwd: Optional[str] = None,
+            timeout: float = SHELL_TIMEOUT, home: Optional[str] = None,
+            **capture) -> ShellResult:
+        """Run `command` in `user`'s session; `capture` goes to ShellSession.run."""
+        self.reap()
+        with self._lock:
+            session = self._sessions.get(user)
+            if session is None:
+                session = self._sessions[user] = ShellSession(user, home or f"/home/{user}")
+            # Counted before its lock is taken, so reap never pops a session
+            # a caller is about to use (it would restart outside the pool).
+            session.users += 1
+        try:
+            with session.lock:
+                if session.alive():
+                    self.reused += 1
+                else:
+                    self.started += 1
+                return session.run(command, cwd=cwd, timeout=timeout, **capture)
+        finally:
+            with self._lock:
+                session.users -= 1
+
+    def stats(self) -> dict:
+        """Sessions started vs reused, plus the ones currently open."""
+        with self._lock:
+            return {"started": self.started, "reused": self.reused, "reaped": self.reaped,
+                    "open": sum(1 for s in self._sessions.values() if s.alive())}
+
+    def close_all(self):
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for s in sessions:
+            s.close()
+
+
+SHELLS = ShellPool()
+atexit.register(SHELLS.close_all)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Tool Cache — shared results for read_file, fetch_url and api_call.
+
+Agents across a team keep reading the same files and fetching the same URLs
+(every financial task hits frankfurter.app). ToolCache keeps those results
+in SQLite, shared by every agent and process on the host:
+
+  - read_file results are keyed by agent, path and read range and stay
+    valid while the file's mtime and size are unchanged. Files that look
+    like secrets (keys.env, .agent_env, private keys...) are never stored.
+  - GET responses are fresh for the API's `cache_ttl` from
+    apis/registry.json (per host), or else the response's Cache-Control
+    max-age. Once stale they are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 reuses the stored body. `no-store`
+    responses are never kept.
+
+Every lookup reports "hit", "revalidated" or "miss"; AgentExecutor records
+it on the tool call's log entry and totals hit rates per run. The database
+is created readable by its owner only (0600).
+
+Usage:
+    from tool_cache import TOOL_CACHE
+    text, status = TOOL_CACHE.get_url("https://api.frankfurter.app/latest")
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import re
+import stat
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Callable, Dict, Optional, Tuple
+
+from llm_client import _connect_state_db
+
+TOOL_CACHE_DB = "/home/executive-workspace/engine/tool_cache.db"
+REGISTRY_PATH = "/home/executive-workspace/apis/registry.json"
+MAX_BODY = 2 * 2**20   # larger responses are passed through uncached
+
+# File names whose contents are credentials; read_file never caches these.
+_SECRET_NAME = re.compile(
+    r"(^|[._-])(env|agent_env|keys?|secrets?|credentials?|passw(or)?d|tokens?|netrc|pgpass)"
+    r"($|[._-])|^id_(rsa|dsa|ecdsa|ed25519)|\.(pem|p12|pfx|keystore|kdbx)$", re.I)
+
+
+def _secret(path: str) -> bool:
+    """Whether `path` (or the file it links to) looks like it holds credentials."""
+    return any(_SECRET_NAME.search(os.path.basename(p))
+               for p in (path, os.path.realpath(path)))
+
+
+def _key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def load_host_ttls(path: str = REGISTRY_PATH) -> Dict[str, float]:
+    """cache_ttl per host from the API registry ({} if unreadable)."""
+    ttls = {}
+    try:
+        with open(path) as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return ttls
+    for category in registry.get("categories", {}).values():
+        for api in category.get("apis", {}).values():
+            host = urllib.parse.urlsplit(api.get("url", "")).hostname
+            if host and api.get("cache_ttl") is not None:
+                ttls[host] = max(ttls.get(host, 0), float(api["cache_ttl"]))
+    return ttls
+
+
+def _max_age(headers) -> Tuple[Optional[float], bool]:
+    """(freshness lifetime from the response headers, whether it may be stored)."""
+    directives = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+    if "no-store" in directives or "private" in directives:
+        return None, False
+    if "no-cache" in directives:
+        return 0.0, True
+    if directives.get("max-age", "").isdigit():
+        return float(directives["max-age"]), True
+    if headers.get("Expires"):
+        try:
+            return email.utils.parsedate_to_datetime(headers["Expires"]).timestamp() - time.time(), True
+        except (TypeError, ValueError):
+            return 0.0, True
+    return None, True
+
+
+class ToolCache:
+    """SQLite-backed cache of tool results, shared across agents and processes."""
+
+    def __init__(self, path: str = TOOL_CACHE_DB, max_bytes: int = 128 * 2**20,
+                 registry: str = REGISTRY_PATH):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.registry = registry
+        self._ttls: Optional[Dict[str, float]] = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def _db(self):
+        if self._conn is None:
+            # Cached file contents are private: owner-only from the start.
+            try:
+                os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+                os.chmod(self.path, 0o600)
+            except OSError:
+                pass
+            self._conn = _connect_state_db(self.path)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS tool_cache (
+                key TEXT PRIMARY KEY,
+                tool TEXT,
+                validator TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                expires REAL,
+                stored REAL,
+                size INTEGER,
+                value TEXT
+            )""")
+        return self._conn
+
+    def host_ttl(self, url: str) -> Optional[float]:
+        if self._ttls is None:
+            self._ttls = load_host_ttls(self.registry)
+        return self._ttls.get(urllib.parse.urlsplit(url).hostname or "")
+
+    def _count(self, tool: str, status: str) -> str:
+        with self._lock:
+            counts = self.counts.setdefault(tool, {"hit": 0, "revalidated": 0, "miss": 0})
+            counts[status] += 1
+        return status
+
+    def _get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db().execute(
+                "SELECT validator, etag, last_modified, expires, value FROM tool_cache WHERE key=?",
+                (key,)).fetchone()
+
+    def _put(self, key: str, tool: str, value: str, validator: str = None,
+             etag: str = None, last_modified: str = None, expires: float = 0.0):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, tool, validator, etag, last_modified, "
+                "expires, stored, size, value) VALUES (?,?,?,?,?,?,?,?,?)",
+                (key, tool, validator, etag, last_modified, expires, time.time(), len(value), value))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM tool_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Drop the oldest entries, down to 3/4 of the budget.
+                excess, freed = total - self.max_bytes * 3 // 4, 0
+                for k, size in db.execute("SELECT key, size FROM tool_cache ORDER BY stored").fetchall():
+                    if freed >= excess:
+                        break
+                    db.execute("DELETE FROM tool_cache WHERE key=?", (k,))
+                    freed += size
+
+    def read_file(self, path: str, args: dict, read: Callable[[], str],
+                  agent: str = "") -> Tuple[str, str]:
+        """`read()` for this path and range, unless `agent` read the same,
+        unchanged file before."""
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0 or _secret(path):
+            # procfs files, pipes and devices change without touching mtime or
+            # size; secrets are not copied into the cache at all.
+            return read(), self._count("read_file", "miss")
+        validator = f"{st.st_mtime_ns}:{st.st_size}"
+        key = _key("read_file", agent, os.path.realpath(path),
+                   {k: v for k, v in args.items() if k != "path"})
+        row = self._get(key)
+        if row and row[0] == validator:
+            return row[4], self._count("read_file", "hit")
+        value = read()
+        self._put(key, "read_file", value, validator=validator)
+        return value, self._count("read_file", "miss")
+
+    def get_url(self, url: str, headers: Optional[dict] = None, timeout: float = 15,
+                tool: str = "fetch_url") -> Tuple[str, str]:
+        """GET `url` through the cache; returns (body text, cache status)."""
+        key = _key("GET", url)
+        row = self._get(key)
+        now = time.time()
+        if row and row[3] > now:
+            return row[4], self._count(tool, "hit")
+        headers = dict(headers or {})
+        if row and row[1]:
+            headers["If-None-Match"] = row[1]
+        if row and row[2]:
+            headers["If-Modified-Since"] = row[2]
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read(MAX_BODY + 1)
+                resp_headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not row:
+                raise
+            lifetime, _ = _max_age(e.headers)
+            ttl = self.host_ttl(url)
+            self._put(key, tool, row[4], etag=row[1], last_modified=row[2],
+                      expires=now + (ttl if ttl is not None else lifetime or 0))
+            return row[4], self._count(tool, "revalidated")
+        body = raw[:MAX_BODY].decode(errors="replace")
+        lifetime, storable = _max_age(resp_headers)
+        ttl = self.host_ttl(url)
+        if ttl is not None and storable:
+            lifetime = ttl
+        etag, last_modified = resp_headers.get("ETag"), resp_headers.get("Last-Modified")
+        if storable and len(raw) <= MAX_BODY and (lifetime or etag or last_modified):
+            self._put(key, tool, body, etag=etag, last_modified=last_modified,
+                      expires=now + (lifetime or 0))
+        return body, self._count(tool, "miss")
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-tool hit/revalidated/miss counts and hit rate for this process."""
+        with self._lock:
+            out = {}
+            for tool, c in self.counts.items():
+                total = sum(c.values())
+                out[tool] = dict(c, hit_rate=round((c["hit"] + c["revalidated"]) / total, 3) if total else 0.0)
+            return out
+
+
+TOOL_CACHE = ToolCache()
@@ -33,6 +33,7 @@ from pathlib import Path
 CHROMADB_PATH = "/home/executive-workspace/knowledge/chromadb_store"
 PROJECT_SEP = "__"
 DEFAULT_PROJECT = "default"
+DISTANCE_SPACE = "cosine"   # hnsw:space of new collections; results carry a similarity from it
 
 # Pre-defined collections for organizational structure
 DEFAULT_COLLECTIONS = [
@@ -64,10 +65,32 @@ class KnowledgeBase:
             return project, collection
         return DEFAULT_PROJECT, internal_name
 
+    def _collection(self, internal_name: str):
+        """Get a collection by internal name, creating it in DISTANCE_SPACE if missing.
+
+        Existing collections keep the space they were created with.
+        """
+        try:
+            return self._client.get_collection(name=internal_name)
+        except Exception:
+            return self._client.get_or_create_collection(
+                name=internal_name, metadata={"hnsw:space": DISTANCE_SPACE})
+
+    @staticmethod
+    def _similarity(col, distance: float | None) -> float | None:
+        """Cosine similarity for a distance in the collection's hnsw:space."""
+        if distance is None:
+            return None
+        space = (col.metadata or {}).get("hnsw:space", "l2")
+        if space == "l2":
+            # Squared L2 between unit-length embeddings (Chroma's default).
+            return 1 - distance / 2
+        return 1 - distance   # cosine distance; for ip, 1 - dot product
+
     def _ensure_collections(self):
         """Create default collections if they don't exist."""
         for name in DEFAULT_COLLECTIONS:
-            self._client.get_or_create_collection(name=self._col_name(name))
+            self._collection(self._col_name(name))
 
     def store(self, collection: str, text: str, metadata: dict | None = None,
               project: str | None = None) -> str:
@@ -83,7 +106,7 @@ class KnowledgeBase:
         Returns:
             The generated document ID
         """
-        col = self._client.get_or_create_collection(name=self._col_name(collection, project))
+        col = self._collection(self._col_name(collection, project))
         doc_id = hashlib.sha256(f"{text}{time.time()}".encode()).hexdigest()[:16]
         meta = metadata or {}
         meta.setdefault("stored_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
@@ -92,7 +115,7 @@ class KnowledgeBase:
         return doc_id
 
     def query(self, collection: str, query_text: str, n_results: int = 5,
-              project: str | None = None) -> list[dict]:
+              project: str | None = None, where: dict | None = None) -> list[dict]:
         """
         Semantic search across a collection.
 
@@ -101,22 +124,26 @@ class KnowledgeBase:
             query_text: Natural language query
             n_results: Max results to return (default 5)
             project: Project namespace (default: 'default')
+            where: Optional ChromaDB metadata filter (e.g. {"author": "jarvis"})
 
         Returns:
-            List of dicts with keys: id, document, metadata, distance
+            List of dicts with keys: id, document, metadata, distance, similarity
+            (cosine similarity, whatever the collection's distance space)
         """
-        col = self._client.get_or_create_collection(name=self._col_name(collection, project))
+        col = self._collection(self._col_name(collection, project))
         if col.count() == 0:
             return []
         n = min(n_results, col.count())
-        results = col.query(query_texts=[query_text], n_results=n)
+        results = col.query(query_texts=[query_text], n_results=n, where=where or None)
         out = []
         for i in range(len(results["ids"][0])):
+            distance = results["distances"][0][i] if results.get("distances") else None
             out.append({
                 "id": results["ids"][0][i],
                 "document": results["documents"][0][i],
                 "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i] if results.get("distances") else None,
+                "distance": distance,
+                "similarity": self._similarity(col, distance),
             })
         return out
 
@@ -135,13 +162,11 @@ class KnowledgeBase:
 
     def count(self, collection: str, project: str | None = None) -> int:
         """Count documents in a collection."""
-        return self._client.get_or_create_collection(
-            name=self._col_name(collection, project)).count()
+        return self._collection(self._col_name(collection, project)).count()
 
     def delete(self, collection: str, doc_id: str, project: str | None = None):
         """Delete a document by ID."""
-        self._client.get_or_create_collection(
-            name=self._col_name(collection, project)).delete(ids=[doc_id])
+        self._collection(self._col_name(collection, project)).delete(ids=[doc_id])
 
     def list_projects(self) -> list[str]:
         """Extract unique project prefixes from all collections."""
@@ -161,21 +186,25 @@ class KnowledgeBase:
         for col_name in all_cols:
             if col_name.endswith(suffix) or col_name == collection:
                 project, _ = self._parse_col_name(col_name)
-                col = self._client.get_or_create_collection(name=col_name)
+                col = self._collection(col_name)
                 if col.count() == 0:
                     continue
                 n = min(n_results, col.count())
                 res = col.query(query_texts=[query_text], n_results=n)
                 for i in range(len(res["ids"][0])):
+                    distance = res["distances"][0][i] if res.get("distances") else None
                     entry = {
                         "id": res["ids"][0][i],
                         "document": res["documents"][0][i],
                         "metadata": res["metadatas"][0][i],
-                        "distance": res["distances"][0][i] if res.get("distances") else None,
+                        "distance": distance,
+                        "similarity": self._similarity(col, distance),
                         "project": project,
                     }
                     results.append(entry)
-        results.sort(key=lambda r: r.get("distance") or 999)
+        # Collections may differ in distance space; similarity compares across them.
+        results.sort(key=lambda r: r["similarity"] if r["similarity"] is not None else -1,
+                     reverse=True)
         return results[:n_results]
 
 
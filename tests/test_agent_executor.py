@@ -0,0 +1,107 @@
+import sqlite3
+import time
+
+import agent_executor
+from agent_executor import AgentExecutor
+
+
+def _turn(content="", tool_calls=None):
+    msg = {"role": "assistant", "content": content}
+    if tool_calls:
+        msg["tool_calls"] = tool_calls
+    return {"choices": [{"message": msg}]}
+
+
+def test_tool_calls_without_id_are_answered_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(agent_executor, "QUEUE_DB", str(tmp_path / "queue.db"))
+    agent_executor.init_queue()
+    executor = AgentExecutor("tesla", compaction=None)
+    responses = [
+        _turn(tool_calls=[
+            {"type": "function", "function": {"name": "read_file", "arguments": '{"path": "/a"}'}},
+            {"type": "function", "function": {"name": "write_file",
+                                              "arguments": '{"path": "/b", "content": "x"}'}},
+        ]),
+        _turn("done"),
+    ]
+    seen = []
+
+    def fake_complete(chain, messages, **kwargs):
+        seen.append([dict(m) for m in messages])
+        return responses[len(seen) - 1], {"id": "m", "name": "M"}
+
+    executed = []
+    monkeypatch.setattr(executor.llm, "_complete", fake_complete)
+    monkeypatch.setattr(executor, "_execute_tool",
+                        lambda name, args, entry=None: executed.append(name) or f"{name} ok")
+
+    result = executor.run("task", checkpoint_id="t1")
+
+    assert result["status"] == "completed"
+    assert sorted(executed) == ["read_file", "write_file"]
+    assert len(seen) == 2
+    calls = seen[1][-3]["tool_calls"]
+    answers = {m["tool_call_id"]: m["content"] for m in seen[1][-2:]}
+    assert set(answers) == {tc["id"] for tc in calls}
+    assert not any(a.startswith("Interrupted") for a in answers.values())
+
+
+def test_run_shell_timeout_keeps_the_captured_output(monkeypatch):
+    from shell_session import ShellResult
+
+    def fake_run(user, command, **kwargs):
+        return ShellResult(None, "started\n... [4000 bytes omitted, 7000 total] ...\nstep 9",
+                           "warn", timed_out=True, stdout_bytes=7000, stderr_bytes=4)
+
+    monkeypatch.setattr(agent_executor.SHELLS, "run", fake_run)
+    out = AgentExecutor("tesla")._execute_tool("run_shell", {"command": "make"})
+
+    assert out.startswith("started") and "step 9" in out and "STDERR: warn" in out
+    assert "TIMED OUT" in out and "stdout 7000" in out
+
+
+def test_resume_only_takes_over_an_expired_lease(monkeypatch, tmp_path):
+    monkeypatch.setattr(agent_executor, "QUEUE_DB", str(tmp_path / "queue.db"))
+    agent_executor.init_queue()
+    task_id = agent_executor.enqueue_task("t", "d", "tesla")
+    assert agent_executor.claim_task("tesla", "worker-1")["id"] == task_id
+    resumed = []
+    monkeypatch.setattr(agent_executor, "process_next_task",
+                        lambda agent, task_id=None: resumed.append(task_id) or {"status": "completed"})
+
+    assert agent_executor.resume_task(task_id) is None
+    assert agent_executor.list_tasks(status="active")[0]["lease_owner"] == "worker-1"
+
+    db = sqlite3.connect(agent_executor.QUEUE_DB)
+    db.execute("UPDATE tasks SET lease_expires=? WHERE id=?", (time.time() - 1, task_id))
+    db.commit()
+    db.close()
+    assert agent_executor.resume_task(task_id) == {"status": "completed"}
+    assert resumed == [task_id]
+
+
+def test_init_queue_migrates_the_deploy_sh_schema(monkeypatch, tmp_path):
+    path = str(tmp_path / "queue.db")
+    monkeypatch.setattr(agent_executor, "QUEUE_DB", path)
+    db = sqlite3.connect(path)
+    db.execute("""CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT,
+        assigned_to TEXT, created_by TEXT, priority INTEGER DEFAULT 5,
+        status TEXT DEFAULT 'pending', created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME, completed_at DATETIME)""")
+    db.execute("INSERT INTO tasks (title, assigned_to, created_by, created_at) "
+               "VALUES ('old', 'tesla', 'tony', '2024-01-01 00:00:00')")
+    db.execute("INSERT INTO tasks (title, assigned_to, priority) VALUES ('urgent', 'tesla', 1)")
+    db.commit()
+    db.close()
+
+    agent_executor.init_queue()
+    agent_executor.init_queue()   # idempotent
+
+    new_id = agent_executor.enqueue_task("new", "d", "tesla")
+    claimed = [agent_executor.claim_task("tesla", "w")["title"] for _ in range(3)]
+    assert claimed == ["urgent", "old", "new"]
+    old = [t for t in agent_executor.list_tasks() if t["title"] == "old"][0]
+    assert old["id"] == "1" and old["created"] == "2024-01-01 00:00:00"
+    assert old["assigned_by"] == "tony" and old["priority"] == "MEDIUM"
+    assert new_id not in ("1", "2")
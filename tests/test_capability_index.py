@@ -0,0 +1,35 @@
+import pytest
+
+import capability_index
+from capability_index import CapabilityIndex
+from orchestrator import AGENT_CAPABILITIES
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CapabilityIndex(AGENT_CAPABILITIES, prompts=False)
+
+
+def test_single_skill_directives_are_routed(index):
+    assert index.route("Design the database schema")[0] == "backend"
+
+
+@pytest.mark.parametrize("directive", [
+    "Delete the production database",
+    "Do not touch the database",
+    "Don't touch the database",
+])
+def test_negated_or_destructive_directives_go_to_the_planner(index, directive):
+    assert index.route(directive) is None
+
+
+def test_routing_needs_a_margin_over_the_runner_up(index, monkeypatch):
+    monkeypatch.setattr(capability_index, "ROUTE_MARGIN", 1.0)
+    assert index.route("Design the database schema") is None
+
+
+def test_shortlist_puts_capability_matches_before_prompt_words():
+    index = CapabilityIndex(AGENT_CAPABILITIES)
+    shortlist = index.shortlist("Prepare weekly sales pipeline review", k=8)
+    assert set(shortlist[:2]) == {"sales-director", "sales-operations"}
+    assert shortlist.index("litigation-support") > shortlist.index("jordan")
@@ -0,0 +1,30 @@
+from compaction import ToolOutputStore, compact_messages
+
+
+def _call(call_id, name):
+    return {"role": "assistant", "content": "",
+            "tool_calls": [{"id": call_id, "type": "function",
+                            "function": {"name": name, "arguments": "{}"}}]}
+
+
+def test_stored_outputs_are_only_recalled_by_their_agent(tmp_path):
+    store = ToolOutputStore(path=str(tmp_path / "outputs.db"))
+    ref = store.put("secret build log", agent="tesla")
+    assert store.get(ref, agent="tesla") == "secret build log"
+    assert store.get(ref, agent="warren") is None
+    assert store.put("secret build log", agent="warren") != ref
+
+
+def test_recalled_outputs_are_not_compacted_again(tmp_path):
+    store = ToolOutputStore(path=str(tmp_path / "outputs.db"))
+    big = "x" * 5000
+    messages = [
+        {"role": "user", "content": "task"},
+        _call("c1", "run_shell"), {"role": "tool", "tool_call_id": "c1", "content": big},
+        _call("c2", "recall_output"), {"role": "tool", "tool_call_id": "c2", "content": big},
+        _call("c3", "run_shell"), {"role": "tool", "tool_call_id": "c3", "content": "ok"},
+        _call("c4", "run_shell"), {"role": "tool", "tool_call_id": "c4", "content": "ok"},
+    ]
+    out = compact_messages(messages, store, agent="tesla", high=100, low=10)
+    assert out[2]["content"].startswith("[compacted ")
+    assert out[4] is messages[4]
@@ -0,0 +1,43 @@
+import os
+import threading
+
+from file_reader import read_bytes, read_lines, read_tail
+
+
+def test_regular_file_pages(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    page = read_lines(str(path), offset=500, limit=2)
+    assert page.text == "line 500\nline 501\n"
+    assert read_tail(str(path), 1).text == "line 999\n"
+
+
+def test_zero_size_procfs_file_is_streamed():
+    page = read_lines("/proc/self/status", offset=0, limit=5)
+    assert page.text.startswith("Name:")
+    assert page.text.count("\n") == 5
+    assert read_tail("/proc/self/status", 1).text.strip()
+    assert read_bytes("/proc/self/status", 0, 5).text == "Name:"
+
+
+def test_fifo_is_streamed(tmp_path):
+    path = str(tmp_path / "pipe")
+    os.mkfifo(path)
+
+    def write():
+        with open(path, "w") as f:
+            f.write("a\nb\nc\n")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    page = read_lines(path, offset=1, limit=5)
+    writer.join()
+    assert page.text == "b\nc\n"
+    assert (page.start, page.end, page.total_lines) == (1, 3, 3)
+
+
+def test_stream_cut_by_the_byte_budget_has_no_line_count(monkeypatch):
+    import file_reader
+    monkeypatch.setattr(file_reader, "STREAM_MAX_BYTES", 64)
+    page = read_lines("/proc/self/status", offset=0, limit=1000)
+    assert page.total_lines is None and 0 < len(page.text) <= 64
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+import llm_client
+from llm_client import AsyncLLMClient
+
+
+def _reply(text):
+    return {"choices": [{"message": {"role": "assistant", "content": text}}]}
+
+
+def test_async_hedge_races_the_next_model_and_keeps_the_task_label():
+    client = AsyncLLMClient(api_key="test", hedge=True, hedge_delay=0.05)
+    calls = []
+
+    async def fake_araw(model_id, messages, temperature, max_tokens, tools=None, task=None):
+        calls.append((model_id, task))
+        if model_id == "slow":
+            await asyncio.sleep(2)
+            return _reply("slow")
+        return _reply("fast")
+
+    client._araw = fake_araw
+    chain = [{"id": "slow", "name": "Slow"}, {"id": "fast", "name": "Fast"}]
+    result, model = asyncio.run(client._acomplete_hedged(
+        chain, [{"role": "user", "content": "hi"}], 0.0, 16, None,
+        llm_client._has_content, task="analysis"))
+
+    assert model["id"] == "fast"
+    assert result["choices"][0]["message"]["content"] == "fast"
+    assert calls == [("slow", "analysis"), ("fast", "analysis")]
+
+
+def test_retry_after_drives_the_pause_after_a_429():
+    limiter = llm_client.RateLimiter()
+    limiter.observe("m", 429, {"retry-after": "1"})
+    assert limiter.reserve("m") <= 1.05
+    # A concurrent request waits about one more reset window, not 1 / min_rate.
+    assert limiter.reserve("m") <= 2.1
+
+
+def test_429_without_headers_backs_off_on_the_learned_rate():
+    limiter = llm_client.RateLimiter()
+    limiter.observe("m", 429, {})
+    assert 1.0 < limiter.reserve("m") <= llm_client.RATE_LIMIT_MAX_PAUSE
+
+
+def test_429_without_headers_fails_over_instead_of_requeueing(tmp_path, monkeypatch):
+    sent = []
+
+    class Pool:
+        def request(self, method, url, **kwargs):
+            sent.append(url)
+            return 429, {}, b"slow down"
+
+    monkeypatch.setattr(llm_client, "HTTP_POOL", Pool())
+    client = llm_client.LLMClient(api_key="test", rate_limiter=llm_client.RateLimiter(),
+                                  breaker=llm_client.CircuitBreaker(path=str(tmp_path / "s.db")))
+    result = client._raw("m", [{"role": "user", "content": "hi"}], 0.0, 16)
+    assert result["status"] == 429 and len(sent) == 1
+
+
+def test_waiting_for_a_pooled_connection_is_not_a_model_failure(tmp_path, monkeypatch):
+    pool = llm_client.ConnectionPool(max_per_host=1, wait_timeout=0.05)
+    pool._acquire(("https", "openrouter.ai", 443), 90)   # the only slot, held
+    monkeypatch.setattr(llm_client, "HTTP_POOL", pool)
+    breaker = llm_client.CircuitBreaker(path=str(tmp_path / "state.db"))
+    client = llm_client.LLMClient(api_key="test", breaker=breaker,
+                                  rate_limiter=llm_client.RateLimiter())
+
+    result = client._raw("m", [{"role": "user", "content": "hi"}], 0.0, 16)
+
+    assert result["local"] and "No free connection" in result["error"]
+    assert breaker.scoreboard() == []
+
+
+def test_only_transport_errors_and_5xx_count_against_a_model(tmp_path):
+    breaker = llm_client.CircuitBreaker(path=str(tmp_path / "state.db"))
+    client = llm_client.LLMClient(api_key="test", breaker=breaker)
+    client._settle("m", {"error": "Expecting value: line 1 column 1"}, 0.0)
+    assert breaker.scoreboard() == []
+    client._settle("m", {"error": "Connection reset by peer", "transport": True}, 0.0)
+    client._settle("m", {"error": "HTTP 502: bad gateway", "status": 502}, 0.0)
+    assert breaker.scoreboard()[0]["total_failures"] == 2
+
+
+def test_a_4xx_settles_a_half_open_probe(tmp_path):
+    breaker = llm_client.CircuitBreaker(path=str(tmp_path / "state.db"), base_backoff=0.0)
+    client = llm_client.LLMClient(api_key="test", breaker=breaker)
+    client._settle("m", {"error": "HTTP 503: overloaded", "status": 503}, 0.0)
+    assert breaker.allow("m")   # claims the probe
+    assert not breaker.allow("m")
+    client._settle("m", {"error": "HTTP 400: context too long", "status": 400}, 0.0)
+    assert breaker.scoreboard()[0]["state"] == "closed" and breaker.allow("m")
+
+
+def test_async_chain_lookup_runs_off_the_event_loop():
+    seen = []
+
+    class Breaker:
+        def available(self, model_id):
+            seen.append(threading.get_ident())
+            return True
+
+    async def lookup():
+        client = AsyncLLMClient(api_key="test", breaker=Breaker())
+        return await client.aget_fallback_chain(task="general"), threading.get_ident()
+
+    chain, loop_thread = asyncio.run(lookup())
+    assert chain and seen and loop_thread not in seen
+
+
+def test_async_pool_caps_connections_per_host():
+    async def slow_server(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(0.3)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    async def race():
+        server = await asyncio.start_server(slow_server, "127.0.0.1", 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+        pool = llm_client.AsyncConnectionPool(max_per_host=1, wait_timeout=0.05)
+        async with server:
+            return await asyncio.gather(pool.request("GET", url), pool.request("GET", url),
+                                        return_exceptions=True)
+
+    first, second = asyncio.run(race())
+    assert first[0] == 200 and first[2] == b"ok"
+    assert isinstance(second, llm_client.PoolExhausted)
+
+
+def test_chat_batch_skips_a_failed_model_for_the_rest_of_the_batch():
+    client = llm_client.LLMClient(api_key="test")
+    chain = client.get_fallback_chain(task="general")
+    broken, backup = chain[0], chain[1]
+    tried = []
+    lock = threading.Lock()
+
+    def fake_complete(models, messages, *args, **kwargs):
+        with lock:
+            tried.append(models[0]["id"])
+        if models[0] is broken:
+            return {"error": "HTTP 503: down", "status": 503}, None
+        return _reply("ok"), models[0]
+
+    client._complete = fake_complete
+    results = client.chat_batch(["a"] + ["b"] * 20, max_workers=1)
+
+    assert all(r["ok"] and r["result"] == "ok" for r in results)
+    assert tried.count(broken["id"]) == 1 and tried.count(backup["id"]) == 21
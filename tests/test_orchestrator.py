@@ -0,0 +1,89 @@
+import pytest
+
+from orchestrator import critical_path, plan_dependencies
+
+
+def _sub(i, depends_on):
+    return {"id": i, "assigned_to": "tesla", "depends_on": depends_on}
+
+
+def test_scalar_depends_on_is_one_dependency():
+    deps = plan_dependencies([_sub(1, []), _sub(2, 1), _sub(3, "2")])
+    assert deps == {"1": set(), "2": {"1"}, "3": {"2"}}
+
+
+def test_malformed_depends_on_is_a_value_error():
+    with pytest.raises(ValueError):
+        plan_dependencies([_sub(1, []), _sub(2, {"id": 1})])
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        plan_dependencies([_sub(1, [2]), _sub(2, [1])])
+
+
+def test_critical_path_follows_the_longest_chain():
+    deps = plan_dependencies([_sub(1, []), _sub(2, [1]), _sub(3, [])])
+    rank, path = critical_path(deps, {"1": 5.0, "2": 5.0, "3": 8.0})
+    assert path == ["1", "2"] and rank["1"] == 10.0
+
+
+def test_plans_are_not_sampled_into_the_response_cache():
+    import orchestrator
+
+    calls = []
+
+    class FakeLLM:
+        def chat(self, message, **kwargs):
+            calls.append(kwargs)
+            return '{"plan_summary": "x", "subtasks": []}'
+
+    orch = orchestrator.Orchestrator.__new__(orchestrator.Orchestrator)
+    orch.llm = FakeLLM()
+    orch.capability_index = orchestrator.CapabilityIndex({"tesla": ["coding"]}, prompts=False)
+    orch.plan_cache = orchestrator.PlanCache()
+    orch.plan_cache.enabled = False
+    orch._new_plan("Write a parser")
+
+    assert calls[0]["temperature"] == 0 and not calls[0].get("force_cache")
+
+
+def test_dependents_get_their_upstream_results(monkeypatch, tmp_path):
+    import orchestrator
+
+    tasks = {}
+
+    class FakeExecutor:
+        def __init__(self, agent):
+            self.agent = agent
+
+        def run(self, task, task_type="general", project=None):
+            tasks[task.split("\n")[0]] = task
+            return {"agent": self.agent, "status": "completed", "iterations": 1,
+                    "model_used": "m", "result": f"output of {task.split(chr(10))[0]}"}
+
+    monkeypatch.setattr(orchestrator, "AgentExecutor", FakeExecutor)
+    orch = orchestrator.Orchestrator.__new__(orchestrator.Orchestrator)
+    orch.durations = orchestrator.DurationStats(path=str(tmp_path / "state.db"))
+    plan = {"subtasks": [
+        {"id": 1, "title": "research", "description": "d", "assigned_to": "tesla"},
+        {"id": 2, "title": "write", "description": "d", "assigned_to": "steve", "depends_on": [1]},
+    ]}
+    orch.execute_plan(plan)
+
+    assert "output of research" not in tasks["research"]
+    assert "[1] research (tesla, completed)\noutput of research" in tasks["write"]
+
+
+def test_plan_cache_uses_the_similarity_the_knowledge_base_reports():
+    import orchestrator
+
+    class FakeKB:
+        def query(self, collection, text, **kwargs):
+            # Cosine space: distance 0.3 is similarity 0.7, not 1 - 0.3 / 2.
+            return [{"document": "earlier", "metadata": {"plan": "{}"},
+                     "distance": 0.3, "similarity": 0.7}]
+
+    cache = orchestrator.PlanCache()
+    cache._kb = FakeKB()
+    assert cache.lookup("directive") == (0.7, "earlier", {})
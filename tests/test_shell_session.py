@@ -0,0 +1,44 @@
+import io
+import os
+import subprocess
+import time
+
+from shell_session import ShellPool, ShellSession
+
+
+class UnkillableProc:
+    """A sudo-owned shell as seen by a non-root caller."""
+    pid = 12345
+
+    def __init__(self):
+        self.stdin, self.stdout, self.stderr = io.BytesIO(), io.BytesIO(), io.BytesIO()
+
+    def poll(self):
+        return None
+
+    def kill(self):
+        raise PermissionError(1, "Operation not permitted")
+
+    def wait(self, timeout=None):
+        raise subprocess.TimeoutExpired("bash", timeout)
+
+
+def test_close_survives_a_shell_it_may_not_signal(monkeypatch):
+    def killpg(pid, sig):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, "killpg", killpg)
+    session = ShellSession("nobody", "/nonexistent")
+    proc = session.proc = UnkillableProc()
+    session.close()
+    assert session.proc is None and proc.stdin.closed
+
+
+def test_reap_skips_sessions_in_use():
+    pool = ShellPool(idle_timeout=0.0)
+    busy, idle = ShellSession("a", "/tmp"), ShellSession("b", "/tmp")
+    busy.last_used = idle.last_used = time.monotonic() - 10
+    busy.users = 1
+    pool._sessions = {"a": busy, "b": idle}
+    pool.reap()
+    assert pool._sessions == {"a": busy} and pool.reaped == 1
@@ -0,0 +1,43 @@
+from tool_cache import ToolCache
+
+
+def test_read_file_hits_until_the_file_changes(tmp_path):
+    cache = ToolCache(path=str(tmp_path / "cache.db"))
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    read = lambda: path.read_text()
+    assert cache.read_file(str(path), {"path": str(path)}, read) == ("one", "miss")
+    assert cache.read_file(str(path), {"path": str(path)}, read) == ("one", "hit")
+    path.write_text("three")
+    assert cache.read_file(str(path), {"path": str(path)}, read) == ("three", "miss")
+
+
+def test_read_file_never_caches_zero_size_files(tmp_path):
+    cache = ToolCache(path=str(tmp_path / "cache.db"))
+    reads = []
+    read = lambda: reads.append(1) or "live"
+    for _ in range(2):
+        assert cache.read_file("/proc/self/status", {}, read) == ("live", "miss")
+    assert len(reads) == 2
+
+
+def test_read_file_is_scoped_to_the_agent(tmp_path):
+    cache = ToolCache(path=str(tmp_path / "cache.db"))
+    path = tmp_path / "notes.txt"
+    path.write_text("draft")
+    read = lambda: path.read_text()
+    assert cache.read_file(str(path), {}, read, agent="tesla")[1] == "miss"
+    assert cache.read_file(str(path), {}, read, agent="tesla")[1] == "hit"
+    assert cache.read_file(str(path), {}, read, agent="warren")[1] == "miss"
+
+
+def test_secrets_are_never_cached_and_the_db_is_private(tmp_path):
+    db = tmp_path / "cache.db"
+    cache = ToolCache(path=str(db))
+    for name in ("keys.env", ".agent_env", "id_rsa"):
+        path = tmp_path / name
+        path.write_text("OPENROUTER_API_KEY=sk-test")
+        for _ in range(2):
+            assert cache.read_file(str(path), {}, path.read_text)[1] == "miss"
+    assert cache._db().execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0] == 0
+    assert db.stat().st_mode & 0o777 == 0o600